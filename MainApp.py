@@ -1,9 +1,19 @@
 from customtkinter import *
-from PIL import Image, ImageTk
+from tkinter import ttk, Listbox
 import os
-import json
 import datetime
-import uuid
+from bytebank import instrument
+from bytebank.budgets import alert_message, current_month, set_budget
+from bytebank.instrument import FRAME_MS, span
+from bytebank.ledger import get_ledger
+from bytebank.money import format_amount
+from bytebank.operations import Operations, TransactionNotFound
+from bytebank.storage.base import data_path
+from bytebank.validation import ValidationError
+from bytebank.worker import IOWorker
+# Modules only one action needs (accounts, import/export, recurring rules,
+# file dialogs, Pillow) are imported where they are used, after the login
+# window is up; see benchmarks/startup.py.
 
 # Set global theme
 set_appearance_mode("light")
@@ -23,14 +33,79 @@ CONFIG = {
     "corner_radius": 10, "padding_y": 10, "padding_x": 10, "spacing": 10
 }
 
-# Load or initialize users.json
-Users = {}
-if os.path.exists("users.json"):
-    with open("users.json", "r") as f:
-        Users = json.load(f)
-else:
-    with open("users.json", "w") as f:
-        json.dump(Users, f)
+CATEGORIES = ["Food", "Travel", "Bills", "Shopping", "Salary", "Other"]
+PAYMENT_METHODS = ["Cash", "Card", "UPI", "Bank Transfer"]
+REPORT_PAGE_SIZE = 100
+REPEAT_OPTIONS = {"Never": None, "Daily": "daily", "Weekly": "weekly", "Monthly": "monthly", "Yearly": "yearly"}
+RECURRING_CHECK_MS = 15 * 60 * 1000
+PICKER_PAGE_SIZE = 25
+# Dashboard menu for the sampled profiling in bytebank.instrument (also set by BYTEBANK_PROFILE).
+PROFILING_OPTIONS = {"Profiling: Off": None, "Profiling: cProfile": "cprofile",
+                     "Profiling: tracemalloc": "tracemalloc"}
+PROFILE_IMAGE = "images/profile.png"
+# Sizes the UI shows images at; one decode of an original produces all of them.
+ICON_SIZES = [(100, 100), (40, 40)]
+# Downscaled copies of images/, so startup never decodes the full-size originals.
+IMAGE_CACHE_DIR = os.environ.get("BYTEBANK_IMAGE_CACHE") or data_path("cache")
+# Thumbnails are stored at this multiple of their display size for HiDPI scaling.
+IMAGE_CACHE_SCALE = 2
+
+_thumbnails = {}
+
+
+def _thumbnail_path(path, size):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(IMAGE_CACHE_DIR, f"{stem}-{size[0]}x{size[1]}@{IMAGE_CACHE_SCALE}x.png")
+
+
+def _make_thumbnails(path, sizes):
+    """Decode `path` once and cache a thumbnail for each size, in memory and in IMAGE_CACHE_DIR."""
+    from PIL import Image
+    image = Image.open(path)
+    image.load()
+    # Largest first: the original is shrunk in place, then each smaller size from the previous one.
+    for i, size in enumerate(sorted(sizes, reverse=True)):
+        image = image.copy() if i else image
+        image.thumbnail((size[0] * IMAGE_CACHE_SCALE, size[1] * IMAGE_CACHE_SCALE), reducing_gap=2.0)
+        _thumbnails[(path, size)] = image
+        cached = _thumbnail_path(path, size)
+        try:
+            os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+            temp = f"{cached}.{os.getpid()}.tmp"
+            image.save(temp, "PNG")
+            os.replace(temp, cached)
+        except OSError as e:
+            print(f"Warning: could not cache {cached}: {str(e)}")
+
+
+def load_thumbnail(path, size):
+    """Return a Pillow image of `path` fitted to `size` x IMAGE_CACHE_SCALE.
+
+    Thumbnails are kept in memory for the run and in IMAGE_CACHE_DIR across
+    runs. The original is decoded only when a cached copy is missing or
+    older than it.
+    """
+    key = (path, size)
+    if key not in _thumbnails:
+        cached = _thumbnail_path(path, size)
+        if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(path):
+            from PIL import Image
+            image = Image.open(cached)
+            image.load()
+            _thumbnails[key] = image
+        else:
+            _make_thumbnails(path, [size] + [s for s in ICON_SIZES if s != size])
+    return _thumbnails[key]
+
+
+def load_icon(path, size):
+    """Return a CTkImage for `path` at `size`, or None if the image cannot be read."""
+    try:
+        return CTkImage(load_thumbnail(path, size), size=size)
+    except Exception as e:
+        print(f"Warning: could not load {path}: {str(e)}")
+        return None
+
 
 def create_button(parent, text, command=None, width=CONFIG["button_width"], height=CONFIG["button_height"],
                   fg_color=CONFIG["primary"], hover_color=CONFIG["hover_primary"], 
@@ -52,7 +127,7 @@ def show_popup(parent, message, title="Success", text_color=CONFIG["text_primary
     popup.lift()
     popup.configure(fg_color=CONFIG["background"])
 
-    dialog_label = CTkLabel(popup, text=message, font=CONFIG["body"], text_color=text_color)
+    dialog_label = CTkLabel(popup, text=message, font=CONFIG["body"], text_color=text_color, wraplength=280)
     dialog_label.pack(pady=CONFIG["spacing"])
 
     ok_button = create_button(popup, "OK", width=100, height=30,
@@ -60,195 +135,136 @@ def show_popup(parent, message, title="Success", text_color=CONFIG["text_primary
                               command=popup.destroy)
     ok_button.pack(pady=CONFIG["padding_y"])
 
-class Operations:
-    """Class to handle transaction operations (add, update, delete, view)."""
-    @staticmethod
-    def add_transaction(username, type_dropdown, amount_entry, description_entry, category_dropdown, 
-                       date_entry, payment_dropdown, notes_entry, parent_window):
-        """Add a new transaction to the user's file."""
-        try:
-            # Collect and validate data
-            transaction_type = type_dropdown.get()
-            amount_str = amount_entry.get().strip()
-            description = description_entry.get().strip()
-            category = category_dropdown.get()
-            date = date_entry.get().strip() or datetime.datetime.now().strftime("%Y-%m-%d")
-            payment_method = payment_dropdown.get()
-            notes = notes_entry.get().strip()
-
-            if not transaction_type or transaction_type not in ["Expense", "Income"]:
-                show_popup(parent_window, "Please select a valid type.", "Error", CONFIG["accent"])
-                return
-            if not amount_str or not amount_str.replace('.', '', 1).isdigit() or float(amount_str) <= 0:
-                show_popup(parent_window, "Please enter a valid amount (> 0).", "Error", CONFIG["accent"])
-                return
-            if not description:
-                show_popup(parent_window, "Description is required.", "Error", CONFIG["accent"])
-                return
-            if not category:
-                show_popup(parent_window, "Please select a category.", "Error", CONFIG["accent"])
-                return
-            if not payment_method:
-                show_popup(parent_window, "Please select a payment method.", "Error", CONFIG["accent"])
-                return
-
-            amount = float(amount_str)
-            transaction_id = str(uuid.uuid4())
-            transaction_data = {
-                "id": transaction_id,
-                "type": transaction_type,
-                "amount": amount,
-                "description": description,
-                "category": category,
-                "date": date,
-                "payment_method": payment_method,
-                "notes": notes
-            }
-
-            # Load or create user file
-            user_file = f"{username}_transactions.json"
-            transactions = []
-            if os.path.exists(user_file):
-                with open(user_file, "r") as f:
-                    transactions = json.load(f)
-
-            transactions.append(transaction_data)
-
-            # Save to file
-            with open(user_file, "w") as f:
-                json.dump(transactions, f, indent=4)
-
-            show_popup(parent_window, "Transaction added successfully!")
-            parent_window.destroy()
-        except Exception as e:
-            show_popup(parent_window, f"Error adding transaction: {str(e)}", "Error", CONFIG["accent"])
-
-    @staticmethod
-    def update_transaction(username, transaction_id, type_dropdown, amount_entry, description_entry, 
-                          category_dropdown, date_entry, payment_dropdown, notes_entry, parent_window):
-        """Update an existing transaction."""
-        try:
-            user_file = f"{username}_transactions.json"
-            if not os.path.exists(user_file):
-                show_popup(parent_window, "No transactions found.", "Error", CONFIG["accent"])
-                return
-
-            with open(user_file, "r") as f:
-                transactions = json.load(f)
-
-            # Find transaction
-            for transaction in transactions:
-                if transaction["id"] == transaction_id:
-                    # Collect and validate data
-                    transaction_type = type_dropdown.get()
-                    amount_str = amount_entry.get().strip()
-                    description = description_entry.get().strip()
-                    category = category_dropdown.get()
-                    date = date_entry.get().strip() or transaction["date"]
-                    payment_method = payment_dropdown.get()
-                    notes = notes_entry.get().strip()
-
-                    if not transaction_type or transaction_type not in ["Expense", "Income"]:
-                        show_popup(parent_window, "Please select a valid type.", "Error", CONFIG["accent"])
-                        return
-                    if not amount_str or not amount_str.replace('.', '', 1).isdigit() or float(amount_str) <= 0:
-                        show_popup(parent_window, "Please enter a valid amount (> 0).", "Error", CONFIG["accent"])
-                        return
-                    if not description:
-                        show_popup(parent_window, "Description is required.", "Error", CONFIG["accent"])
-                        return
-                    if not category:
-                        show_popup(parent_window, "Please select a category.", "Error", CONFIG["accent"])
-                        return
-                    if not payment_method:
-                        show_popup(parent_window, "Please select a payment method.", "Error", CONFIG["accent"])
-                        return
-
-                    # Update transaction
-                    transaction.update({
-                        "type": transaction_type,
-                        "amount": float(amount_str),
-                        "description": description,
-                        "category": category,
-                        "date": date,
-                        "payment_method": payment_method,
-                        "notes": notes
-                    })
-
-                    with open(user_file, "w") as f:
-                        json.dump(transactions, f, indent=4)
-
-                    show_popup(parent_window, "Transaction updated successfully!")
-                    parent_window.destroy()
-                    return
-
-            show_popup(parent_window, "Transaction not found.", "Error", CONFIG["accent"])
-        except Exception as e:
-            show_popup(parent_window, f"Error updating transaction: {str(e)}", "Error", CONFIG["accent"])
-
-    @staticmethod
-    def delete_transaction(username, transaction_id, parent_window):
-        """Delete a transaction by ID."""
-        try:
-            user_file = f"{username}_transactions.json"
-            if not os.path.exists(user_file):
-                show_popup(parent_window, "No transactions found.", "Error", CONFIG["accent"])
-                return
-
-            with open(user_file, "r") as f:
-                transactions = json.load(f)
-
-            original_count = len(transactions)
-            transactions = [t for t in transactions if t["id"] != transaction_id]
-
-            if len(transactions) == original_count:
-                show_popup(parent_window, "Transaction not found.", "Error", CONFIG["accent"])
-                return
-
-            with open(user_file, "w") as f:
-                json.dump(transactions, f, indent=4)
-
-            show_popup(parent_window, "Transaction deleted successfully!")
-            parent_window.destroy()
-        except Exception as e:
-            show_popup(parent_window, f"Error deleting transaction: {str(e)}", "Error", CONFIG["accent"])
-
-    @staticmethod
-    def view_transactions(username):
-        """Retrieve all transactions for a user."""
-        try:
-            user_file = f"{username}_transactions.json"
-            if not os.path.exists(user_file):
-                return []
-            with open(user_file, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error viewing transactions: {str(e)}")
-            return []
-
-    @staticmethod
-    def get_summary(username):
-        """Calculate total income, expense, savings, and balance."""
-        try:
-            transactions = Operations.view_transactions(username)
-            total_income = sum(t["amount"] for t in transactions if t["type"] == "Income")
-            total_expense = sum(t["amount"] for t in transactions if t["type"] == "Expense")
-            total_savings = total_income - total_expense
-            current_balance = total_savings
-            return {
-                "total_income": total_income,
-                "total_expense": total_expense,
-                "total_savings": total_savings,
-                "current_balance": current_balance
-            }
-        except Exception as e:
-            print(f"Error calculating summary: {str(e)}")
-            return {
-                "total_income": 0.0,
-                "total_expense": 0.0,
-                "total_savings": 0.0,
-                "current_balance": 0.0
-            }
+def clear_entries(*entries):
+    """Empty entries (showing their placeholders again) when a form is reused."""
+    for entry in entries:
+        entry.delete(0, "end")
+
+
+def window_alive(window):
+    """Return True if a Tk window has not been destroyed (e.g. while a background job ran)."""
+    try:
+        return bool(window.winfo_exists())
+    except Exception:
+        return False
+
+class TransactionPicker:
+    """Type-ahead transaction selector that loads matches page by page as it scrolls.
+
+    `run_io(fn, callback)` runs `fn(ledger)` off the UI thread and passes the
+    result to `callback` on it (see MainDashboard.run_io).
+    """
+    def __init__(self, parent, run_io, on_select=None, page_size=PICKER_PAGE_SIZE, height=5,
+                 placeholder="Search description, notes or category"):
+        self.run_io = run_io
+        self.on_select = on_select
+        self.page_size = page_size
+        self.ids = []
+        self.query = ""
+        self.exhausted = False
+        self.loading = False
+        self.generation = 0
+        self.selected_id = None
+        self._pending_search = None
+
+        self.frame = CTkFrame(parent, fg_color="transparent")
+        self.entry = CTkEntry(self.frame, placeholder_text=placeholder,
+                              height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                              corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                              text_color=CONFIG["text_primary"],
+                              placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        self.entry.pack(fill="x")
+        list_frame = CTkFrame(self.frame, fg_color=CONFIG["surface"], corner_radius=CONFIG["corner_radius"])
+        list_frame.pack(fill="x", pady=(4, 0))
+        self.listbox = Listbox(list_frame, height=height, font=CONFIG["small"], activestyle="none",
+                               exportselection=False, borderwidth=0, highlightthickness=0,
+                               bg=CONFIG["surface"], fg=CONFIG["text_primary"],
+                               selectbackground=CONFIG["primary"], selectforeground="white")
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.listbox.yview)
+        self.listbox.configure(yscrollcommand=self._on_scroll)
+        self.listbox.pack(side="left", fill="both", expand=True, padx=(CONFIG["padding_x"], 0), pady=6)
+        self.scrollbar.pack(side="right", fill="y", pady=6)
+
+        self.entry.bind("<KeyRelease>", self._schedule_search)
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.search()
+
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    def reset(self):
+        """Clear the search text and list the most recent transactions again."""
+        clear_entries(self.entry)
+        self.search()
+
+    def _schedule_search(self, event=None):
+        """Debounce keystrokes so only the final query of a burst hits the index."""
+        if self._pending_search is not None:
+            self.frame.after_cancel(self._pending_search)
+        self._pending_search = self.frame.after(150, self.search)
+
+    def search(self):
+        """Show the first page of matches for the current search text."""
+        self._pending_search = None
+        self.query = self.entry.get().strip()
+        self.generation += 1
+        self.ids = []
+        self.exhausted = False
+        self.loading = False
+        self.selected_id = None
+        self.listbox.delete(0, "end")
+        self.listbox.insert("end", "Searching…")
+        self.load_more()
+
+    def load_more(self):
+        """Request the next page of matches (most recent transactions when the search is empty)."""
+        if self.loading:
+            return
+        self.loading = True
+        query, offset, limit, generation = self.query, len(self.ids), self.page_size, self.generation
+
+        def fetch(ledger):
+            if query:
+                return ledger.search(query, offset=offset, limit=limit)
+            return ledger.query(order_by="date", descending=True, offset=offset, limit=limit)
+
+        self.run_io(fetch, lambda rows: self._show_page(rows, generation),
+                    lambda e: self._show_error(e, generation))
+
+    def _show_page(self, rows, generation):
+        """Append a fetched page unless the search text changed while it was loading."""
+        if generation != self.generation or not window_alive(self.listbox):
+            return
+        self.loading = False
+        with span("ui.picker_page", rows=len(rows)):
+            if not self.ids:
+                self.listbox.delete(0, "end")
+            for t in rows:
+                self.listbox.insert("end", f"{t['date']}   {t['description']} ({t['type']}: ₹{format_amount(t['amount'])})")
+                self.ids.append(t["id"])
+        self.exhausted = len(rows) < self.page_size
+        if not self.ids:
+            self.listbox.insert("end", "No matching transactions")
+
+    def _show_error(self, error, generation):
+        if generation != self.generation or not window_alive(self.listbox):
+            return
+        self.loading = False
+        self.exhausted = True
+        self.listbox.insert("end", f"Error loading transactions: {str(error)}")
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) > 0.9 and not self.exhausted and not self.loading:
+            self.frame.after_idle(self.load_more)
+
+    def _on_select(self, event=None):
+        selection = self.listbox.curselection()
+        if not selection or selection[0] >= len(self.ids):
+            return
+        self.selected_id = self.ids[selection[0]]
+        if self.on_select:
+            self.on_select(self.selected_id)
 
 class LoginPage:
     """Class to manage the login page UI and functionality."""
@@ -268,12 +284,10 @@ class LoginPage:
         title.pack(pady=CONFIG["spacing"] * 2)
 
         # Profile Icon
-        try:
-            profile_icon = CTkImage(Image.open("images/profile.png"), size=(100, 100))
+        profile_icon = load_icon(PROFILE_IMAGE, (100, 100))
+        if profile_icon is not None:
             profile_label = CTkLabel(self.app, image=profile_icon, text="", font=CONFIG["body"])
             profile_label.pack(pady=CONFIG["spacing"])
-        except:
-            pass
 
         # Username Entry
         self.username_entry = CTkEntry(self.app, placeholder_text="Username", width=300, 
@@ -305,12 +319,13 @@ class LoginPage:
     def login(self):
         """Handle login action."""
         try:
+            from bytebank.users import check_password
             username = self.username_entry.get().strip()
             password = self.password_entry.get()
             if not username or not password:
                 show_popup(self.app, "Please fill all fields.", "Error", CONFIG["accent"])
                 return
-            if username in Users and Users[username]["password"] == password:
+            if check_password(username, password):
                 print(f"Login successful for {username}")
                 self.app.destroy()
                 MainDashboard(username).run()
@@ -322,6 +337,7 @@ class LoginPage:
     def create_account_window(self):
         """Open create account window."""
         try:
+            from bytebank.users import UserExistsError, create_user
             create_acc = CTkToplevel(self.app)
             create_acc.geometry("400x400")
             create_acc.title("Create Account")
@@ -380,15 +396,14 @@ class LoginPage:
                                               text_color=CONFIG["accent"])
                         error_label.pack(pady=CONFIG["padding_y"])
                         return
-                    elif username in Users:
-                        error_label = CTkLabel(create_acc, text="Username already exists!", font=CONFIG["small"], 
-                                              text_color=CONFIG["accent"])
-                        error_label.pack(pady=CONFIG["padding_y"])
-                        return
                     else:
-                        Users[username] = {"password": password}
-                        with open("users.json", "w") as f:
-                            json.dump(Users, f, indent=4)
+                        try:
+                            create_user(username, password)
+                        except UserExistsError as e:
+                            error_label = CTkLabel(create_acc, text=str(e), font=CONFIG["small"],
+                                                  text_color=CONFIG["accent"])
+                            error_label.pack(pady=CONFIG["padding_y"])
+                            return
                         print(f"Account created for {username}")
                         create_acc.destroy()
                         show_popup(self.app, "Account successfully created!")
@@ -408,19 +423,96 @@ class MainDashboard:
     def __init__(self, username):
         self.username = username
         self.dashboard = CTk()
-        self.dashboard.geometry("800x600")
+        self.dashboard.geometry("800x660")
         self.dashboard.title("ByteBank - Main Dashboard")
         self.dashboard.resizable(False, False)
         self.dashboard.configure(fg_color=CONFIG["background"])
+        self.io = IOWorker()
+        self.budget_rows = None
+        # One window per form, built on first use and hidden, not destroyed, when closed.
+        self.forms = {}
         self.setup_ui()
 
+    def run_io(self, fn, callback=None, errback=None):
+        """Run `fn(ledger)` on this user's I/O worker thread; callbacks run back on the Tk thread."""
+        self.io.submit(self.username, lambda: fn(get_ledger(self.username)), callback, errback)
+
+    def pump_io(self):
+        """Deliver finished background jobs to their UI callbacks."""
+        self.io.drain()
+        self.dashboard.after(30, self.pump_io)
+
+    def submit_operation(self, parent_window, button, operation, success_message, error_prefix):
+        """Run an Operations call on the I/O worker while the form shows a pending state.
+
+        On success the form is hidden and the confirmation is shown on the dashboard.
+        """
+        label = button.cget("text")
+        button.configure(state="disabled", text="Saving…")
+
+        def done(result):
+            if window_alive(parent_window):
+                button.configure(state="normal", text=label)
+                self.hide_form(parent_window)
+            show_popup(self.dashboard, success_message)
+
+        def failed(e):
+            if not window_alive(parent_window):
+                return
+            button.configure(state="normal", text=label)
+            # The form may have been closed (hidden) while the operation ran.
+            parent = parent_window if parent_window.winfo_viewable() else self.dashboard
+            if isinstance(e, (ValidationError, TransactionNotFound)):
+                show_popup(parent, str(e), "Error", CONFIG["accent"])
+            else:
+                show_popup(parent, f"{error_prefix}: {str(e)}", "Error", CONFIG["accent"])
+
+        self.io.submit(self.username, operation, done, failed)
+
+    def new_form_window(self, geometry, title):
+        """Create a hidden-on-close form window; show_form() displays it."""
+        window = CTkToplevel(self.dashboard)
+        window.geometry(geometry)
+        window.title(title)
+        window.resizable(False, False)
+        window.configure(fg_color=CONFIG["background"])
+        window.protocol("WM_DELETE_WINDOW", lambda: self.hide_form(window))
+        return window
+
+    def show_form(self, name, build, error_prefix):
+        """Show the form called `name`, building it with `build()` the first time.
+
+        `build()` returns (window, reset). Later calls run reset() to put the
+        fields back to their initial state and show the same window again,
+        so no widgets are created after the first opening.
+        """
+        try:
+            with span("ui.show_form", form=name) as s:
+                form = self.forms.get(name)
+                if form is None or not window_alive(form[0]):
+                    form = self.forms[name] = build()
+                    s.set(built=True)
+                else:
+                    form[1]()
+                    form[0].deiconify()
+            window = form[0]
+            window.lift()
+            window.grab_set()
+            window.focus()
+            return window
+        except Exception as e:
+            show_popup(self.dashboard, f"{error_prefix}: {str(e)}", "Error", CONFIG["accent"])
+
+    def hide_form(self, window):
+        """Close a form window for reuse by show_form()."""
+        if window_alive(window):
+            window.grab_release()
+            window.withdraw()
+
     def setup_ui(self):
         """Set up the dashboard UI elements."""
         # Profile Icon + Username
-        try:
-            profile_icon = CTkImage(Image.open("images/profile.png"), size=(40, 40))
-        except:
-            profile_icon = None
+        profile_icon = load_icon(PROFILE_IMAGE, (40, 40))
         profile_label = CTkLabel(
             self.dashboard, text=f"Welcome, {self.username}", image=profile_icon,
             compound="left", font=CONFIG["body"], text_color=CONFIG["text_primary"]
@@ -456,6 +548,16 @@ class MainDashboard:
                                                text_color=CONFIG["text_primary"], font=("Roboto", 14, "bold"))
         self.current_balance_btn.place(x=550, y=45)
 
+        profiling_menu = CTkOptionMenu(self.dashboard, values=list(PROFILING_OPTIONS), width=200, height=26,
+                                       corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                                       text_color=CONFIG["text_secondary"], button_color=CONFIG["neutral"],
+                                       button_hover_color=CONFIG["hover_neutral"],
+                                       dropdown_fg_color=CONFIG["surface"], font=CONFIG["small"],
+                                       command=self.set_profiling)
+        profiling_menu.set(next(label for label, mode in PROFILING_OPTIONS.items()
+                                if mode == instrument.profile_mode()))
+        profiling_menu.place(x=550, y=86)
+
         self.total_income_btn = create_button(self.dashboard, "Total Income: ₹0.00", width=btn_width, height=btn_height,
                                             fg_color=CONFIG["success"], hover_color=CONFIG["hover_success"],
                                             text_color="white", font=CONFIG["body"])
@@ -471,14 +573,20 @@ class MainDashboard:
                                        text_color="white", font=CONFIG["body"])
         self.savings_btn.place(x=start_x + 2*(btn_width + spacing), y=btn_y)
 
+        # The ledger is loaded on the I/O worker; its change notifications arrive
+        # on that thread and are forwarded to the Tk thread.
+        self.run_io(lambda ledger: ledger.subscribe(self.on_ledger_changed))
         self.update_summary()
+        self.pump_io()
+        self.watch_ledger()
+        self.materialize_recurring()
 
         # Horizontal Separator
         separator = CTkFrame(self.dashboard, fg_color=CONFIG["border"], height=2)
         separator.place(x=0, y=120, relwidth=1)
 
         # Form Frame
-        form_frame = CTkFrame(self.dashboard, width=400, height=350, 
+        form_frame = CTkFrame(self.dashboard, width=400, height=410, 
                              fg_color=CONFIG["surface"], corner_radius=15)
         form_frame.place(x=200, y=220)
         form_frame.pack_propagate(False)
@@ -507,403 +615,900 @@ class MainDashboard:
                                  command=self.view_reports_form)
         btn_report.pack(pady=CONFIG["padding_y"])
 
+        tools_frame = CTkFrame(form_frame, fg_color="transparent")
+        tools_frame.pack(pady=CONFIG["padding_y"])
+        self.import_button = create_button(tools_frame, "📥 Import", width=136, height=35,
+                                           fg_color=CONFIG["neutral"], hover_color=CONFIG["hover_neutral"],
+                                           font=CONFIG["label"], command=self.import_statement_form)
+        self.import_button.pack(side="left", padx=4)
+        btn_export = create_button(tools_frame, "📤 Export", width=136, height=35,
+                                   fg_color=CONFIG["neutral"], hover_color=CONFIG["hover_neutral"],
+                                   font=CONFIG["label"], command=self.export_form)
+        btn_export.pack(side="left", padx=4)
+
+        # Search Panel
+        search_frame = CTkFrame(self.dashboard, width=180, height=410,
+                                fg_color=CONFIG["surface"], corner_radius=15)
+        search_frame.place(x=10, y=220)
+        search_frame.pack_propagate(False)
+        search_title = CTkLabel(search_frame, text="🔍 Search", font=CONFIG["body"],
+                                text_color=CONFIG["text_primary"])
+        search_title.pack(pady=(CONFIG["spacing"], CONFIG["spacing"]))
+        self.search_picker = TransactionPicker(search_frame, self.run_io, self.show_transaction, height=17,
+                                               placeholder="e.g. rent >5000")
+        self.search_picker.frame.pack(fill="both", expand=True, padx=4)
+
+        # Budget Panel
+        budget_frame = CTkFrame(self.dashboard, width=180, height=410,
+                                fg_color=CONFIG["surface"], corner_radius=15)
+        budget_frame.place(x=610, y=220)
+        budget_frame.pack_propagate(False)
+        self.budget_title = CTkLabel(budget_frame, text=f"🎯 Budgets {current_month()}", font=CONFIG["body"],
+                                     text_color=CONFIG["text_primary"])
+        self.budget_title.pack(pady=(CONFIG["spacing"], CONFIG["spacing"]))
+        self.budget_list = CTkScrollableFrame(budget_frame, width=150, height=290, fg_color="transparent")
+        self.budget_list.pack(fill="both", expand=True, padx=4)
+        btn_budget = create_button(budget_frame, "Set Budget", width=150, height=35,
+                                   fg_color=CONFIG["primary"], hover_color=CONFIG["hover_primary"],
+                                   font=CONFIG["label"], command=self.set_budget_form)
+        btn_budget.pack(pady=CONFIG["padding_y"])
+        self.update_budgets()
+
+    def on_ledger_changed(self, ledger):
+        """Ledger listener (I/O worker thread): hand fresh figures and any budget alerts to the Tk thread."""
+        self.io.call_soon(self.update_summary, ledger.summary())
+        self.io.call_soon(self.update_budgets, ledger.budget_status(), ledger.take_alerts())
+
+    def show_transaction(self, transaction_id):
+        """Show the details of a search result."""
+        def show(t):
+            if t is None:
+                return
+            notes = f"\n{t['notes']}" if t["notes"] else ""
+            show_popup(self.dashboard, f"{t['date']}  {t['type']} ₹{format_amount(t['amount'])}\n{t['description']}\n"
+                                       f"{t['category']} · {t['payment_method']}{notes}", "Transaction")
+
+        self.run_io(lambda ledger: ledger.find(transaction_id), show)
+
+    def set_profiling(self, label):
+        """Switch sampled profiling of the instrumented spans (see bytebank.instrument)."""
+        instrument.set_profile_mode(PROFILING_OPTIONS[label])
+        if PROFILING_OPTIONS[label] == "cprofile":
+            print(f"Profiling: sampled cProfile stats are saved in {instrument.profile_dir()}")
+
     def update_datetime(self):
         """Update date and time display."""
         try:
-            now = datetime.datetime.now()
-            self.date_value.configure(text=now.strftime("%Y-%m-%d"))
-            self.time_value.configure(text=now.strftime("%H:%M:%S"))
+            # Runs every second, so it is only logged when it takes longer than a frame.
+            with span("ui.update_datetime", FRAME_MS):
+                now = datetime.datetime.now()
+                self.date_value.configure(text=now.strftime("%Y-%m-%d"))
+                self.time_value.configure(text=now.strftime("%H:%M:%S"))
             self.dashboard.after(1000, self.update_datetime)
         except Exception as e:
             print(f"Error updating datetime: {str(e)}")
 
-    def update_summary(self):
-        """Update summary buttons with current totals."""
+    def update_summary(self, summary=None):
+        """Update summary buttons with current totals, fetching them on the I/O worker if not given."""
+        if summary is None:
+            self.run_io(lambda ledger: ledger.summary(), self.update_summary)
+            return
         try:
-            summary = Operations.get_summary(self.username)
-            self.current_balance_btn.configure(text=f"Current Balance: ₹{summary['current_balance']:.2f}")
-            self.total_income_btn.configure(text=f"Total Income: ₹{summary['total_income']:.2f}")
-            self.total_expense_btn.configure(text=f"Total Expense: ₹{summary['total_expense']:.2f}")
-            self.savings_btn.configure(text=f"Total Savings: ₹{summary['total_savings']:.2f}")
-            self.dashboard.after(1000, self.update_summary)
+            with span("ui.update_summary"):
+                self.current_balance_btn.configure(text=f"Current Balance: ₹{format_amount(summary['current_balance'])}")
+                self.total_income_btn.configure(text=f"Total Income: ₹{format_amount(summary['total_income'])}")
+                self.total_expense_btn.configure(text=f"Total Expense: ₹{format_amount(summary['total_expense'])}")
+                self.savings_btn.configure(text=f"Total Savings: ₹{format_amount(summary['total_savings'])}")
         except Exception as e:
             print(f"Error updating summary: {str(e)}")
 
-    def add_expense_form(self):
-        """Open form for adding expenses/income."""
+    def update_budgets(self, status=None, alerts=()):
+        """Show spending against each budget, rebuilding the rows only when the figures changed."""
+        if status is None:
+            self.run_io(lambda ledger: ledger.budget_status(), self.update_budgets)
+            return
+        for alert in alerts:
+            show_popup(self.dashboard, alert_message(alert), "Budget Alert", CONFIG["accent"])
+        month = current_month()
+        if (month, status) == self.budget_rows:
+            return
+        self.budget_rows = (month, status)
         try:
-            add_window = CTkToplevel(self.dashboard)
-            add_window.geometry("700x500")
-            add_window.title("Add Expense/Income")
-            add_window.resizable(False, False)
-            add_window.grab_set()
-            add_window.lift()
-            add_window.configure(fg_color=CONFIG["background"])
-
-            add_window.grid_columnconfigure(1, weight=1)
-            add_window.grid_columnconfigure(3, weight=1)
-
-            form_title = CTkLabel(add_window, text="➕ Add New Expense / Income", 
-                                 font=CONFIG["subheading"], text_color=CONFIG["text_primary"])
-            form_title.grid(row=0, column=0, columnspan=4, 
-                           pady=(CONFIG["spacing"], CONFIG["spacing"] * 2), sticky="ew")
-
-            # Type Dropdown
-            type_label = CTkLabel(add_window, text="Type:", font=CONFIG["label"], 
+            with span("ui.update_budgets", rows=len(status)):
+                self.budget_title.configure(text=f"🎯 Budgets {month}")
+                for widget in self.budget_list.winfo_children():
+                    widget.destroy()
+                if not status:
+                    CTkLabel(self.budget_list, text="No budgets set", font=CONFIG["small"],
+                             text_color=CONFIG["text_secondary"]).pack(pady=CONFIG["padding_y"])
+                for row in status:
+                    color = CONFIG["accent"] if row["percent"] >= 100 else \
+                        CONFIG["warning"] if row["percent"] >= 80 else CONFIG["success"]
+                    CTkLabel(self.budget_list, text=f"{row['category']}  {row['percent']}%", font=CONFIG["label"],
+                             text_color=CONFIG["text_primary"]).pack(anchor="w")
+                    bar = CTkProgressBar(self.budget_list, width=140, progress_color=color)
+                    bar.set(min(row["percent"], 100) / 100)
+                    bar.pack(anchor="w")
+                    CTkLabel(self.budget_list, text=f"₹{format_amount(row['spent'])} / ₹{format_amount(row['limit'])}",
+                             font=CONFIG["small"], text_color=CONFIG["text_secondary"]).pack(anchor="w", pady=(0, 6))
+        except Exception as e:
+            print(f"Error updating budgets: {str(e)}")
+
+    def watch_ledger(self):
+        """Check the ledger's signature on the I/O worker; listeners refresh the summary if it changed."""
+        if not self.io.pending(self.username):
+            self.run_io(lambda ledger: ledger.refresh(),
+                        errback=lambda e: print(f"Error watching ledger: {str(e)}"))
+        self.dashboard.after(1000, self.watch_ledger)
+
+    def materialize_recurring(self):
+        """Add due recurring transactions on the I/O worker now and every RECURRING_CHECK_MS."""
+        from bytebank.recurring import materialize
+
+        def done(added):
+            if added:
+                print(f"Added {len(added)} recurring transactions for {self.username}")
+
+        self.run_io(materialize, done, lambda e: print(f"Error adding recurring transactions: {str(e)}"))
+        self.dashboard.after(RECURRING_CHECK_MS, self.materialize_recurring)
+
+    def import_statement_form(self):
+        """Import a CSV/OFX/QIF bank statement into the ledger in batches."""
+        try:
+            from tkinter import filedialog
+            from bytebank.importer import import_statement
+            path = filedialog.askopenfilename(
+                parent=self.dashboard, title="Import Bank Statement",
+                filetypes=[("Bank statements", "*.csv *.ofx *.qfx *.qif"), ("All files", "*.*")])
+            if not path:
+                return
+
+            def done(report):
+                self.import_button.configure(state="normal", text="📥 Import")
+                for line, reason in report.rejected:
+                    print(f"Rejected {os.path.basename(path)} line {line}: {reason}")
+                message = f"Imported {report.imported} rows ({report.rows_per_second:.0f}/s).\nRejected {report.rejected_count}"
+                if report.duplicates:
+                    message += f", skipped {report.duplicates} duplicates"
+                show_popup(self.dashboard, message + ".", "Import Complete",
+                           CONFIG["accent"] if report.rejected_count else CONFIG["text_primary"])
+
+            def failed(e):
+                self.import_button.configure(state="normal", text="📥 Import")
+                show_popup(self.dashboard, f"Error importing statement: {str(e)}", "Error", CONFIG["accent"])
+
+            self.import_button.configure(state="disabled", text="Importing…")
+            self.run_io(lambda ledger: import_statement(ledger, path), done, failed)
+        except Exception as e:
+            show_popup(self.dashboard, f"Error importing statement: {str(e)}", "Error", CONFIG["accent"])
+
+    def export_form(self):
+        """Open form for streaming the ledger to a CSV, JSON Lines or columnar file."""
+        self.show_form("export", self.build_export_form, "Error opening export form")
+
+    def build_export_form(self):
+        """Build the Export Transactions window once; return (window, reset)."""
+        from tkinter import filedialog
+        from bytebank.exporter import export_ledger
+        export_window = self.new_form_window("500x330", "Export Transactions")
+
+        export_window.grid_columnconfigure(1, weight=1)
+
+        form_title = CTkLabel(export_window, text="📤 Export Transactions",
+                             font=CONFIG["subheading"], text_color=CONFIG["text_primary"])
+        form_title.grid(row=0, column=0, columnspan=2,
+                       pady=(CONFIG["spacing"], CONFIG["spacing"] * 2), sticky="ew")
+
+        formats = {"CSV (.csv)": ("csv", ".csv"), "JSON Lines (.jsonl)": ("jsonl", ".jsonl"),
+                   "Columnar (.bbcol)": ("columnar", ".bbcol")}
+        format_label = CTkLabel(export_window, text="Format:", font=CONFIG["label"],
+                               text_color=CONFIG["text_secondary"])
+        format_label.grid(row=1, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        format_dropdown = CTkOptionMenu(export_window, values=list(formats), width=200,
+                                       corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                                       text_color=CONFIG["text_primary"], button_color=CONFIG["primary"],
+                                       button_hover_color=CONFIG["hover_primary"],
+                                       dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
+        format_dropdown.grid(row=1, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        range_label = CTkLabel(export_window, text="Date range:", font=CONFIG["label"],
+                              text_color=CONFIG["text_secondary"])
+        range_label.grid(row=2, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        range_frame = CTkFrame(export_window, fg_color="transparent")
+        range_frame.grid(row=2, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+        start_entry = CTkEntry(range_frame, placeholder_text="From YYYY-MM-DD", width=140,
+                               height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                               corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                               text_color=CONFIG["text_primary"],
+                               placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        start_entry.pack(side="left", padx=(0, 8))
+        end_entry = CTkEntry(range_frame, placeholder_text="To YYYY-MM-DD", width=140,
+                             height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                             corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                             text_color=CONFIG["text_primary"],
+                             placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        end_entry.pack(side="left")
+
+        category_label = CTkLabel(export_window, text="Category:", font=CONFIG["label"],
                                  text_color=CONFIG["text_secondary"])
-            type_label.grid(row=1, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            type_dropdown = CTkOptionMenu(add_window, values=["Expense", "Income"], width=140, 
+        category_label.grid(row=3, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        category_dropdown = CTkOptionMenu(export_window, values=["All Categories"] + CATEGORIES, width=200,
                                          corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
-                                         text_color=CONFIG["text_primary"], button_color=CONFIG["primary"],
-                                         button_hover_color=CONFIG["hover_primary"], 
+                                         text_color=CONFIG["text_primary"], button_color=CONFIG["secondary"],
+                                         button_hover_color=CONFIG["hover_secondary"],
                                          dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
-            type_dropdown.grid(row=1, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
-
-            # Amount Entry
-            amount_label = CTkLabel(add_window, text="Amount:", font=CONFIG["label"], 
-                                   text_color=CONFIG["text_secondary"])
-            amount_label.grid(row=1, column=2, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            amount_entry = CTkEntry(add_window, placeholder_text="₹0.00", width=140, 
-                                   height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
-                                   corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
-                                   text_color=CONFIG["text_primary"], 
-                                   placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
-            amount_entry.grid(row=1, column=3, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
-
-            # Description Entry
-            description_label = CTkLabel(add_window, text="Description:", font=CONFIG["label"], 
-                                        text_color=CONFIG["text_secondary"])
-            description_label.grid(row=2, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            description_entry = CTkEntry(add_window, placeholder_text="Enter details (e.g., Lunch, Salary)", 
-                                        width=350, height=CONFIG["entry_height"], 
-                                        border_width=CONFIG["border_width"], corner_radius=CONFIG["corner_radius"],
-                                        fg_color=CONFIG["surface"], text_color=CONFIG["text_primary"],
-                                        placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
-            description_entry.grid(row=2, column=1, columnspan=3, padx=CONFIG["padding_x"], 
-                                  pady=CONFIG["padding_y"], sticky="ew")
-
-            # Category Dropdown
-            category_label = CTkLabel(add_window, text="Category:", font=CONFIG["label"], 
-                                     text_color=CONFIG["text_secondary"])
-            category_label.grid(row=3, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            category_dropdown = CTkOptionMenu(add_window, values=["Food", "Travel", "Bills", "Shopping", "Salary", "Other"], 
-                                            width=140, corner_radius=CONFIG["corner_radius"], 
-                                            fg_color=CONFIG["surface"], text_color=CONFIG["text_primary"],
-                                            button_color=CONFIG["secondary"], 
-                                            button_hover_color=CONFIG["hover_secondary"],
-                                            dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
-            category_dropdown.grid(row=3, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
-
-            # Date Entry
-            date_label = CTkLabel(add_window, text="Date:", font=CONFIG["label"], 
-                                 text_color=CONFIG["text_secondary"])
-            date_label.grid(row=3, column=2, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            date_entry = CTkEntry(add_window, placeholder_text="YYYY-MM-DD", width=140, 
-                                 height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
-                                 corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
-                                 text_color=CONFIG["text_primary"], 
-                                 placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
-            date_entry.grid(row=3, column=3, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+        category_dropdown.grid(row=3, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        def export_action():
+            try:
+                filters = {}
+                for key, entry in (("start_date", start_entry), ("end_date", end_entry)):
+                    value = entry.get().strip()
+                    if value:
+                        try:
+                            datetime.datetime.strptime(value, "%Y-%m-%d")
+                        except ValueError:
+                            show_popup(export_window, "Dates must be YYYY-MM-DD.", "Error", CONFIG["accent"])
+                            return
+                        filters[key] = value
+                if category_dropdown.get() != "All Categories":
+                    filters["category"] = category_dropdown.get()
+                fmt, extension = formats[format_dropdown.get()]
+                path = filedialog.asksaveasfilename(
+                    parent=export_window, title="Export Transactions", defaultextension=extension,
+                    initialfile=f"{self.username}_transactions{extension}",
+                    filetypes=[(format_dropdown.get(), f"*{extension}")])
+                if not path:
+                    return
 
-            # Payment Method Dropdown
-            payment_label = CTkLabel(add_window, text="Payment:", font=CONFIG["label"], 
-                                    text_color=CONFIG["text_secondary"])
-            payment_label.grid(row=4, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            payment_dropdown = CTkOptionMenu(add_window, values=["Cash", "Card", "UPI", "Bank Transfer"], width=140,
-                                            corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
-                                            text_color=CONFIG["text_primary"], button_color=CONFIG["info"],
-                                            button_hover_color=CONFIG["hover_info"], 
-                                            dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
-            payment_dropdown.grid(row=4, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+                def done(count):
+                    if window_alive(export_window):
+                        export_button.configure(state="normal", text="Export")
+                        self.hide_form(export_window)
+                    show_popup(self.dashboard, f"Exported {count} transactions.", "Export Complete")
 
-            # Notes Entry
-            notes_label = CTkLabel(add_window, text="Notes:", font=CONFIG["label"], 
-                                  text_color=CONFIG["text_secondary"])
-            notes_label.grid(row=4, column=2, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            notes_entry = CTkEntry(add_window, placeholder_text="Optional notes", width=140, 
-                                  height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
-                                  corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
-                                  text_color=CONFIG["text_primary"], 
-                                  placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
-            notes_entry.grid(row=4, column=3, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
-
-            # Buttons
-            button_frame = CTkFrame(add_window, fg_color="transparent")
-            button_frame.grid(row=5, column=0, columnspan=4, pady=(CONFIG["spacing"] * 2, CONFIG["padding_y"]))
-
-            add_button = create_button(button_frame, "Add Record", width=160, height=CONFIG["button_height"],
+                def failed(e):
+                    if window_alive(export_window):
+                        export_button.configure(state="normal", text="Export")
+                        show_popup(export_window, f"Error exporting: {str(e)}", "Error", CONFIG["accent"])
+
+                export_button.configure(state="disabled", text="Exporting…")
+                self.run_io(lambda ledger: export_ledger(ledger, path, fmt, **filters), done, failed)
+            except Exception as e:
+                show_popup(export_window, f"Error exporting: {str(e)}", "Error", CONFIG["accent"])
+
+        button_frame = CTkFrame(export_window, fg_color="transparent")
+        button_frame.grid(row=4, column=0, columnspan=2, pady=(CONFIG["spacing"] * 2, CONFIG["padding_y"]))
+
+        export_button = create_button(button_frame, "Export", width=160, height=CONFIG["button_height"],
                                      fg_color=CONFIG["secondary"], hover_color=CONFIG["hover_secondary"],
-                                     command=lambda: Operations.add_transaction(
-                                         self.username, type_dropdown, amount_entry, description_entry,
-                                         category_dropdown, date_entry, payment_dropdown, notes_entry, add_window
-                                     ))
-            add_button.pack(side="left", padx=CONFIG["padding_x"])
-
-            cancel_button = create_button(button_frame, "Cancel", width=120, height=CONFIG["button_height"],
-                                         fg_color=CONFIG["neutral"], hover_color=CONFIG["hover_neutral"],
-                                         text_color="white", command=add_window.destroy)
-            cancel_button.pack(side="left", padx=CONFIG["padding_x"])
-        
-        except Exception as e:
-            show_popup(self.dashboard, f"Error opening add expense form: {str(e)}", "Error", CONFIG["accent"])
+                                     command=export_action)
+        export_button.pack(side="left", padx=CONFIG["padding_x"])
+
+        cancel_button = create_button(button_frame, "Cancel", width=120, height=CONFIG["button_height"],
+                                     fg_color=CONFIG["neutral"], hover_color=CONFIG["hover_neutral"],
+                                     text_color="white", command=lambda: self.hide_form(export_window))
+        cancel_button.pack(side="left", padx=CONFIG["padding_x"])
+
+        def reset():
+            format_dropdown.set(list(formats)[0])
+            category_dropdown.set("All Categories")
+            clear_entries(start_entry, end_entry)
+            export_button.configure(state="normal", text="Export")
+
+        return export_window, reset
+
+    def add_expense_form(self):
+        """Open form for adding expenses/income."""
+        self.show_form("add", self.build_add_form, "Error opening add expense form")
+
+    def build_add_form(self):
+        """Build the Add Expense/Income window once; return (window, reset)."""
+        add_window = self.new_form_window("700x550", "Add Expense/Income")
+
+        add_window.grid_columnconfigure(1, weight=1)
+        add_window.grid_columnconfigure(3, weight=1)
+
+        form_title = CTkLabel(add_window, text="➕ Add New Expense / Income", 
+                             font=CONFIG["subheading"], text_color=CONFIG["text_primary"])
+        form_title.grid(row=0, column=0, columnspan=4, 
+                       pady=(CONFIG["spacing"], CONFIG["spacing"] * 2), sticky="ew")
+
+        # Type Dropdown
+        type_label = CTkLabel(add_window, text="Type:", font=CONFIG["label"], 
+                             text_color=CONFIG["text_secondary"])
+        type_label.grid(row=1, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        type_dropdown = CTkOptionMenu(add_window, values=["Expense", "Income"], width=140, 
+                                     corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                                     text_color=CONFIG["text_primary"], button_color=CONFIG["primary"],
+                                     button_hover_color=CONFIG["hover_primary"], 
+                                     dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
+        type_dropdown.grid(row=1, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        # Amount Entry
+        amount_label = CTkLabel(add_window, text="Amount:", font=CONFIG["label"], 
+                               text_color=CONFIG["text_secondary"])
+        amount_label.grid(row=1, column=2, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        amount_entry = CTkEntry(add_window, placeholder_text="₹0.00", width=140, 
+                               height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                               corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                               text_color=CONFIG["text_primary"], 
+                               placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        amount_entry.grid(row=1, column=3, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        # Description Entry
+        description_label = CTkLabel(add_window, text="Description:", font=CONFIG["label"], 
+                                    text_color=CONFIG["text_secondary"])
+        description_label.grid(row=2, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        description_entry = CTkEntry(add_window, placeholder_text="Enter details (e.g., Lunch, Salary)", 
+                                    width=350, height=CONFIG["entry_height"], 
+                                    border_width=CONFIG["border_width"], corner_radius=CONFIG["corner_radius"],
+                                    fg_color=CONFIG["surface"], text_color=CONFIG["text_primary"],
+                                    placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        description_entry.grid(row=2, column=1, columnspan=3, padx=CONFIG["padding_x"], 
+                              pady=CONFIG["padding_y"], sticky="ew")
+
+        # Category Dropdown
+        category_label = CTkLabel(add_window, text="Category:", font=CONFIG["label"], 
+                                 text_color=CONFIG["text_secondary"])
+        category_label.grid(row=3, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        category_dropdown = CTkOptionMenu(add_window, values=CATEGORIES, 
+                                        width=140, corner_radius=CONFIG["corner_radius"], 
+                                        fg_color=CONFIG["surface"], text_color=CONFIG["text_primary"],
+                                        button_color=CONFIG["secondary"], 
+                                        button_hover_color=CONFIG["hover_secondary"],
+                                        dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
+        category_dropdown.grid(row=3, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        # Date Entry
+        date_label = CTkLabel(add_window, text="Date:", font=CONFIG["label"], 
+                             text_color=CONFIG["text_secondary"])
+        date_label.grid(row=3, column=2, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        date_entry = CTkEntry(add_window, placeholder_text="YYYY-MM-DD", width=140, 
+                             height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                             corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                             text_color=CONFIG["text_primary"], 
+                             placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        date_entry.grid(row=3, column=3, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        # Payment Method Dropdown
+        payment_label = CTkLabel(add_window, text="Payment:", font=CONFIG["label"], 
+                                text_color=CONFIG["text_secondary"])
+        payment_label.grid(row=4, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        payment_dropdown = CTkOptionMenu(add_window, values=PAYMENT_METHODS, width=140,
+                                        corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                                        text_color=CONFIG["text_primary"], button_color=CONFIG["info"],
+                                        button_hover_color=CONFIG["hover_info"], 
+                                        dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
+        payment_dropdown.grid(row=4, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        # Notes Entry
+        notes_label = CTkLabel(add_window, text="Notes:", font=CONFIG["label"], 
+                              text_color=CONFIG["text_secondary"])
+        notes_label.grid(row=4, column=2, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        notes_entry = CTkEntry(add_window, placeholder_text="Optional notes", width=140, 
+                              height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                              corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                              text_color=CONFIG["text_primary"], 
+                              placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        notes_entry.grid(row=4, column=3, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        # Repeat Dropdown
+        repeat_label = CTkLabel(add_window, text="Repeat:", font=CONFIG["label"],
+                               text_color=CONFIG["text_secondary"])
+        repeat_label.grid(row=5, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        repeat_dropdown = CTkOptionMenu(add_window, values=list(REPEAT_OPTIONS), width=140,
+                                       corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                                       text_color=CONFIG["text_primary"], button_color=CONFIG["neutral"],
+                                       button_hover_color=CONFIG["hover_neutral"],
+                                       dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
+        repeat_dropdown.grid(row=5, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        # Buttons
+        button_frame = CTkFrame(add_window, fg_color="transparent")
+        button_frame.grid(row=6, column=0, columnspan=4, pady=(CONFIG["spacing"] * 2, CONFIG["padding_y"]))
+
+        add_button = create_button(button_frame, "Add Record", width=160, height=CONFIG["button_height"],
+                                 fg_color=CONFIG["secondary"], hover_color=CONFIG["hover_secondary"])
+
+        def add_action():
+            # Read the fields on the Tk thread; only the operation itself runs on the worker.
+            fields = (type_dropdown.get(), amount_entry.get(), description_entry.get(),
+                      category_dropdown.get(), date_entry.get().strip(), payment_dropdown.get(),
+                      notes_entry.get())
+            frequency = REPEAT_OPTIONS[repeat_dropdown.get()]
+            if frequency is None:
+                self.submit_operation(add_window, add_button,
+                                      lambda: Operations.add_transaction(self.username, *fields),
+                                      "Transaction added successfully!", "Error adding transaction")
+            else:
+                # The date is the first occurrence; due ones are added now, later ones as they fall due.
+                self.submit_operation(add_window, add_button,
+                                      lambda: Operations.add_recurring(self.username, *fields,
+                                                                       frequency=frequency),
+                                      f"{repeat_dropdown.get()} transaction scheduled!",
+                                      "Error adding recurring transaction")
+
+        add_button.configure(command=add_action)
+        add_button.pack(side="left", padx=CONFIG["padding_x"])
+
+        cancel_button = create_button(button_frame, "Cancel", width=120, height=CONFIG["button_height"],
+                                     fg_color=CONFIG["neutral"], hover_color=CONFIG["hover_neutral"],
+                                     text_color="white", command=lambda: self.hide_form(add_window))
+        cancel_button.pack(side="left", padx=CONFIG["padding_x"])
+
+        def reset():
+            type_dropdown.set("Expense")
+            category_dropdown.set(CATEGORIES[0])
+            payment_dropdown.set(PAYMENT_METHODS[0])
+            repeat_dropdown.set(list(REPEAT_OPTIONS)[0])
+            clear_entries(amount_entry, description_entry, date_entry, notes_entry)
+
+        return add_window, reset
+
+    def set_budget_form(self):
+        """Open form for setting a category's monthly budget."""
+        self.show_form("budget", self.build_budget_form, "Error opening budget form")
+
+    def build_budget_form(self):
+        """Build the Set Budget window once; return (window, reset)."""
+        budget_window = self.new_form_window("420x300", "Set Budget")
+
+        form_title = CTkLabel(budget_window, text="🎯 Set Monthly Budget",
+                              font=CONFIG["subheading"], text_color=CONFIG["text_primary"])
+        form_title.grid(row=0, column=0, columnspan=2, padx=CONFIG["padding_x"],
+                        pady=(CONFIG["spacing"], CONFIG["spacing"] * 2))
+
+        category_label = CTkLabel(budget_window, text="Category:", font=CONFIG["label"],
+                                  text_color=CONFIG["text_secondary"])
+        category_label.grid(row=1, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        category_dropdown = CTkOptionMenu(budget_window, values=CATEGORIES, width=200,
+                                          corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                                          text_color=CONFIG["text_primary"], button_color=CONFIG["secondary"],
+                                          button_hover_color=CONFIG["hover_secondary"],
+                                          dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
+        category_dropdown.grid(row=1, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        limit_label = CTkLabel(budget_window, text="Limit:", font=CONFIG["label"],
+                               text_color=CONFIG["text_secondary"])
+        limit_label.grid(row=2, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        limit_entry = CTkEntry(budget_window, placeholder_text="₹0.00", width=200,
+                               height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                               corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                               text_color=CONFIG["text_primary"],
+                               placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        limit_entry.grid(row=2, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        month_label = CTkLabel(budget_window, text="Month:", font=CONFIG["label"],
+                               text_color=CONFIG["text_secondary"])
+        month_label.grid(row=3, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        month_entry = CTkEntry(budget_window, placeholder_text="YYYY-MM (blank: every month)", width=200,
+                               height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                               corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                               text_color=CONFIG["text_primary"],
+                               placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        month_entry.grid(row=3, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        save_button = create_button(budget_window, "Save Budget", width=160, height=CONFIG["button_height"],
+                                    fg_color=CONFIG["secondary"], hover_color=CONFIG["hover_secondary"])
+
+        def save_action():
+            category, limit, month = category_dropdown.get(), limit_entry.get(), month_entry.get().strip()
+            self.submit_operation(budget_window, save_button,
+                                  lambda: set_budget(get_ledger(self.username), category, limit, month or None),
+                                  f"Budget for {category} saved!", "Error saving budget")
+
+        save_button.configure(command=save_action)
+        save_button.grid(row=4, column=0, columnspan=2, pady=(CONFIG["spacing"] * 2, CONFIG["padding_y"]))
+
+        def reset():
+            category_dropdown.set(CATEGORIES[0])
+            clear_entries(limit_entry, month_entry)
+
+        return budget_window, reset
 
     def update_records_form(self):
         """Open form for updating transactions."""
-        try:
-            update_window = CTkToplevel(self.dashboard)
-            update_window.geometry("700x600")
-            update_window.title("Update Records")
-            update_window.resizable(False, False)
-            update_window.grab_set()
-            update_window.lift()
-            update_window.configure(fg_color=CONFIG["background"])
-
-            update_window.grid_columnconfigure(1, weight=1)
-            update_window.grid_columnconfigure(3, weight=1)
-
-            form_title = CTkLabel(update_window, text="✏️ Update Transaction", 
-                                 font=CONFIG["subheading"], text_color=CONFIG["text_primary"])
-            form_title.grid(row=0, column=0, columnspan=4, 
-                           pady=(CONFIG["spacing"], CONFIG["spacing"] * 2), sticky="ew")
-
-            # Transaction Selection
-            transaction_label = CTkLabel(update_window, text="Select Transaction:", font=CONFIG["label"], 
-                                        text_color=CONFIG["text_secondary"])
-            transaction_label.grid(row=1, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            transactions = Operations.view_transactions(self.username)
-            transaction_options = [f"{t['description']} ({t['type']}: ₹{t['amount']:.2f})" for t in transactions]
-            transaction_ids = [t["id"] for t in transactions]
-            transaction_dropdown = CTkOptionMenu(update_window, values=transaction_options or ["No transactions"], 
-                                               width=400, corner_radius=CONFIG["corner_radius"], 
-                                               fg_color=CONFIG["surface"], text_color=CONFIG["text_primary"],
-                                               button_color=CONFIG["primary"], button_hover_color=CONFIG["hover_primary"],
-                                               dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
-            transaction_dropdown.grid(row=1, column=1, columnspan=3, padx=CONFIG["padding_x"], 
-                                    pady=CONFIG["padding_y"], sticky="ew")
-
-            # Type Dropdown
-            type_label = CTkLabel(update_window, text="Type:", font=CONFIG["label"], 
+        self.show_form("update", self.build_update_form, "Error opening update form")
+
+    def build_update_form(self):
+        """Build the Update Records window once; return (window, reset)."""
+        update_window = self.new_form_window("700x720", "Update Records")
+
+        update_window.grid_columnconfigure(1, weight=1)
+        update_window.grid_columnconfigure(3, weight=1)
+
+        form_title = CTkLabel(update_window, text="✏️ Update Transaction", 
+                             font=CONFIG["subheading"], text_color=CONFIG["text_primary"])
+        form_title.grid(row=0, column=0, columnspan=4, 
+                       pady=(CONFIG["spacing"], CONFIG["spacing"] * 2), sticky="ew")
+
+        # Transaction Selection
+        transaction_label = CTkLabel(update_window, text="Select Transaction:", font=CONFIG["label"], 
+                                    text_color=CONFIG["text_secondary"])
+        transaction_label.grid(row=1, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        transaction_picker = TransactionPicker(update_window, self.run_io,
+                                               on_select=lambda transaction_id: load_transaction(transaction_id))
+        transaction_picker.grid(row=1, column=1, columnspan=3, padx=CONFIG["padding_x"],
+                                pady=CONFIG["padding_y"], sticky="ew")
+
+        # Type Dropdown
+        type_label = CTkLabel(update_window, text="Type:", font=CONFIG["label"], 
+                             text_color=CONFIG["text_secondary"])
+        type_label.grid(row=2, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        type_dropdown = CTkOptionMenu(update_window, values=["Expense", "Income"], width=140, 
+                                     corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                                     text_color=CONFIG["text_primary"], button_color=CONFIG["primary"],
+                                     button_hover_color=CONFIG["hover_primary"], 
+                                     dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
+        type_dropdown.grid(row=2, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        # Amount Entry
+        amount_label = CTkLabel(update_window, text="Amount:", font=CONFIG["label"], 
+                               text_color=CONFIG["text_secondary"])
+        amount_label.grid(row=2, column=2, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        amount_entry = CTkEntry(update_window, placeholder_text="₹0.00", width=140, 
+                               height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                               corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                               text_color=CONFIG["text_primary"], 
+                               placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        amount_entry.grid(row=2, column=3, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        # Description Entry
+        description_label = CTkLabel(update_window, text="Description:", font=CONFIG["label"], 
+                                    text_color=CONFIG["text_secondary"])
+        description_label.grid(row=3, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        description_entry = CTkEntry(update_window, placeholder_text="Enter details (e.g., Lunch, Salary)", 
+                                    width=350, height=CONFIG["entry_height"], 
+                                    border_width=CONFIG["border_width"], corner_radius=CONFIG["corner_radius"],
+                                    fg_color=CONFIG["surface"], text_color=CONFIG["text_primary"],
+                                    placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        description_entry.grid(row=3, column=1, columnspan=3, padx=CONFIG["padding_x"], 
+                              pady=CONFIG["padding_y"], sticky="ew")
+
+        # Category Dropdown
+        category_label = CTkLabel(update_window, text="Category:", font=CONFIG["label"], 
                                  text_color=CONFIG["text_secondary"])
-            type_label.grid(row=2, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            type_dropdown = CTkOptionMenu(update_window, values=["Expense", "Income"], width=140, 
-                                         corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
-                                         text_color=CONFIG["text_primary"], button_color=CONFIG["primary"],
-                                         button_hover_color=CONFIG["hover_primary"], 
-                                         dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
-            type_dropdown.grid(row=2, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
-
-            # Amount Entry
-            amount_label = CTkLabel(update_window, text="Amount:", font=CONFIG["label"], 
-                                   text_color=CONFIG["text_secondary"])
-            amount_label.grid(row=2, column=2, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            amount_entry = CTkEntry(update_window, placeholder_text="₹0.00", width=140, 
-                                   height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
-                                   corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
-                                   text_color=CONFIG["text_primary"], 
-                                   placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
-            amount_entry.grid(row=2, column=3, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
-
-            # Description Entry
-            description_label = CTkLabel(update_window, text="Description:", font=CONFIG["label"], 
-                                        text_color=CONFIG["text_secondary"])
-            description_label.grid(row=3, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            description_entry = CTkEntry(update_window, placeholder_text="Enter details (e.g., Lunch, Salary)", 
-                                        width=350, height=CONFIG["entry_height"], 
-                                        border_width=CONFIG["border_width"], corner_radius=CONFIG["corner_radius"],
+        category_label.grid(row=4, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        category_dropdown = CTkOptionMenu(update_window, values=CATEGORIES, 
+                                        width=140, corner_radius=CONFIG["corner_radius"], 
                                         fg_color=CONFIG["surface"], text_color=CONFIG["text_primary"],
-                                        placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
-            description_entry.grid(row=3, column=1, columnspan=3, padx=CONFIG["padding_x"], 
-                                  pady=CONFIG["padding_y"], sticky="ew")
-
-            # Category Dropdown
-            category_label = CTkLabel(update_window, text="Category:", font=CONFIG["label"], 
-                                     text_color=CONFIG["text_secondary"])
-            category_label.grid(row=4, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            category_dropdown = CTkOptionMenu(update_window, values=["Food", "Travel", "Bills", "Shopping", "Salary", "Other"], 
-                                            width=140, corner_radius=CONFIG["corner_radius"], 
-                                            fg_color=CONFIG["surface"], text_color=CONFIG["text_primary"],
-                                            button_color=CONFIG["secondary"], 
-                                            button_hover_color=CONFIG["hover_secondary"],
-                                            dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
-            category_dropdown.grid(row=4, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
-
-            # Date Entry
-            date_label = CTkLabel(update_window, text="Date:", font=CONFIG["label"], 
-                                 text_color=CONFIG["text_secondary"])
-            date_label.grid(row=4, column=2, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            date_entry = CTkEntry(update_window, placeholder_text="YYYY-MM-DD", width=140, 
-                                 height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
-                                 corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
-                                 text_color=CONFIG["text_primary"], 
-                                 placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
-            date_entry.grid(row=4, column=3, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+                                        button_color=CONFIG["secondary"], 
+                                        button_hover_color=CONFIG["hover_secondary"],
+                                        dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
+        category_dropdown.grid(row=4, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        # Date Entry
+        date_label = CTkLabel(update_window, text="Date:", font=CONFIG["label"], 
+                             text_color=CONFIG["text_secondary"])
+        date_label.grid(row=4, column=2, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        date_entry = CTkEntry(update_window, placeholder_text="YYYY-MM-DD", width=140, 
+                             height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                             corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                             text_color=CONFIG["text_primary"], 
+                             placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        date_entry.grid(row=4, column=3, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        # Payment Method Dropdown
+        payment_label = CTkLabel(update_window, text="Payment:", font=CONFIG["label"], 
+                                text_color=CONFIG["text_secondary"])
+        payment_label.grid(row=5, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        payment_dropdown = CTkOptionMenu(update_window, values=PAYMENT_METHODS, width=140,
+                                        corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                                        text_color=CONFIG["text_primary"], button_color=CONFIG["info"],
+                                        button_hover_color=CONFIG["hover_info"], 
+                                        dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
+        payment_dropdown.grid(row=5, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        # Notes Entry
+        notes_label = CTkLabel(update_window, text="Notes:", font=CONFIG["label"], 
+                              text_color=CONFIG["text_secondary"])
+        notes_label.grid(row=5, column=2, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        notes_entry = CTkEntry(update_window, placeholder_text="Optional notes", width=140, 
+                              height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                              corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                              text_color=CONFIG["text_primary"], 
+                              placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
+        notes_entry.grid(row=5, column=3, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+
+        def load_transaction(transaction_id):
+            """Fetch the selected transaction on the I/O worker, then fill the form."""
+            self.run_io(lambda ledger: ledger.find(transaction_id), fill_form,
+                        lambda e: window_alive(update_window) and show_popup(
+                            update_window, f"Error loading transaction: {str(e)}", "Error", CONFIG["accent"]))
+
+        def fill_form(selected_transaction):
+            """Load selected transaction data into form fields."""
+            if not window_alive(update_window):
+                return
+            try:
+                if selected_transaction is None:
+                    show_popup(update_window, "Transaction not found.", "Error", CONFIG["accent"])
+                    return
+                type_dropdown.set(selected_transaction["type"])
+                amount_entry.delete(0, "end")
+                amount_entry.insert(0, format_amount(selected_transaction["amount"]))
+                description_entry.delete(0, "end")
+                description_entry.insert(0, selected_transaction["description"])
+                category_dropdown.set(selected_transaction["category"])
+                date_entry.delete(0, "end")
+                date_entry.insert(0, selected_transaction["date"])
+                payment_dropdown.set(selected_transaction["payment_method"])
+                notes_entry.delete(0, "end")
+                notes_entry.insert(0, selected_transaction["notes"])
+            except Exception as e:
+                show_popup(update_window, f"Error loading transaction: {str(e)}", "Error", CONFIG["accent"])
+
+        # Buttons
+        button_frame = CTkFrame(update_window, fg_color="transparent")
+        button_frame.grid(row=6, column=0, columnspan=4, pady=(CONFIG["spacing"] * 2, CONFIG["padding_y"]))
+
+        update_button = create_button(button_frame, "Update Record", width=160, height=CONFIG["button_height"],
+                                    fg_color=CONFIG["warning"], hover_color=CONFIG["hover_warning"])
+
+        def update_action():
+            transaction_id = transaction_picker.selected_id
+            if not transaction_id:
+                show_popup(update_window, "Please select a transaction.", "Error", CONFIG["accent"])
+                return
+            fields = (type_dropdown.get(), amount_entry.get(), description_entry.get(),
+                      category_dropdown.get(), date_entry.get().strip() or None, payment_dropdown.get(),
+                      notes_entry.get())
+            self.submit_operation(update_window, update_button,
+                                  lambda: Operations.update_transaction(self.username, transaction_id, *fields),
+                                  "Transaction updated successfully!", "Error updating transaction")
+
+        update_button.configure(command=update_action)
+        update_button.pack(side="left", padx=CONFIG["padding_x"])
+
+        cancel_button = create_button(button_frame, "Cancel", width=120, height=CONFIG["button_height"],
+                                     fg_color=CONFIG["neutral"], hover_color=CONFIG["hover_neutral"],
+                                     text_color="white", command=lambda: self.hide_form(update_window))
+        cancel_button.pack(side="left", padx=CONFIG["padding_x"])
+
+        def reset():
+            transaction_picker.reset()
+            type_dropdown.set("Expense")
+            category_dropdown.set(CATEGORIES[0])
+            payment_dropdown.set(PAYMENT_METHODS[0])
+            clear_entries(amount_entry, description_entry, date_entry, notes_entry)
+
+        return update_window, reset
+
+    def delete_records_form(self):
+        """Open form for deleting transactions."""
+        self.show_form("delete", self.build_delete_form, "Error opening delete form")
+
+    def build_delete_form(self):
+        """Build the Delete Records window once; return (window, reset)."""
+        delete_window = self.new_form_window("700x420", "Delete Records")
 
-            # Payment Method Dropdown
-            payment_label = CTkLabel(update_window, text="Payment:", font=CONFIG["label"], 
+        delete_window.grid_columnconfigure(1, weight=1)
+
+        form_title = CTkLabel(delete_window, text="🗑 Delete Transaction", 
+                             font=CONFIG["subheading"], text_color=CONFIG["text_primary"])
+        form_title.grid(row=0, column=0, columnspan=2, 
+                       pady=(CONFIG["spacing"], CONFIG["spacing"] * 2), sticky="ew")
+
+        # Transaction Selection
+        transaction_label = CTkLabel(delete_window, text="Select Transaction:", font=CONFIG["label"], 
                                     text_color=CONFIG["text_secondary"])
-            payment_label.grid(row=5, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            payment_dropdown = CTkOptionMenu(update_window, values=["Cash", "Card", "UPI", "Bank Transfer"], width=140,
-                                            corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
-                                            text_color=CONFIG["text_primary"], button_color=CONFIG["info"],
-                                            button_hover_color=CONFIG["hover_info"], 
-                                            dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
-            payment_dropdown.grid(row=5, column=1, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
+        transaction_label.grid(row=1, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
+        transaction_picker = TransactionPicker(delete_window, self.run_io)
+        transaction_picker.grid(row=1, column=1, padx=CONFIG["padding_x"],
+                                pady=CONFIG["padding_y"], sticky="ew")
+
+        # Buttons
+        button_frame = CTkFrame(delete_window, fg_color="transparent")
+        button_frame.grid(row=2, column=0, columnspan=2, pady=(CONFIG["spacing"] * 2, CONFIG["padding_y"]))
+
+        delete_button = create_button(button_frame, "Delete Record", width=160, height=CONFIG["button_height"],
+                                    fg_color=CONFIG["accent"], hover_color=CONFIG["hover_accent"])
+
+        def delete_action():
+            transaction_id = transaction_picker.selected_id
+            if not transaction_id:
+                show_popup(delete_window, "Please select a transaction.", "Error", CONFIG["accent"])
+                return
+            self.submit_operation(delete_window, delete_button,
+                                  lambda: Operations.delete_transaction(self.username, transaction_id),
+                                  "Transaction deleted successfully!", "Error deleting transaction")
 
-            # Notes Entry
-            notes_label = CTkLabel(update_window, text="Notes:", font=CONFIG["label"], 
-                                  text_color=CONFIG["text_secondary"])
-            notes_label.grid(row=5, column=2, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            notes_entry = CTkEntry(update_window, placeholder_text="Optional notes", width=140, 
-                                  height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
-                                  corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
-                                  text_color=CONFIG["text_primary"], 
-                                  placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["label"])
-            notes_entry.grid(row=5, column=3, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="w")
-
-            def load_transaction():
-                """Load selected transaction data into form fields."""
-                try:
-                    selected_index = transaction_dropdown.get()
-                    if selected_index == "No transactions":
-                        return
-                    selected_index = transaction_options.index(selected_index)
-                    selected_transaction = transactions[selected_index]
-                    type_dropdown.set(selected_transaction["type"])
-                    amount_entry.delete(0, "end")
-                    amount_entry.insert(0, str(selected_transaction["amount"]))
-                    description_entry.delete(0, "end")
-                    description_entry.insert(0, selected_transaction["description"])
-                    category_dropdown.set(selected_transaction["category"])
-                    date_entry.delete(0, "end")
-                    date_entry.insert(0, selected_transaction["date"])
-                    payment_dropdown.set(selected_transaction["payment_method"])
-                    notes_entry.delete(0, "end")
-                    notes_entry.insert(0, selected_transaction["notes"])
-                except Exception as e:
-                    show_popup(update_window, f"Error loading transaction: {str(e)}", "Error", CONFIG["accent"])
-
-            transaction_dropdown.configure(command=lambda _: load_transaction())
-
-            # Buttons
-            button_frame = CTkFrame(update_window, fg_color="transparent")
-            button_frame.grid(row=6, column=0, columnspan=4, pady=(CONFIG["spacing"] * 2, CONFIG["padding_y"]))
-
-            update_button = create_button(button_frame, "Update Record", width=160, height=CONFIG["button_height"],
-                                        fg_color=CONFIG["warning"], hover_color=CONFIG["hover_warning"],
-                                        command=lambda: Operations.update_transaction(
-                                            self.username, transaction_ids[transaction_options.index(transaction_dropdown.get())] if transaction_options else None,
-                                            type_dropdown, amount_entry, description_entry, category_dropdown,
-                                            date_entry, payment_dropdown, notes_entry, update_window
-                                        ) if transaction_dropdown.get() != "No transactions" else show_popup(update_window, "Please select a transaction.", "Error", CONFIG["accent"]))
-            update_button.pack(side="left", padx=CONFIG["padding_x"])
-
-            cancel_button = create_button(button_frame, "Cancel", width=120, height=CONFIG["button_height"],
-                                         fg_color=CONFIG["neutral"], hover_color=CONFIG["hover_neutral"],
-                                         text_color="white", command=update_window.destroy)
-            cancel_button.pack(side="left", padx=CONFIG["padding_x"])
-        except Exception as e:
-            show_popup(self.dashboard, f"Error opening update form: {str(e)}", "Error", CONFIG["accent"])
+        delete_button.configure(command=delete_action)
+        delete_button.pack(side="left", padx=CONFIG["padding_x"])
 
-    def delete_records_form(self):
-        """Open form for deleting transactions."""
-        try:
-            delete_window = CTkToplevel(self.dashboard)
-            delete_window.geometry("700x300")
-            delete_window.title("Delete Records")
-            delete_window.resizable(False, False)
-            delete_window.grab_set()
-            delete_window.lift()
-            delete_window.configure(fg_color=CONFIG["background"])
-
-            delete_window.grid_columnconfigure(1, weight=1)
-
-            form_title = CTkLabel(delete_window, text="🗑 Delete Transaction", 
-                                 font=CONFIG["subheading"], text_color=CONFIG["text_primary"])
-            form_title.grid(row=0, column=0, columnspan=2, 
-                           pady=(CONFIG["spacing"], CONFIG["spacing"] * 2), sticky="ew")
-
-            # Transaction Selection
-            transaction_label = CTkLabel(delete_window, text="Select Transaction:", font=CONFIG["label"], 
-                                        text_color=CONFIG["text_secondary"])
-            transaction_label.grid(row=1, column=0, padx=CONFIG["padding_x"], pady=CONFIG["padding_y"], sticky="e")
-            transactions = Operations.view_transactions(self.username)
-            transaction_options = [f"{t['description']} ({t['type']}: ₹{t['amount']:.2f})" for t in transactions]
-            transaction_ids = [t["id"] for t in transactions]
-            transaction_dropdown = CTkOptionMenu(delete_window, values=transaction_options or ["No transactions"], 
-                                               width=400, corner_radius=CONFIG["corner_radius"], 
-                                               fg_color=CONFIG["surface"], text_color=CONFIG["text_primary"],
-                                               button_color=CONFIG["accent"], button_hover_color=CONFIG["hover_accent"],
-                                               dropdown_fg_color=CONFIG["surface"], font=CONFIG["label"])
-            transaction_dropdown.grid(row=1, column=1, padx=CONFIG["padding_x"], 
-                                    pady=CONFIG["padding_y"], sticky="ew")
-
-            # Buttons
-            button_frame = CTkFrame(delete_window, fg_color="transparent")
-            button_frame.grid(row=2, column=0, columnspan=2, pady=(CONFIG["spacing"] * 2, CONFIG["padding_y"]))
-
-            delete_button = create_button(button_frame, "Delete Record", width=160, height=CONFIG["button_height"],
-                                        fg_color=CONFIG["accent"], hover_color=CONFIG["hover_accent"],
-                                        command=lambda: Operations.delete_transaction(
-                                            self.username, transaction_ids[transaction_options.index(transaction_dropdown.get())] if transaction_options else None,
-                                            delete_window
-                                        ) if transaction_dropdown.get() != "No transactions" else show_popup(delete_window, "Please select a transaction.", "Error", CONFIG["accent"]))
-            delete_button.pack(side="left", padx=CONFIG["padding_x"])
-
-            cancel_button = create_button(button_frame, "Cancel", width=120, height=CONFIG["button_height"],
-                                         fg_color=CONFIG["neutral"], hover_color=CONFIG["hover_neutral"],
-                                         text_color="white", command=delete_window.destroy)
-            cancel_button.pack(side="left", padx=CONFIG["padding_x"])
-        except Exception as e:
-            show_popup(self.dashboard, f"Error opening delete form: {str(e)}", "Error", CONFIG["accent"])
+        cancel_button = create_button(button_frame, "Cancel", width=120, height=CONFIG["button_height"],
+                                     fg_color=CONFIG["neutral"], hover_color=CONFIG["hover_neutral"],
+                                     text_color="white", command=lambda: self.hide_form(delete_window))
+        cancel_button.pack(side="left", padx=CONFIG["padding_x"])
+
+        return delete_window, transaction_picker.reset
 
     def view_reports_form(self):
-        """Open form to view transaction history."""
-        try:
-            report_window = CTkToplevel(self.dashboard)
-            report_window.geometry("700x500")
-            report_window.title("View Reports")
-            report_window.resizable(False, False)
-            report_window.grab_set()
-            report_window.lift()
-            report_window.configure(fg_color=CONFIG["background"])
-
-            form_title = CTkLabel(report_window, text="📑 Transaction History", 
-                                 font=CONFIG["subheading"], text_color=CONFIG["text_primary"])
-            form_title.pack(pady=(CONFIG["spacing"], CONFIG["spacing"] * 2))
-
-            # Transaction List
-            transactions = Operations.view_transactions(self.username)
-            if not transactions:
-                no_transactions_label = CTkLabel(report_window, text="No transactions found.", 
-                                                font=CONFIG["body"], text_color=CONFIG["text_secondary"])
-                no_transactions_label.pack(pady=CONFIG["padding_y"])
+        """Open a sortable, filterable transaction history that loads rows page by page."""
+        self.show_form("reports", self.build_reports_form, "Error opening reports")
+
+    def build_reports_form(self):
+        """Build the View Reports window once; return (window, reset)."""
+        report_window = self.new_form_window("900x560", "View Reports")
+
+        form_title = CTkLabel(report_window, text="📑 Transaction History", 
+                             font=CONFIG["subheading"], text_color=CONFIG["text_primary"])
+        form_title.pack(pady=(CONFIG["spacing"], CONFIG["spacing"]))
+
+        # Filters
+        filter_frame = CTkFrame(report_window, fg_color="transparent")
+        filter_frame.pack(pady=(0, CONFIG["padding_y"]))
+        start_entry = CTkEntry(filter_frame, placeholder_text="From YYYY-MM-DD", width=130,
+                               height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                               corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                               text_color=CONFIG["text_primary"],
+                               placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["small"])
+        start_entry.pack(side="left", padx=4)
+        end_entry = CTkEntry(filter_frame, placeholder_text="To YYYY-MM-DD", width=130,
+                             height=CONFIG["entry_height"], border_width=CONFIG["border_width"],
+                             corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                             text_color=CONFIG["text_primary"],
+                             placeholder_text_color=CONFIG["text_secondary"], font=CONFIG["small"])
+        end_entry.pack(side="left", padx=4)
+        filter_menus = {}
+        for key, all_label, values in (("category", "All Categories", CATEGORIES),
+                                       ("transaction_type", "All Types", ["Expense", "Income"]),
+                                       ("payment_method", "All Payments", PAYMENT_METHODS)):
+            menu = CTkOptionMenu(filter_frame, values=[all_label] + values, width=130,
+                                 corner_radius=CONFIG["corner_radius"], fg_color=CONFIG["surface"],
+                                 text_color=CONFIG["text_primary"], button_color=CONFIG["info"],
+                                 button_hover_color=CONFIG["hover_info"],
+                                 dropdown_fg_color=CONFIG["surface"], font=CONFIG["small"])
+            menu.pack(side="left", padx=4)
+            filter_menus[key] = (menu, all_label)
+
+        # Transaction table: only the loaded pages exist as Treeview rows.
+        table_frame = CTkFrame(report_window, fg_color=CONFIG["surface"], corner_radius=CONFIG["corner_radius"])
+        table_frame.pack(padx=CONFIG["padding_x"] * 2, fill="both", expand=True)
+        style = ttk.Style(report_window)
+        style.configure("Report.Treeview", font=CONFIG["small"], rowheight=26)
+        style.configure("Report.Treeview.Heading", font=("Roboto", 12, "bold"))
+        columns = {"date": ("Date", 90), "type": ("Type", 70), "amount": ("Amount", 90),
+                   "description": ("Description", 180), "category": ("Category", 90),
+                   "payment_method": ("Payment", 100), "notes": ("Notes", 180)}
+        table = ttk.Treeview(table_frame, columns=list(columns), show="headings", style="Report.Treeview")
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=table.yview)
+        table.pack(side="left", fill="both", expand=True, padx=(CONFIG["padding_x"], 0), pady=CONFIG["padding_y"])
+        scrollbar.pack(side="right", fill="y", pady=CONFIG["padding_y"])
+
+        status_label = CTkLabel(report_window, text="", font=CONFIG["small"],
+                                text_color=CONFIG["text_secondary"])
+        status_label.pack(pady=(4, 0))
+
+        # `generation` is bumped on every reload so pages fetched for an older
+        # filter or sort order are dropped when they arrive.
+        state = {"filters": {}, "order_by": None, "descending": False,
+                 "loaded": 0, "total": 0, "totals": (0, 0), "loading": False, "generation": 0}
+
+        def load_page():
+            """Fetch the next page of matching rows on the I/O worker."""
+            state["loading"] = True
+            generation = state["generation"]
+            filters, order_by, descending = dict(state["filters"]), state["order_by"], state["descending"]
+            offset = state["loaded"]
+
+            def fetch(ledger):
+                totals = ledger.filtered_totals(**filters) if offset == 0 else None
+                rows = ledger.query(**filters, order_by=order_by, descending=descending,
+                                    offset=offset, limit=REPORT_PAGE_SIZE)
+                return totals, rows
+
+            self.run_io(fetch, lambda result: show_page(result, generation),
+                        lambda e: show_error(e, generation))
+
+        def show_page(result, generation):
+            """Append a fetched page to the table."""
+            if generation != state["generation"] or not window_alive(report_window):
+                return
+            totals, rows = result
+            if totals is not None:
+                state["total"] = totals["count"]
+                state["totals"] = (totals["Income"], totals["Expense"])
+            with span("ui.reports_page", rows=len(rows)):
+                for t in rows:
+                    if table.exists(t["id"]):
+                        continue
+                    table.insert("", "end", iid=t["id"], values=(
+                        t["date"], t["type"], f"₹{format_amount(t['amount'])}", t["description"],
+                        t["category"], t["payment_method"], t["notes"] or "None"))
+            state["loaded"] += len(rows)
+            state["loading"] = False
+            income, expense = state["totals"]
+            status_label.configure(text=f"Showing {state['loaded']} of {state['total']} transactions  ·  "
+                                        f"Income ₹{format_amount(income)}  ·  Expense ₹{format_amount(expense)}")
+
+        def show_error(e, generation):
+            if generation != state["generation"] or not window_alive(report_window):
+                return
+            state["loading"] = False
+            status_label.configure(text=f"Error loading transactions: {str(e)}")
+
+        def reload_table():
+            """Clear the table and load the first page for the current filters and sort order."""
+            state["generation"] += 1
+            table.delete(*table.get_children())
+            state["loaded"] = 0
+            state["total"] = 0
+            state["totals"] = (0, 0)
+            status_label.configure(text="Loading…")
+            load_page()
+
+        def on_scroll(first, last):
+            """Fetch another page when the view nears the end of the loaded rows."""
+            scrollbar.set(first, last)
+            if float(last) > 0.9 and not state["loading"] and state["loaded"] < state["total"]:
+                report_window.after_idle(load_page)
+
+        def sort_by(column):
+            if state["order_by"] == column:
+                state["descending"] = not state["descending"]
             else:
-                text_area = CTkTextbox(report_window, width=650, height=350, font=CONFIG["label"], 
-                                      fg_color=CONFIG["surface"], text_color=CONFIG["text_primary"])
-                text_area.pack(pady=CONFIG["padding_y"])
-                for t in transactions:
-                    text_area.insert("end", f"ID: {t['id']}\n"
-                                          f"Type: {t['type']}\n"
-                                          f"Amount: ₹{t['amount']:.2f}\n"
-                                          f"Description: {t['description']}\n"
-                                          f"Category: {t['category']}\n"
-                                          f"Date: {t['date']}\n"
-                                          f"Payment Method: {t['payment_method']}\n"
-                                          f"Notes: {t['notes'] or 'None'}\n"
-                                          f"{'-'*40}\n")
-                text_area.configure(state="disabled")
-
-            # Close Button
-            close_button = create_button(report_window, "Close", width=120, height=CONFIG["button_height"],
-                                       fg_color=CONFIG["neutral"], hover_color=CONFIG["hover_neutral"],
-                                       command=report_window.destroy)
-            close_button.pack(pady=CONFIG["padding_y"])
-        except Exception as e:
-            show_popup(self.dashboard, f"Error opening reports: {str(e)}", "Error", CONFIG["accent"])
+                state["order_by"], state["descending"] = column, False
+            for key, (heading, _) in columns.items():
+                arrow = (" ▼" if state["descending"] else " ▲") if key == column else ""
+                table.heading(key, text=heading + arrow)
+            reload_table()
+
+        def apply_filters():
+            filters = {}
+            for key, entry in (("start_date", start_entry), ("end_date", end_entry)):
+                value = entry.get().strip()
+                if value:
+                    try:
+                        datetime.datetime.strptime(value, "%Y-%m-%d")
+                    except ValueError:
+                        show_popup(report_window, "Dates must be YYYY-MM-DD.", "Error", CONFIG["accent"])
+                        return
+                    filters[key] = value
+            for key, (menu, all_label) in filter_menus.items():
+                if menu.get() != all_label:
+                    filters[key] = menu.get()
+            state["filters"] = filters
+            reload_table()
+
+        for key, (heading, width) in columns.items():
+            if key == "notes":
+                table.heading(key, text=heading)
+            else:
+                table.heading(key, text=heading, command=lambda c=key: sort_by(c))
+            table.column(key, width=width, anchor="e" if key == "amount" else "w")
+        table.configure(yscrollcommand=on_scroll)
+
+        apply_button = create_button(filter_frame, "Apply", width=80, height=CONFIG["entry_height"],
+                                     fg_color=CONFIG["primary"], hover_color=CONFIG["hover_primary"],
+                                     font=CONFIG["label"], command=apply_filters)
+        apply_button.pack(side="left", padx=4)
+
+        reload_table()
+
+        # Close Button
+        close_button = create_button(report_window, "Close", width=120, height=CONFIG["button_height"],
+                                   fg_color=CONFIG["neutral"], hover_color=CONFIG["hover_neutral"],
+                                   command=lambda: self.hide_form(report_window))
+        close_button.pack(pady=CONFIG["padding_y"])
+
+        def reset():
+            """Clear the filters and sort order and reload, picking up changes made since the last showing."""
+            clear_entries(start_entry, end_entry)
+            for menu, all_label in filter_menus.values():
+                menu.set(all_label)
+            state.update(filters={}, order_by=None, descending=False)
+            for key, (heading, _) in columns.items():
+                table.heading(key, text=heading)
+            reload_table()
+
+        return report_window, reset
 
     def run(self):
         """Run the dashboard application."""
         self.dashboard.mainloop()
+        self.io.shutdown()
 
 if __name__ == "__main__":
 #     # Uncomment the following line for normal login flow
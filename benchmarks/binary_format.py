@@ -0,0 +1,62 @@
+"""Compare the JSON and binary ledger formats: file size, load + summary time, filtered count.
+
+    python benchmarks/binary_format.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from common import make_rows, timed
+
+from bytebank.storage import open_backend, user_dir
+
+USERNAME = "bench"
+
+
+def files_size(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+               if name.startswith("transactions.") and not name.endswith(".lock"))
+
+
+def measure(name, rows):
+    username = f"{USERNAME}_{name}"
+    backend = open_backend(username, name)
+    backend.reload()
+    backend.add_many(rows)
+    backend.close()
+    size = files_size(user_dir(username))
+
+    def load_and_total():
+        fresh = open_backend(username, name)
+        fresh.reload()
+        return fresh, fresh.totals()
+
+    load_time, (fresh, totals) = timed(load_and_total)
+    count_time, count = timed(lambda: fresh.count(category="Food", start_date="2023-01-01"))
+    fresh.close()
+    print(f"{name:7} {size / 1e6:8.2f} MB   load+totals {load_time * 1000:8.1f} ms   "
+          f"filtered count {count_time * 1000:8.1f} ms   ({count} rows)")
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+    rows = make_rows(args.rows)
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            print(f"{args.rows} transactions")
+            results = [measure(name, rows) for name in ("json", "binary")]
+        finally:
+            os.chdir(os.path.dirname(directory))
+    if results[0] != results[1]:
+        print("Totals differ between formats!")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Compare dict-based and NumPy columnar reporting: summary, group-by and date-range filters.
+
+    python benchmarks/columnar.py --sizes 10000 100000 1000000
+
+The dict path is the list-of-dicts code the app used for summaries; the
+columnar path is bytebank.columnar.ColumnarLedger. Memory is the traced
+allocation of the dict records versus the built column arrays.
+"""
+import argparse
+import sys
+import tracemalloc
+
+from common import best_of, make_rows, timed
+
+from bytebank.columnar import ColumnarLedger
+
+START, END = "2023-01-01", "2023-12-31"
+
+
+def dict_summary(transactions):
+    total_income = sum(t["amount"] for t in transactions if t["type"] == "Income")
+    total_expense = sum(t["amount"] for t in transactions if t["type"] == "Expense")
+    return {"total_income": total_income, "total_expense": total_expense}
+
+
+def dict_group_by_category(transactions):
+    groups = {}
+    for t in transactions:
+        group = groups.setdefault(t["category"], {"Income": 0, "Expense": 0, "count": 0})
+        group[t["type"]] += t["amount"]
+        group["count"] += 1
+    return groups
+
+
+def dict_range_summary(transactions):
+    return dict_summary([t for t in transactions if START <= t["date"] <= END])
+
+
+def traced(fn):
+    """Return (result, bytes allocated and still held by the result)."""
+    tracemalloc.start()
+    result = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def run(size):
+    rows, rows_bytes = traced(lambda: make_rows(size))
+    build_time, _ = timed(lambda: ColumnarLedger.from_transactions(rows))
+    columns, columns_bytes = traced(lambda: ColumnarLedger.from_transactions(rows))
+    numeric_bytes = columns.amount.nbytes + columns.date.nbytes + sum(c.nbytes for c in columns.codes.values())
+
+    cases = [
+        ("summary", lambda: dict_summary(rows), lambda: columns.summary()),
+        ("group by category", lambda: dict_group_by_category(rows), lambda: columns.group_by("category")),
+        ("date-range summary", lambda: dict_range_summary(rows),
+         lambda: columns.summary(start_date=START, end_date=END)),
+    ]
+    print(f"\n{size} rows: dicts {rows_bytes / size:.0f} B/row, columns {columns_bytes / size:.0f} B/row "
+          f"({numeric_bytes / size:.0f} B/row numeric), column build {build_time * 1000:.0f} ms")
+    ok = True
+    for name, dict_fn, columnar_fn in cases:
+        dict_time, expected = best_of(dict_fn)
+        columnar_time, actual = best_of(columnar_fn)
+        if name == "group by category":
+            matches = all(expected[k][t] == actual[k][t] for k in expected for t in ("Income", "Expense"))
+        else:
+            matches = all(expected[k] == actual[k] for k in expected)
+        ok = ok and matches
+        print(f"  {name:20} dicts {dict_time * 1000:9.2f} ms   columnar {columnar_time * 1000:8.2f} ms   "
+              f"{dict_time / columnar_time:6.1f}x{'' if matches else '   MISMATCH'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+    results = [run(size) for size in args.sizes]
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""Helpers shared by the benchmark scripts."""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bytebank.validation import build_transaction
+
+CATEGORIES = ["Food", "Travel", "Bills", "Shopping", "Salary", "Other"]
+PAYMENT_METHODS = ["Cash", "Card", "UPI", "Bank Transfer"]
+
+
+def make_rows(count, seed=1):
+    """Return `count` random, valid transaction records (the same ones for the same seed)."""
+    rng = random.Random(seed)
+    return [build_transaction(rng.choice(["Expense", "Expense", "Income"]), f"{rng.uniform(1, 5000):.2f}",
+                              f"Purchase {i} at store {rng.randint(1, 500)}", rng.choice(CATEGORIES),
+                              f"20{rng.randint(20, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                              rng.choice(PAYMENT_METHODS), rng.choice(["", "", "monthly", "split with friends"]))
+            for i in range(count)]
+
+
+def timed(fn):
+    """Return (seconds, result) for one call of `fn()`."""
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def best_of(fn, repeat=3):
+    """Return (fastest seconds over `repeat` calls, result of the first call)."""
+    runs = [timed(fn) for _ in range(repeat)]
+    return min(seconds for seconds, _ in runs), runs[0][1]
@@ -0,0 +1,74 @@
+"""Measure how long the dashboard's forms take from click to ready.
+
+    python benchmarks/form_latency.py --opens 20
+
+Builds a dashboard for a throwaway user in a temp data directory, then
+opens and closes each form repeatedly. "Ready" means the window has been
+shown and Tk has processed its pending redraws. The first opening builds
+the window; later ones reuse it. The widget count after the last opening
+shows that reopening creates no new widgets. Needs a display.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from common import make_rows
+
+FORMS = [("add", "add_expense_form"), ("update", "update_records_form"), ("delete", "delete_records_form"),
+         ("reports", "view_reports_form"), ("export", "export_form"), ("budget", "set_budget_form")]
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def open_ready(dashboard, method):
+    """Open a form through its dashboard method and return the seconds until it is drawn."""
+    started = time.perf_counter()
+    getattr(dashboard, method)()
+    dashboard.dashboard.update()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--opens", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["BYTEBANK_DATA_ROOT"] = directory
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        import tkinter
+        import MainApp
+        from bytebank.ledger import get_ledger
+        get_ledger("bench").add_many(make_rows(args.rows))
+        try:
+            dashboard = MainApp.MainDashboard("bench")
+        except tkinter.TclError as e:
+            print(f"No display available ({str(e)}); form latency needs one.")
+            return 0
+        dashboard.dashboard.update()
+        print(f"{'form':10}{'first open':>12}{'reopen median':>15}{'reopen max':>12}{'widgets':>10}  (ms)")
+        for name, method in FORMS:
+            first = open_ready(dashboard, method)
+            window = dashboard.forms[name][0]
+            widgets = count_widgets(window)
+            reopens = []
+            for _ in range(args.opens):
+                dashboard.hide_form(window)
+                dashboard.dashboard.update()
+                reopens.append(open_ready(dashboard, method))
+            dashboard.hide_form(window)
+            grown = count_widgets(window) - widgets
+            print(f"{name:10}{first * 1000:12.1f}{statistics.median(reopens) * 1000:15.1f}"
+                  f"{max(reopens) * 1000:12.1f}{widgets:10}" + (f"  (+{grown} after reopening!)" if grown else ""))
+        dashboard.dashboard.destroy()
+        dashboard.io.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""Benchmark the Operations API on synthetic ledgers of growing size.
+
+    python benchmarks/ledger_ops.py --sizes 1000 10000 100000 1000000 --backend all --output results.json
+    python benchmarks/ledger_ops.py --compare results.json
+
+For each backend and size, a fresh process fills a temp data directory
+with random transactions, then times opening the ledger and each of
+Operations' add, update, delete, view and summary calls. Each call is
+repeated up to --repeat times or until --max-seconds have been spent on
+it. The results are latency (mean, median, 95th percentile, max),
+throughput, the peak Python memory allocated by one call (from
+tracemalloc, over --memory-calls untimed calls made first) and the
+process's peak RSS.
+
+Results are written as JSON with the git commit, Python version and
+platform. --compare reads an earlier file and exits with status 1 if any
+median latency grew by more than --tolerance (changes under NOISE_MS
+are ignored). Nothing here needs a display.
+"""
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from common import make_rows, timed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKENDS = ["json", "journal", "sqlite", "binary", "partitioned"]
+USERNAME = "bench"
+CHUNK = 100000
+RESULTS_VERSION = 1
+# Median changes smaller than this are timer noise, whatever their ratio.
+NOISE_MS = 0.05
+
+
+def peak_rss():
+    """Return the process's peak resident set size in bytes, or None where it is not available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def seed_ledger(backend, rows, sample):
+    """Fill the bench user's ledger with `rows` transactions; return `sample` of their ids, shuffled."""
+    from bytebank.storage import open_backend
+    rng = random.Random(rows)
+    store = open_backend(USERNAME, backend)
+    store.reload()
+    ids = []
+    for seed, start in enumerate(range(0, rows, CHUNK)):
+        chunk = make_rows(min(CHUNK, rows - start), seed=seed)
+        store.add_many(chunk)
+        ids.extend(rng.sample([t["id"] for t in chunk], min(len(chunk), sample)))
+    store.close()
+    rng.shuffle(ids)
+    return ids[:sample]
+
+
+def operations(ids, calls, rows):
+    """Return [(name, fn(i))] for the calls being measured, in the order they run.
+
+    Update and delete take ids from separate slices of `ids`, so no
+    transaction is deleted before it is updated or deleted twice.
+    """
+    from bytebank.ledger import Ledger
+    from bytebank.operations import Operations
+
+    def open_ledger(i):
+        Ledger(USERNAME).backend.close()
+
+    def add(i):
+        Operations.add_transaction(USERNAME, "Expense", "12.50", f"Benchmark add {i}", "Food", "2025-06-15",
+                                   "Card", "")
+
+    def update(i):
+        Operations.update_transaction(USERNAME, ids[i], amount=f"{i + 1}.00", notes="updated")
+
+    def delete(i):
+        Operations.delete_transaction(USERNAME, ids[calls + i])
+
+    def view_all(i):
+        len(Operations.view_transactions(USERNAME))
+
+    def view_filtered(i):
+        Operations.view_transactions(USERNAME, start_date="2025-01-01", end_date="2025-01-31", category="Food")
+
+    def view_page(i):
+        Operations.view_transactions(USERNAME, order_by="date", descending=True, offset=100 * i % max(rows, 1),
+                                     limit=100)
+
+    def summary(i):
+        Operations.get_summary(USERNAME)
+
+    return [("open", open_ledger), ("summary", summary), ("view_all", view_all), ("view_filtered", view_filtered),
+            ("view_page", view_page), ("update", update), ("add", add), ("delete", delete)]
+
+
+def measure_call(fn, args):
+    """Run `fn` for the memory calls, then time it; return its result entry."""
+    peak = 0
+    for i in range(args.memory_calls):
+        tracemalloc.start()
+        fn(i)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    latencies, spent = [], 0.0
+    for i in range(args.memory_calls, args.memory_calls + args.repeat):
+        seconds, _ = timed(lambda: fn(i))
+        latencies.append(seconds)
+        spent += seconds
+        if spent >= args.max_seconds:
+            break
+    ordered = sorted(latencies)
+    return {"calls": len(latencies), "mean_ms": spent * 1000 / len(latencies),
+            "p50_ms": percentile(ordered, 0.5) * 1000, "p95_ms": percentile(ordered, 0.95) * 1000,
+            "max_ms": ordered[-1] * 1000, "ops_per_second": len(latencies) / spent if spent else None,
+            "peak_alloc_bytes": peak}
+
+
+def run(backend, rows, args):
+    """Seed and measure one ledger; runs in its own process so memory figures are not shared."""
+    calls = args.memory_calls + args.repeat
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            seed_seconds, ids = timed(lambda: seed_ledger(backend, rows, 2 * calls))
+            from bytebank.ledger import get_ledger
+            # Load the shared ledger first, so the first traced call of each operation measures only the call.
+            get_ledger(USERNAME)
+            results = {}
+            for name, fn in operations(ids, calls, rows):
+                results[name] = measure_call(fn, args)
+            get_ledger(USERNAME).backend.close()
+        finally:
+            os.chdir(ROOT)
+    return {"backend": backend, "rows": rows, "seed_seconds": seed_seconds, "peak_rss_bytes": peak_rss(),
+            "operations": results}
+
+
+def run_isolated(backend, rows, args):
+    """Run one measurement in a fresh interpreter using `backend` as the default storage."""
+    os.environ["BYTEBANK_STORAGE"] = backend
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(run, (backend, rows, args))
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, check=True, capture_output=True,
+                              text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(result):
+    rss = result["peak_rss_bytes"]
+    print(f"{result['backend']} backend, {result['rows']} rows (seeded in {result['seed_seconds']:.1f}s"
+          + (f", peak RSS {rss / 1e6:.0f} MB)" if rss else ")"))
+    print(f"  {'operation':14}{'calls':>6}{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}{'ops/s':>10}"
+          f"{'peak alloc':>12}")
+    for name, entry in result["operations"].items():
+        rate = entry["ops_per_second"]
+        print(f"  {name:14}{entry['calls']:6}{entry['mean_ms']:10.2f}{entry['p50_ms']:10.2f}"
+              f"{entry['p95_ms']:10.2f}{entry['max_ms']:10.2f}{rate if rate else 0:10.0f}"
+              f"{entry['peak_alloc_bytes'] / 1e6:10.1f}MB")
+
+
+def compare(baseline_path, results, tolerance):
+    """Print how median latencies changed against a baseline file; return the number of regressions."""
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    before = {(r["backend"], r["rows"], name): entry["p50_ms"]
+              for r in baseline["results"] for name, entry in r["operations"].items()}
+    print(f"Compared with {baseline_path} (commit {baseline.get('git') or 'unknown'}):")
+    regressions = 0
+    for result in results:
+        for name, entry in result["operations"].items():
+            old = before.get((result["backend"], result["rows"], name))
+            if not old:
+                continue
+            ratio = entry["p50_ms"] / old
+            slower = ratio > tolerance and entry["p50_ms"] - old > NOISE_MS
+            regressions += slower
+            print(f"  {result['backend']:12}{result['rows']:>9} {name:14}{old:10.2f} -> {entry['p50_ms']:8.2f} ms"
+                  f"  x{ratio:.2f}" + ("  REGRESSION" if slower else ""))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--backend", choices=BACKENDS + ["all"], default="json")
+    parser.add_argument("--repeat", type=int, default=50, help="timed calls per operation (at most)")
+    parser.add_argument("--max-seconds", type=float, default=5.0,
+                        help="stop repeating an operation once its timed calls took this long")
+    parser.add_argument("--memory-calls", type=int, default=3,
+                        help="untimed calls traced for peak allocation before timing")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="earlier results file to compare median latencies with")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="median latency ratio above which --compare reports a regression")
+    args = parser.parse_args()
+    backends = BACKENDS if args.backend == "all" else [args.backend]
+    results = []
+    for backend in backends:
+        for rows in args.sizes:
+            result = run_isolated(backend, rows, args)
+            print_result(result)
+            results.append(result)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"version": RESULTS_VERSION, "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "git": git_commit(), "python": platform.python_version(), "platform": platform.platform(),
+                       "settings": {"repeat": args.repeat, "max_seconds": args.max_seconds,
+                                    "memory_calls": args.memory_calls},
+                       "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+    if args.compare:
+        return 1 if compare(args.compare, results, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
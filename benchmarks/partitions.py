@@ -0,0 +1,57 @@
+"""Compare opening a ledger as one JSON file and as monthly partitions.
+
+    python benchmarks/partitions.py --rows 100000
+
+Times opening the ledger with its all-time summary, the dashboard's first
+newest-first page, and a one-month report, and counts the partitions read.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from common import make_rows, timed
+
+from bytebank.ledger import Ledger
+from bytebank.storage import open_backend
+
+USERNAME = "bench"
+MONTH = ("2023-06-01", "2023-06-30")
+
+
+def measure(name):
+    open_time, ledger = timed(lambda: Ledger(USERNAME, name))
+    summary = ledger.summary()
+    page_time, page = timed(lambda: ledger.query(order_by="date", descending=True, limit=20))
+    month_time, month = timed(lambda: ledger.query(start_date=MONTH[0], end_date=MONTH[1]))
+    loaded = f"   ({len(ledger.backend.partitions)} partitions read)" if name == "partitioned" else ""
+    print(f"{name:12} open+summary {open_time * 1000:8.1f} ms   first page {page_time * 1000:7.1f} ms   "
+          f"one month {month_time * 1000:7.1f} ms{loaded}")
+    ledger.backend.close()
+    return summary, [t["id"] for t in page], sorted(t["id"] for t in month)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            backend = open_backend(USERNAME, "json")
+            backend.reload()
+            backend.add_many(make_rows(args.rows))
+            # The first partitioned open splits the JSON ledger; time the opens after it.
+            Ledger(USERNAME, "partitioned")
+            print(f"{args.rows} transactions")
+            results = [measure(name) for name in ("json", "partitioned")]
+        finally:
+            os.chdir(os.path.dirname(directory))
+    if results[0] != results[1]:
+        print("Results differ between layouts!")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
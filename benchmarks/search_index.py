@@ -0,0 +1,56 @@
+"""Time building and querying the persistent search index.
+
+    python benchmarks/search_index.py --rows 1000000
+
+Loads a binary-format ledger in chunks, builds the index from a stream of
+records, then times rare and common word prefixes, multi-word and
+amount-range queries, and one incremental write.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from common import best_of, make_rows, timed
+
+from bytebank.ledger import Ledger
+from bytebank.storage import open_backend, search_index_path
+
+USERNAME = "bench"
+CHUNK = 100000
+QUERIES = ["store 123", "purchase", "p", "split fri", "food monthly", "bills >4900", "100..101", "nothing"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--backend", default="binary")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            backend = open_backend(USERNAME, args.backend)
+            backend.reload()
+            for seed, start in enumerate(range(0, args.rows, CHUNK)):
+                backend.add_many(make_rows(min(CHUNK, args.rows - start), seed=seed))
+            backend.close()
+            ledger = Ledger(USERNAME, args.backend)
+            build_time, _ = timed(ledger.rebuild_search_index)
+            size = os.path.getsize(search_index_path(USERNAME)) / 1e6
+            print(f"{args.rows} transactions: index built in {build_time:.1f}s ({size:.0f} MB)")
+            for query in QUERIES:
+                seconds, rows = best_of(lambda: ledger.search(query, limit=20))
+                print(f"  {query!r:16} {seconds * 1000:8.2f} ms   {len(rows)} results")
+            rows = make_rows(1, seed=-1)
+            rows[0]["description"] = "Quokka sighting"
+            add_time, _ = timed(lambda: ledger.add_many(rows))
+            found = ledger.search("quok")
+            print(f"  add one + index  {add_time * 1000:8.2f} ms   found again: {bool(found)}")
+            ledger.backend.close()
+        finally:
+            os.chdir(os.path.dirname(directory))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Measure cold start of the desktop app up to an interactive login window.
+
+    python benchmarks/startup.py --runs 5
+
+Each run is a fresh interpreter, so imports are timed as a user sees them.
+A run imports MainApp and loads the login and dashboard profile icons, then
+builds the login window and draws it once (skipped without a display). The
+first run starts with an empty image cache; the rest reuse it. For
+comparison, it also times what the icons cost before thumbnails were cached:
+decoding images/profile.png and resizing it, once per icon.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import timed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUN = r"""
+import json, os, sys, time
+started = time.perf_counter()
+import MainApp
+imported = time.perf_counter()
+MainApp.load_thumbnail(MainApp.PROFILE_IMAGE, (100, 100))
+MainApp.load_thumbnail(MainApp.PROFILE_IMAGE, (40, 40))
+icons = time.perf_counter()
+window = None
+if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+    page = MainApp.LoginPage()
+    page.app.update()
+    window = time.perf_counter() - icons
+    page.app.destroy()
+print(json.dumps({"import": imported - started, "icons": icons - imported, "window": window}))
+"""
+
+
+def run_once(cache_dir):
+    env = dict(os.environ, BYTEBANK_IMAGE_CACHE=cache_dir, PYTHONPATH=ROOT)
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", RUN], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process"] = time.perf_counter() - started
+    return result
+
+
+def uncached_icons():
+    from PIL import Image
+
+    def load(size):
+        image = Image.open(os.path.join(ROOT, "images", "profile.png"))
+        return image.resize(size)
+
+    return timed(lambda: (load((100, 100)), load((40, 40))))[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = run_once(cache_dir)
+        warm = [run_once(cache_dir) for _ in range(args.runs)]
+    print(f"{'':22}{'import':>10}{'icons':>10}{'window':>10}{'process':>10}  (ms)")
+    for name, results in (("first run (no cache)", [cold]), (f"median of {args.runs} warm", warm)):
+        row = {key: statistics.median(r[key] for r in results) if results[0][key] is not None else None
+               for key in ("import", "icons", "window", "process")}
+        print(f"{name:22}" + "".join(f"{row[key] * 1000:10.1f}" if row[key] is not None else f"{'-':>10}"
+                                     for key in ("import", "icons", "window", "process")))
+    print(f"{'full-size decode':22}{'':10}{uncached_icons() * 1000:10.1f}   (both icons, without the cache)")
+    if warm[0]["window"] is None:
+        print("No display: login window not built.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
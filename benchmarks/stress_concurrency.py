@@ -0,0 +1,76 @@
+"""Stress test: N processes each add M transactions to one shared ledger.
+
+Every process also signs up its own account, so both the ledger lock and
+concurrent inserts into the user directory are exercised. The run fails (exit code 1) if any
+transaction or account is lost.
+
+    python benchmarks/stress_concurrency.py --processes 8 --per-process 200 --backend all
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bytebank.ledger import Ledger
+from bytebank.users import count_users, create_user
+from bytebank.validation import build_transaction
+
+USERNAME = "stress"
+
+
+def worker(directory, backend, worker_id, count):
+    os.chdir(directory)
+    ledger = Ledger(USERNAME, backend)
+    create_user(f"user-{worker_id}", "secret")
+    for i in range(count):
+        ledger.add(build_transaction("Expense", "1.00", f"worker {worker_id} row {i}", "Other",
+                                     "2025-01-01", "Cash"))
+
+
+def run(backend, processes, per_process):
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        jobs = [multiprocessing.Process(target=worker, args=(directory, backend, n, per_process))
+                for n in range(processes)]
+        for job in jobs:
+            job.start()
+        for job in jobs:
+            job.join()
+        elapsed = time.perf_counter() - start
+
+        os.chdir(directory)
+        try:
+            ledger = Ledger(USERNAME, backend)
+            rows = ledger.backend.all()
+            users = count_users()
+            expected = processes * per_process
+            lost = expected - len({t["id"] for t in rows})
+            lost_users = processes - users
+            crashed = sum(1 for job in jobs if job.exitcode != 0)
+            ok = not lost and not lost_users and not crashed and ledger.summary()["total_expense"] == expected * 100
+            print(f"{backend:8} {expected} adds by {processes} processes in {elapsed:.2f}s "
+                  f"({expected / elapsed:.0f}/s): {len(rows)} stored, {lost} lost, "
+                  f"{lost_users} accounts lost, {crashed} workers failed -> {'OK' if ok else 'FAIL'}")
+            ledger.backend.close()
+        finally:
+            os.chdir(os.path.dirname(directory))
+        return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--per-process", type=int, default=200)
+    parser.add_argument("--backend", choices=["json", "journal", "sqlite", "binary", "partitioned", "all"], default="all")
+    args = parser.parse_args()
+    backends = ["json", "journal", "sqlite", "binary", "partitioned"] if args.backend == "all" else [args.backend]
+    results = [run(backend, args.processes, args.per_process) for backend in backends]
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""Smoke-test the desktop UI: build every window and drive the main flows.
+
+    python benchmarks/ui_smoke.py
+
+Runs in a temp data directory. With a display, it builds the real login
+page and dashboard and opens every form twice (built, then reused).
+Without one, the Tk widget classes MainApp uses are replaced by stand-ins
+that remember their options and text and accept any other call. Every
+setup_ui() and form builder still runs, so errors in the UI code (a
+missing helper, a bad callback) surface here. The stand-in run also:
+
+- creates an account and logs in
+- adds a transaction through the Add form
+- saves a budget
+- loads the reports table and searches
+
+It then checks the results on the dashboard. The exit status is 1 on any
+error popup, any "Error ..." line printed by the app, or any failed check.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORMS = ["add_expense_form", "update_records_form", "delete_records_form", "view_reports_form", "export_form",
+         "set_budget_form"]
+WIDGETS = ["CTk", "CTkToplevel", "CTkButton", "CTkLabel", "CTkEntry", "CTkFrame", "CTkOptionMenu",
+           "CTkScrollableFrame", "CTkProgressBar", "CTkImage", "Listbox"]
+
+
+class StandIn:
+    """A widget that remembers its options, text and rows, and accepts any other call."""
+    created = []
+
+    def __init__(self, master=None, *args, **options):
+        self.master = master
+        self.options = dict(options)
+        self.value = options["values"][0] if options.get("values") else ""
+        self.rows = []
+        self.visible = True
+        StandIn.created.append(self)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: StandIn()
+
+    def configure(self, *style, **options):
+        self.options.update(options)
+
+    config = configure
+
+    def cget(self, key):
+        return self.options.get(key, "")
+
+    def get(self, *args):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+    def insert(self, index, *items, **options):
+        if index == 0 and items:
+            self.value = str(items[0]) + self.value
+        else:
+            self.rows.append(options.get("iid", items[0] if items else None))
+
+    def delete(self, *args):
+        self.value = ""
+        self.rows = []
+
+    def get_children(self, *args):
+        return tuple(self.rows)
+
+    def exists(self, iid):
+        return iid in self.rows
+
+    def winfo_children(self):
+        return []
+
+    def winfo_exists(self):
+        return True
+
+    def winfo_viewable(self):
+        return self.visible
+
+    def withdraw(self):
+        self.visible = False
+
+    def deiconify(self):
+        self.visible = True
+
+    def curselection(self):
+        return ()
+
+    def after(self, ms, fn=None, *args):
+        return "after"
+
+    def after_idle(self, fn=None, *args):
+        return "after"
+
+
+def inside(widget, window):
+    while widget is not None:
+        if widget is window:
+            return True
+        widget = getattr(widget, "master", None) if isinstance(widget, StandIn) else None
+    return False
+
+
+def find(window, **options):
+    """Return the last stand-in inside `window` whose options include `options`."""
+    for widget in reversed(StandIn.created):
+        if inside(widget, window) and all(widget.options.get(key) == value for key, value in options.items()):
+            return widget
+    raise LookupError(f"No widget with {options}")
+
+
+def fill(window, **entries):
+    for placeholder, text in entries.items():
+        entry = find(window, placeholder_text=placeholder)
+        entry.delete(0, "end")
+        entry.insert(0, text)
+
+
+def click(window, text):
+    find(window, text=text).cget("command")()
+
+
+def settle(dashboard, seconds=5.0):
+    """Deliver background results to the UI until the I/O worker is idle."""
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        time.sleep(0.05)
+        dashboard.io.drain()
+        if not dashboard.io.pending(dashboard.username):
+            dashboard.io.drain()
+            return
+
+
+def run_with_display(MainApp, check):
+    from bytebank.users import create_user
+    page = MainApp.LoginPage()
+    page.app.update()
+    page.app.destroy()
+    create_user("smoke", "secret")
+    dashboard = MainApp.MainDashboard("smoke")
+    dashboard.dashboard.update()
+    for method in FORMS:
+        for _ in range(2):
+            getattr(dashboard, method)()
+            dashboard.dashboard.update()
+            check(any(window.winfo_viewable() for window, _ in dashboard.forms.values()), f"{method} shown")
+            for window, _ in dashboard.forms.values():
+                dashboard.hide_form(window)
+    check(len(dashboard.forms) == len(FORMS), "one window per form")
+    dashboard.dashboard.destroy()
+    dashboard.io.shutdown()
+
+
+def run_with_stand_ins(MainApp, check, popups):
+    for name in WIDGETS:
+        setattr(MainApp, name, StandIn)
+    MainApp.ttk = types.SimpleNamespace(Style=StandIn, Treeview=StandIn, Scrollbar=StandIn)
+    dashboards = []
+    MainApp.MainDashboard.run = lambda self: dashboards.append(self)
+
+    page = MainApp.LoginPage()
+    page.create_account_window()
+    fill(page.app, **{"New Username": "smoke", "New Password": "secret", "Confirm Password": "secret"})
+    click(page.app, "Create Account")
+    check(("Success", "Account successfully created!") in popups, "account created")
+    fill(page.app, Username="smoke", Password="secret")
+    page.login()
+    check(len(dashboards) == 1, "login opens the dashboard")
+    dashboard = dashboards[0]
+    settle(dashboard)
+
+    for method in FORMS:
+        getattr(dashboard, method)()
+        settle(dashboard)
+    windows = {name: form[0] for name, form in dashboard.forms.items()}
+    for method in FORMS:
+        getattr(dashboard, method)()
+        settle(dashboard)
+    check(len(windows) == len(FORMS) and all(dashboard.forms[name][0] is window
+                                             for name, window in windows.items()), "forms are reused")
+
+    dashboard.add_expense_form()
+    form = dashboard.forms["add"][0]
+    fill(form, **{"₹0.00": "250", "Enter details (e.g., Lunch, Salary)": "Smoke groceries",
+                  "YYYY-MM-DD": "2025-06-01"})
+    click(form, "Add Record")
+    settle(dashboard)
+    check(("Success", "Transaction added successfully!") in popups, "transaction added")
+    check("250.00" in str(dashboard.total_expense_btn.cget("text")), "summary shows the new expense")
+
+    dashboard.set_budget_form()
+    form = dashboard.forms["budget"][0]
+    fill(form, **{"₹0.00": "1000"})
+    click(form, "Save Budget")
+    settle(dashboard)
+    check(dashboard.budget_rows is not None and any(row["category"] == "Food" for row in dashboard.budget_rows[1]),
+          "budget panel shows the new budget")
+
+    dashboard.view_reports_form()
+    settle(dashboard)
+    form = dashboard.forms["reports"][0]
+    check(any(inside(w, form) and str(w.cget("text")).startswith("Showing 1 of 1")
+              and "Expense ₹250.00" in str(w.cget("text")) for w in StandIn.created), "reports table and totals loaded")
+
+    dashboard.search_picker.entry.insert(0, "smoke")
+    dashboard.search_picker.search()
+    settle(dashboard)
+    check(len(dashboard.search_picker.ids) == 1, "search finds the transaction")
+    dashboard.io.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+    failures = []
+
+    def check(ok, what):
+        print(f"  {'ok  ' if ok else 'FAIL'} {what}")
+        if not ok:
+            failures.append(what)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["BYTEBANK_DATA_ROOT"] = directory
+        os.environ["BYTEBANK_METRICS"] = "0"
+        sys.path.insert(0, ROOT)
+        os.chdir(ROOT)
+        import tkinter
+        import MainApp
+        popups = []
+        show_popup = MainApp.show_popup
+
+        def record_popup(parent, message, title="Success", *args, **kwargs):
+            popups.append((title, message))
+            if title == "Error":
+                failures.append(f"error popup: {message}")
+            return show_popup(parent, message, title, *args, **kwargs)
+
+        MainApp.show_popup = record_popup
+        output = io.StringIO()
+        try:
+            tkinter.Tk().destroy()
+            display = True
+        except tkinter.TclError:
+            display = False
+        print(f"UI smoke test ({'real widgets' if display else 'no display: stand-in widgets'})")
+        with contextlib.redirect_stdout(output):
+            try:
+                if display:
+                    run_with_display(MainApp, check)
+                else:
+                    run_with_stand_ins(MainApp, check, popups)
+            except Exception as e:
+                import traceback
+                traceback.print_exc(file=output)
+                failures.append(f"{type(e).__name__}: {str(e)}")
+        for line in output.getvalue().splitlines():
+            print(line)
+            if line.startswith("Error"):
+                failures.append(line)
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
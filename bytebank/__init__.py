@@ -0,0 +1 @@
+"""Core (UI-independent) ledger logic for ByteBank Expense Tracker."""
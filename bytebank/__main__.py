@@ -0,0 +1,5 @@
+import sys
+
+from bytebank.cli import main
+
+sys.exit(main())
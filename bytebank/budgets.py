@@ -0,0 +1,149 @@
+"""Per-category monthly budgets and threshold alerts.
+
+Budgets live in `budgets.json` in the user's directory: a limit (in paise)
+per category, either for every month or for one month (YYYY-MM), which
+takes precedence. Alerts fire when a mutation moves a category's spending
+for a month across one of the thresholds (percentages of the limit,
+default 80 and 100).
+
+Checks are incremental: the ledger records the spending of each
+(month, category) a mutation touches just before applying it, and
+compares it with the rollups' maintained Expense totals afterwards, so no
+transactions are rescanned.
+"""
+import re
+import json
+import datetime
+
+from bytebank.money import AmountError, format_amount, to_paise
+from bytebank.storage.base import stat_signature, write_json_atomic
+from bytebank.validation import ValidationError
+
+BUDGETS_VERSION = 1
+DEFAULT_THRESHOLDS = [80, 100]
+MONTH_RE = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+
+def current_month():
+    return datetime.date.today().strftime("%Y-%m")
+
+
+def alert_message(alert):
+    """Return a one-line description of a budget alert."""
+    return (f"{alert['category']} spending for {alert['month']} reached {alert['threshold']}% of its budget: "
+            f"₹{format_amount(alert['spent'])} of ₹{format_amount(alert['limit'])}")
+
+
+class Budgets:
+    """A user's budget limits and alert thresholds, re-read whenever the file changes."""
+    def __init__(self, path):
+        self.path = path
+        self.limits = {}
+        self.thresholds = list(DEFAULT_THRESHOLDS)
+        self._signature = None
+
+    def load(self):
+        """(Re)read the file. Return True if its contents changed since the last load."""
+        signature = stat_signature(self.path)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        self.limits = {}
+        self.thresholds = list(DEFAULT_THRESHOLDS)
+        if signature is not None:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.thresholds = data.get("thresholds", self.thresholds)
+            for budget in data["budgets"]:
+                self.limits[(budget["category"], budget["month"])] = budget["limit"]
+        return True
+
+    def save(self):
+        budgets = [{"category": category, "month": month, "limit": limit}
+                   for (category, month), limit in sorted(self.limits.items(), key=lambda item: str(item[0]))]
+        write_json_atomic(self.path, {"version": BUDGETS_VERSION, "thresholds": self.thresholds,
+                                      "budgets": budgets})
+        self._signature = stat_signature(self.path)
+
+    def limit(self, month, category):
+        """Return the limit for a category in a month, or None if it has no budget."""
+        limit = self.limits.get((category, month))
+        return self.limits.get((category, None)) if limit is None else limit
+
+    def categories(self, month):
+        return sorted({category for category, budget_month in self.limits if budget_month in (None, month)})
+
+    def check(self, spent_before, rollups):
+        """Return alerts for the (month, category) totals that crossed a threshold.
+
+        `spent_before` maps (month, category) to the spending before the
+        mutation; the current spending comes from `rollups`. Only upward
+        crossings alert, once per category, for the highest threshold passed.
+        """
+        self.load()
+        alerts = []
+        for (month, category), before in spent_before.items():
+            limit = self.limit(month, category)
+            if not limit:
+                continue
+            spent = rollups.spent(month, category)
+            crossed = [threshold for threshold in self.thresholds if before * 100 < limit * threshold <= spent * 100]
+            if crossed:
+                alerts.append({"month": month, "category": category, "spent": spent, "limit": limit,
+                               "threshold": max(crossed)})
+        return alerts
+
+    def status(self, rollups, month=None):
+        """Return [{"category", "spent", "limit", "percent"}] for every budgeted category in a month."""
+        month = month or current_month()
+        rows = []
+        for category in self.categories(month):
+            limit = self.limit(month, category)
+            spent = rollups.spent(month, category)
+            rows.append({"category": category, "spent": spent, "limit": limit, "percent": spent * 100 // limit})
+        return rows
+
+
+def _check_month(month):
+    if month is not None and not MONTH_RE.match(month):
+        raise ValidationError("Month must be YYYY-MM.")
+
+
+def _edit(ledger, edit):
+    """Apply `edit(budgets)` under the ledger's lock, save, and let listeners see the change."""
+    with ledger.backend.locked():
+        ledger.budgets.load()
+        result = edit(ledger.budgets)
+        ledger.budgets.save()
+    ledger.budgets_changed()
+    return result
+
+
+def set_budget(ledger, category, amount, month=None):
+    """Set a category's limit (rupee text) for every month, or for one month (YYYY-MM)."""
+    _check_month(month)
+    if not category:
+        raise ValidationError("Please select a category.")
+    try:
+        limit = to_paise(str(amount).strip())
+    except AmountError as e:
+        raise ValidationError(str(e))
+    if limit <= 0:
+        raise ValidationError("Please enter a valid amount (> 0).")
+    _edit(ledger, lambda budgets: budgets.limits.__setitem__((category, month), limit))
+    return limit
+
+
+def remove_budget(ledger, category, month=None):
+    """Remove a budget. Return False if there was none."""
+    _check_month(month)
+    return _edit(ledger, lambda budgets: budgets.limits.pop((category, month), None) is not None)
+
+
+def set_thresholds(ledger, thresholds):
+    """Set the alert thresholds, as percentages of the limit."""
+    thresholds = sorted(set(int(threshold) for threshold in thresholds))
+    if not thresholds or thresholds[0] <= 0:
+        raise ValidationError("Thresholds must be positive percentages.")
+    _edit(ledger, lambda budgets: setattr(budgets, "thresholds", thresholds))
+    return thresholds
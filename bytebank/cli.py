@@ -0,0 +1,406 @@
+"""Headless command-line interface: ``python -m bytebank <command> ...``.
+
+Only the core ledger modules are imported, so the CLI runs on machines
+without a display (cron jobs, servers) and starts quickly.
+"""
+import sys
+import json
+import time
+import argparse
+
+from bytebank import budgets
+from bytebank.ledger import get_ledger
+from bytebank.money import check_amounts, format_amount, report_inexact
+from bytebank.operations import Operations, TransactionNotFound
+from bytebank.validation import ValidationError
+
+
+def _filters(args):
+    filters = {}
+    for key in ("start_date", "end_date", "category", "transaction_type", "payment_method"):
+        if getattr(args, key, None):
+            filters[key] = getattr(args, key)
+    return filters
+
+
+def _print_transaction(t):
+    print(f"{t['id']}  {t['date']}  {t['type']:<7} {format_amount(t['amount']):>12}  {t['category']:<10} "
+          f"{t['payment_method']:<13} {t['description']}" + (f"  [{t['notes']}]" if t["notes"] else ""))
+
+
+def _print_alerts(username):
+    # On stderr, so scripts reading the new transaction's id from stdout are unaffected.
+    for alert in get_ledger(username).take_alerts():
+        print(f"Budget alert: {budgets.alert_message(alert)}", file=sys.stderr)
+
+
+def cmd_add(args):
+    transaction = Operations.add_transaction(args.username, args.type, args.amount, args.description,
+                                             args.category, args.date, args.payment_method, args.notes)
+    print(transaction["id"])
+    _print_alerts(args.username)
+
+
+def cmd_update(args):
+    transaction = Operations.update_transaction(args.username, args.id, args.type, args.amount, args.description,
+                                                args.category, args.date, args.payment_method, args.notes)
+    _print_transaction(transaction)
+    _print_alerts(args.username)
+
+
+def cmd_delete(args):
+    Operations.delete_transaction(args.username, args.id)
+    print(f"Deleted {args.id}")
+
+
+def cmd_list(args):
+    ledger = get_ledger(args.username)
+    ledger.refresh()
+    rows = ledger.query(**_filters(args), order_by=args.sort, descending=args.desc, limit=args.limit)
+    for t in rows:
+        if args.json:
+            print(json.dumps(t, ensure_ascii=False))
+        else:
+            _print_transaction(t)
+
+
+def cmd_summary(args):
+    if args.start_month or args.end_month or args.category:
+        summary = get_ledger(args.username).period_summary(args.start_month, args.end_month, args.category)
+    else:
+        summary = Operations.get_summary(args.username)
+    if args.json:
+        print(json.dumps(summary))
+        return
+    print(f"Current Balance: ₹{format_amount(summary['current_balance'])}")
+    print(f"Total Income:    ₹{format_amount(summary['total_income'])}")
+    print(f"Total Expense:   ₹{format_amount(summary['total_expense'])}")
+    print(f"Total Savings:   ₹{format_amount(summary['total_savings'])}")
+
+
+def cmd_report(args):
+    groups = Operations.get_report(args.username, args.by, **_filters(args))
+    if args.json:
+        print(json.dumps(groups))
+        return
+    for value in sorted(groups):
+        group = groups[value]
+        print(f"{value:<14} income {format_amount(group['Income']):>12}  expense {format_amount(group['Expense']):>12}"
+              f"  ({group['count']})")
+
+
+def cmd_import(args):
+    from bytebank.importer import import_statement
+    report = import_statement(get_ledger(args.username), args.path, args.format, batch_size=args.batch_size)
+    for line, reason in report.rejected:
+        print(f"rejected line {line}: {reason}", file=sys.stderr)
+    print(report.summary())
+    return 1 if report.rejected_count and args.strict else 0
+
+
+def cmd_export(args):
+    from bytebank.exporter import export_ledger
+    started = time.perf_counter()
+    count = export_ledger(get_ledger(args.username), args.output, args.format, **_filters(args))
+    print(f"Exported {count} transactions to {args.output} in {time.perf_counter() - started:.2f}s")
+
+
+def cmd_rollups(args):
+    ledger = get_ledger(args.username)
+    if args.rebuild:
+        started = time.perf_counter()
+        ledger.rebuild_rollups()
+        print(f"Rebuilt {len(ledger.rollups.cells)} rollup cells in {time.perf_counter() - started:.2f}s")
+    for month, category, transaction_type, payment_method, total, count in ledger.breakdown(
+            args.start_month, args.end_month, args.category):
+        print(f"{month}  {category:<12} {transaction_type:<8} {payment_method:<14} {format_amount(total):>12}  ({count})")
+
+
+def cmd_search(args):
+    ledger = get_ledger(args.username)
+    if args.rebuild:
+        started = time.perf_counter()
+        ledger.rebuild_search_index()
+        print(f"Indexed {ledger.count()} transactions in {time.perf_counter() - started:.2f}s")
+    if args.text:
+        for t in ledger.search(" ".join(args.text), offset=args.offset, limit=args.limit):
+            _print_transaction(t)
+
+
+def cmd_check_amounts(args):
+    inexact = 0
+    for path in args.paths:
+        with open(path, "r") as f:
+            transactions = json.load(f)
+        problems = check_amounts(transactions)
+        report_inexact(path, problems)
+        inexact += len(problems)
+    print(f"{inexact} amounts cannot be stored exactly in paise")
+    return 1 if inexact else 0
+
+
+def cmd_migrate_layout(args):
+    from bytebank.storage.layout import migrate_all
+    usernames = migrate_all(args.root, dry_run=args.dry_run)
+    print(f"{len(usernames)} users {'to move' if args.dry_run else 'moved'} to the sharded layout")
+
+
+def cmd_metrics(args):
+    from bytebank import instrument
+    records = instrument.read_metrics(args.log)
+    if args.span:
+        records = (r for r in records if r["span"].startswith(args.span))
+    summary = instrument.summarize(records)
+    if not summary:
+        print(f"No spans logged in {args.log or instrument.metrics_log_path()} (set BYTEBANK_METRICS=1 to log them)")
+        return
+    print(f"{'span':32}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'errors':>8}")
+    for name, entry in sorted(summary.items(), key=lambda item: -item[1]["p95_ms"]):
+        print(f"{name:32}{entry['count']:8}{entry['p50_ms']:10.2f}{entry['p95_ms']:10.2f}{entry['max_ms']:10.2f}"
+              f"{entry['errors']:8}")
+
+
+def _print_rule(rule):
+    fields = rule["fields"]
+    schedule = f"cron {rule['cron']}" if rule["frequency"] == "cron" else \
+        f"{rule['frequency']} x{rule['interval']}"
+    print(f"{rule['id']}  {schedule:<14} from {rule['start']} to {rule['end'] or '-':<10} "
+          f"{fields['type']:<7} {format_amount(fields['amount']):>12}  {fields['description']}")
+
+
+def cmd_recurring_add(args):
+    from bytebank import recurring
+    rule = recurring.make_rule(args.type, args.amount, args.description, args.category, args.payment_method,
+                               args.notes, "cron" if args.cron else args.every, args.interval, args.cron,
+                               args.start, args.end)
+    recurring.add_rule(args.username, rule)
+    _print_rule(rule)
+
+
+def cmd_recurring_list(args):
+    from bytebank import recurring
+    for rule in recurring.list_rules(args.username):
+        _print_rule(rule)
+
+
+def cmd_recurring_remove(args):
+    from bytebank import recurring
+    if not recurring.remove_rule(args.username, args.id):
+        print(f"Error: No recurring rule {args.id}", file=sys.stderr)
+        return 2
+    print(f"Removed rule {args.id}")
+
+
+def cmd_recurring_run(args):
+    from bytebank import recurring
+    started = time.perf_counter()
+    added = recurring.materialize_due(args.username)
+    print(f"Added {len(added)} recurring transactions in {time.perf_counter() - started:.2f}s")
+
+
+def cmd_budget_set(args):
+    limit = budgets.set_budget(get_ledger(args.username), args.category, args.amount, args.month)
+    print(f"Budget for {args.category} ({args.month or 'every month'}): ₹{format_amount(limit)}")
+
+
+def cmd_budget_remove(args):
+    if not budgets.remove_budget(get_ledger(args.username), args.category, args.month):
+        print(f"Error: No budget for {args.category} ({args.month or 'every month'})", file=sys.stderr)
+        return 2
+    print(f"Removed budget for {args.category} ({args.month or 'every month'})")
+
+
+def cmd_budget_list(args):
+    ledger = get_ledger(args.username)
+    ledger.refresh()
+    for row in ledger.budget_status(args.month):
+        print(f"{row['category']:<12} {format_amount(row['spent']):>12} / {format_amount(row['limit']):>12}  "
+              f"{row['percent']:>4}%")
+
+
+def cmd_budget_thresholds(args):
+    thresholds = budgets.set_thresholds(get_ledger(args.username), args.thresholds)
+    print(f"Alert thresholds: {', '.join(f'{threshold}%' for threshold in thresholds)}")
+
+
+def _add_fields(parser, required):
+    parser.add_argument("--type", choices=["Expense", "Income"], required=required)
+    parser.add_argument("--amount", required=required)
+    parser.add_argument("--description", required=required)
+    parser.add_argument("--category", required=required)
+    parser.add_argument("--date", help="YYYY-MM-DD (default: today)" if required else "YYYY-MM-DD")
+    parser.add_argument("--payment-method", dest="payment_method", required=required)
+    parser.add_argument("--notes", default="" if required else None)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="bytebank", description="ByteBank Expense Tracker")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add a transaction")
+    add.add_argument("username")
+    _add_fields(add, required=True)
+    add.set_defaults(func=cmd_add)
+
+    update = commands.add_parser("update", help="update fields of a transaction")
+    update.add_argument("username")
+    update.add_argument("id")
+    _add_fields(update, required=False)
+    update.set_defaults(func=cmd_update)
+
+    delete = commands.add_parser("delete", help="delete a transaction")
+    delete.add_argument("username")
+    delete.add_argument("id")
+    delete.set_defaults(func=cmd_delete)
+
+    list_ = commands.add_parser("list", help="list transactions")
+    list_.add_argument("username")
+    list_.add_argument("--from", dest="start_date", help="first date to include (YYYY-MM-DD)")
+    list_.add_argument("--to", dest="end_date", help="last date to include (YYYY-MM-DD)")
+    list_.add_argument("--category")
+    list_.add_argument("--type", dest="transaction_type", choices=["Expense", "Income"])
+    list_.add_argument("--payment-method", dest="payment_method")
+    list_.add_argument("--sort", choices=["date", "type", "amount", "description", "category", "payment_method"])
+    list_.add_argument("--desc", action="store_true", help="sort descending")
+    list_.add_argument("--limit", type=int)
+    list_.add_argument("--json", action="store_true", help="print one JSON object per line")
+    list_.set_defaults(func=cmd_list)
+
+    summary = commands.add_parser("summary", help="show totals (all time, or for a span of months)")
+    summary.add_argument("username")
+    summary.add_argument("--from", dest="start_month", help="first month (YYYY-MM)")
+    summary.add_argument("--to", dest="end_month", help="last month (YYYY-MM)")
+    summary.add_argument("--category")
+    summary.add_argument("--json", action="store_true")
+    summary.set_defaults(func=cmd_summary)
+
+    report = commands.add_parser("report", help="income and expense totals per category, type, payment or month")
+    report.add_argument("username")
+    report.add_argument("--by", choices=["category", "type", "payment_method", "month"], default="category")
+    report.add_argument("--from", dest="start_date", help="first date to include (YYYY-MM-DD)")
+    report.add_argument("--to", dest="end_date", help="last date to include (YYYY-MM-DD)")
+    report.add_argument("--category")
+    report.add_argument("--type", dest="transaction_type", choices=["Expense", "Income"])
+    report.add_argument("--payment-method", dest="payment_method")
+    report.add_argument("--json", action="store_true")
+    report.set_defaults(func=cmd_report)
+
+    import_ = commands.add_parser("import", help="import a CSV/OFX/QIF bank statement")
+    import_.add_argument("username")
+    import_.add_argument("path")
+    import_.add_argument("--format", choices=["csv", "ofx", "qif"],
+                         help="statement format (default: from the file extension)")
+    import_.add_argument("--batch-size", dest="batch_size", type=int, default=1000)
+    import_.add_argument("--strict", action="store_true", help="exit with status 1 if any row is rejected")
+    import_.set_defaults(func=cmd_import)
+
+    export = commands.add_parser("export", help="stream a ledger to CSV, JSONL or columnar (.bbcol)")
+    export.add_argument("username")
+    export.add_argument("output")
+    export.add_argument("--format", choices=["csv", "jsonl", "columnar"],
+                        help="output format (default: from the file extension)")
+    export.add_argument("--from", dest="start_date", help="first date to include (YYYY-MM-DD)")
+    export.add_argument("--to", dest="end_date", help="last date to include (YYYY-MM-DD)")
+    export.add_argument("--category")
+    export.set_defaults(func=cmd_export)
+
+    rollups = commands.add_parser("rollups", help="show (or --rebuild) the monthly rollup cache")
+    rollups.add_argument("username")
+    rollups.add_argument("--rebuild", action="store_true", help="recompute the cache from raw transactions")
+    rollups.add_argument("--from", dest="start_month", help="first month to show (YYYY-MM)")
+    rollups.add_argument("--to", dest="end_month", help="last month to show (YYYY-MM)")
+    rollups.add_argument("--category")
+    rollups.set_defaults(func=cmd_rollups)
+
+    search = commands.add_parser("search", help="full-text search of description, notes and category")
+    search.add_argument("username")
+    search.add_argument("text", nargs="*", help="word prefixes, and amounts as >500, <=1200 or 100..250")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--offset", type=int, default=0)
+    search.add_argument("--rebuild", action="store_true", help="re-index every transaction first")
+    search.set_defaults(func=cmd_search)
+
+    check = commands.add_parser("check-amounts",
+                                help="report float amounts in old JSON ledgers that would be rounded on migration")
+    check.add_argument("paths", nargs="+", metavar="path", help="a JSON ledger (transactions.json) file")
+    check.set_defaults(func=cmd_check_amounts)
+
+    layout = commands.add_parser("migrate-layout",
+                                 help="move <username>_transactions.* files into per-user directories")
+    layout.add_argument("--root", help="data directory to migrate (default: BYTEBANK_DATA_ROOT or .)")
+    layout.add_argument("--dry-run", dest="dry_run", action="store_true", help="only list the moves")
+    layout.set_defaults(func=cmd_migrate_layout)
+
+    metrics = commands.add_parser("metrics", help="summarize span timings from the metrics log")
+    metrics.add_argument("--log", help="log file (default: BYTEBANK_METRICS_LOG or metrics.log in the data root)")
+    metrics.add_argument("--span", help="only spans whose name starts with this, e.g. operations.")
+    metrics.set_defaults(func=cmd_metrics)
+
+    recurring_add = commands.add_parser("recurring-add", help="add a recurring transaction rule")
+    recurring_add.add_argument("username")
+    recurring_add.add_argument("--type", choices=["Expense", "Income"], required=True)
+    recurring_add.add_argument("--amount", required=True)
+    recurring_add.add_argument("--description", required=True)
+    recurring_add.add_argument("--category", required=True)
+    recurring_add.add_argument("--payment-method", dest="payment_method", required=True)
+    recurring_add.add_argument("--notes", default="")
+    recurring_add.add_argument("--every", choices=["daily", "weekly", "monthly", "yearly"], default="monthly")
+    recurring_add.add_argument("--interval", type=int, default=1, help="repeat every N days/weeks/months/years")
+    recurring_add.add_argument("--cron", help="'<day of month> <month> <day of week>', e.g. '1 * *'")
+    recurring_add.add_argument("--start", help="first date (YYYY-MM-DD, default: today)")
+    recurring_add.add_argument("--end", help="last date (YYYY-MM-DD)")
+    recurring_add.set_defaults(func=cmd_recurring_add)
+
+    recurring_list = commands.add_parser("recurring-list", help="list recurring transaction rules")
+    recurring_list.add_argument("username")
+    recurring_list.set_defaults(func=cmd_recurring_list)
+
+    recurring_remove = commands.add_parser("recurring-remove", help="remove a recurring rule")
+    recurring_remove.add_argument("username")
+    recurring_remove.add_argument("id")
+    recurring_remove.set_defaults(func=cmd_recurring_remove)
+
+    recurring_run = commands.add_parser("recurring-run", help="add all due recurring transactions")
+    recurring_run.add_argument("username")
+    recurring_run.set_defaults(func=cmd_recurring_run)
+
+    budget_set = commands.add_parser("budget-set", help="set a category's monthly spending limit")
+    budget_set.add_argument("username")
+    budget_set.add_argument("category")
+    budget_set.add_argument("amount")
+    budget_set.add_argument("--month", help="only for this month (YYYY-MM; default: every month)")
+    budget_set.set_defaults(func=cmd_budget_set)
+
+    budget_remove = commands.add_parser("budget-remove", help="remove a category's spending limit")
+    budget_remove.add_argument("username")
+    budget_remove.add_argument("category")
+    budget_remove.add_argument("--month", help="remove the limit for this month only (YYYY-MM)")
+    budget_remove.set_defaults(func=cmd_budget_remove)
+
+    budget_list = commands.add_parser("budget-list", help="show spending against each budget for a month")
+    budget_list.add_argument("username")
+    budget_list.add_argument("--month", help="YYYY-MM (default: this month)")
+    budget_list.set_defaults(func=cmd_budget_list)
+
+    budget_thresholds = commands.add_parser("budget-thresholds",
+                                            help="set the alert thresholds, in percent of the limit")
+    budget_thresholds.add_argument("username")
+    budget_thresholds.add_argument("thresholds", nargs="+", type=int, metavar="percent")
+    budget_thresholds.set_defaults(func=cmd_budget_thresholds)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args) or 0
+    except (ValidationError, TransactionNotFound) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 2
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
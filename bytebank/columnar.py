@@ -0,0 +1,187 @@
+"""Column-oriented NumPy snapshot of a ledger for vectorized reports.
+
+Amounts, dates and the dictionary-encoded `type`, `category` and
+`payment_method` fields are held as flat NumPy arrays, so summaries,
+group-bys and date-range filters are single array operations instead of
+loops over dicts. Free text (id, description, notes) is kept in object
+arrays, loaded only when asked for.
+
+NumPy is optional: importing this module works without it, but building a
+ColumnarLedger raises ImportError.
+"""
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+CODED_FIELDS = ("type", "category", "payment_method")
+TEXT_FIELDS = ("id", "description", "notes")
+GROUP_FIELDS = CODED_FIELDS + ("month",)
+# date(1970, 1, 1).toordinal(): converts ordinals to datetime64 day numbers.
+EPOCH_ORDINAL = 719163
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("Columnar ledgers need NumPy: pip install numpy")
+
+
+class ColumnarLedger:
+    """A read-only snapshot of transactions stored column by column.
+
+    `amount` is int64 paise, `date` is datetime64[D] and `codes[field]`
+    holds int32 indexes into `values[field]`. Text columns come from
+    `text` (a {field: object array} dict) or, for snapshots of a binary
+    ledger, from `load_text(positions)` on first use.
+    """
+    def __init__(self, amount, date, codes, values, text=None, load_text=None, positions=None):
+        require_numpy()
+        self.amount = amount
+        self.date = date
+        self.codes = codes
+        self.values = values
+        self._text = text
+        self._load_text = load_text
+        self._positions = positions
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        """Build a snapshot from an iterable of transaction dicts."""
+        require_numpy()
+        values = {field: [] for field in CODED_FIELDS}
+        index = {field: {} for field in CODED_FIELDS}
+        codes = {field: [] for field in CODED_FIELDS}
+        text = {field: [] for field in TEXT_FIELDS}
+        amount, date = [], []
+        for t in transactions:
+            amount.append(t["amount"])
+            date.append(t["date"])
+            for field in CODED_FIELDS:
+                code = index[field].get(t[field])
+                if code is None:
+                    code = index[field][t[field]] = len(values[field])
+                    values[field].append(t[field])
+                codes[field].append(code)
+            for field in TEXT_FIELDS:
+                text[field].append(t.get(field) or "")
+        return cls(np.array(amount, dtype=np.int64), np.array(date, dtype="datetime64[D]"),
+                   {field: np.array(codes[field], dtype=np.int32) for field in CODED_FIELDS}, values,
+                   text={field: np.array(text[field], dtype=object) for field in TEXT_FIELDS})
+
+    @classmethod
+    def from_binary(cls, backend):
+        """Build a snapshot straight from a BinaryBackend's mapped records, without per-row dicts."""
+        require_numpy()
+        from bytebank.storage.binary import HEADER, RECORD
+        dtype = np.dtype({
+            "names": ["flags", "type", "category", "payment_method", "date", "amount"],
+            "formats": ["u1", "u1", "<u2", "<u2", "<i4", "<i8"],
+            "offsets": [16, 17, 18, 20, 22, 26],
+            "itemsize": RECORD.size,
+        })
+        records = np.frombuffer(backend._records, dtype=dtype, count=backend.record_count, offset=HEADER.size) \
+            if backend.record_count else np.zeros(0, dtype=dtype)
+        live = (records["flags"] & 1) == 0
+        # Boolean indexing copies, so the snapshot holds no view of the mapping.
+        positions = np.nonzero(live)[0]
+        amount = records["amount"][live]
+        date = (records["date"][live] - EPOCH_ORDINAL).astype("datetime64[D]")
+        codes = {field: records[field][live].astype(np.int32) for field in CODED_FIELDS}
+        values = {field: list(backend.codes[field]) for field in CODED_FIELDS}
+        version = backend.version
+
+        def load_text(selected):
+            if backend.version != version:
+                raise RuntimeError("The ledger changed since this snapshot was taken")
+            rows = [backend._unpack(int(position)) for position in selected]
+            return {field: np.array([t[field] for t in rows], dtype=object) for field in TEXT_FIELDS}
+
+        return cls(amount, date, codes, values, load_text=load_text, positions=positions)
+
+    @classmethod
+    def from_backend(cls, backend):
+        """Build a snapshot of any storage backend, reading binary ledgers without decoding rows."""
+        from bytebank.storage.binary import BinaryBackend
+        if isinstance(backend, BinaryBackend):
+            return cls.from_binary(backend)
+        return cls.from_transactions(backend.iter_transactions())
+
+    def __len__(self):
+        return len(self.amount)
+
+    def text(self, field):
+        """Return the object array for a free-text column ("id", "description" or "notes")."""
+        if self._text is None:
+            self._text = self._load_text(self._positions)
+        return self._text[field]
+
+    def mask(self, start_date=None, end_date=None, category=None, transaction_type=None, payment_method=None):
+        """Return a boolean array selecting the rows that match the filters (dates inclusive)."""
+        selected = np.ones(len(self), dtype=bool)
+        if start_date is not None:
+            selected &= self.date >= np.datetime64(start_date, "D")
+        if end_date is not None:
+            selected &= self.date <= np.datetime64(end_date, "D")
+        for field, value in (("type", transaction_type), ("category", category),
+                             ("payment_method", payment_method)):
+            if value is None:
+                continue
+            if value not in self.values[field]:
+                selected[:] = False
+                break
+            selected &= self.codes[field] == self.values[field].index(value)
+        return selected
+
+    def select(self, **filters):
+        """Return a new snapshot holding only the rows that match `filters` (see mask)."""
+        selected = self.mask(**filters)
+        text = None if self._text is None else {field: column[selected] for field, column in self._text.items()}
+        positions = None if self._positions is None else self._positions[selected]
+        return ColumnarLedger(self.amount[selected], self.date[selected],
+                              {field: column[selected] for field, column in self.codes.items()}, self.values,
+                              text=text, load_text=self._load_text, positions=positions)
+
+    def _type_weights(self, selected, transaction_type):
+        """Amounts of `transaction_type` rows among `selected`, and 0 for every other row."""
+        if transaction_type not in self.values["type"]:
+            return np.zeros(int(selected.sum()), dtype=np.int64)
+        code = self.values["type"].index(transaction_type)
+        return np.where(self.codes["type"][selected] == code, self.amount[selected], 0)
+
+    def totals(self, **filters):
+        """Return {"Income": paise, "Expense": paise} for the matching rows."""
+        selected = self.mask(**filters)
+        return {kind: int(self._type_weights(selected, kind).sum()) for kind in ("Income", "Expense")}
+
+    def summary(self, **filters):
+        """Return the same figures as Ledger.summary(), for the matching rows."""
+        totals = self.totals(**filters)
+        total_savings = totals["Income"] - totals["Expense"]
+        return {
+            "total_income": totals["Income"],
+            "total_expense": totals["Expense"],
+            "total_savings": total_savings,
+            "current_balance": total_savings
+        }
+
+    def group_by(self, field, **filters):
+        """Return {value: {"Income": paise, "Expense": paise, "count": n}} per `field` value.
+
+        `field` is "type", "category", "payment_method" or "month" (YYYY-MM).
+        np.bincount sums in float64, which is exact below 2**53 paise per group.
+        """
+        if field not in GROUP_FIELDS:
+            raise ValueError(f"Cannot group by {field}")
+        selected = self.mask(**filters)
+        if field == "month":
+            months, keys = np.unique(self.date[selected].astype("datetime64[M]"), return_inverse=True)
+            labels = [str(month) for month in months]
+        else:
+            keys = self.codes[field][selected]
+            labels = self.values[field]
+        size = len(labels)
+        counts = np.bincount(keys, minlength=size)
+        income = np.bincount(keys, weights=self._type_weights(selected, "Income"), minlength=size)
+        expense = np.bincount(keys, weights=self._type_weights(selected, "Expense"), minlength=size)
+        return {labels[i]: {"Income": int(income[i]), "Expense": int(expense[i]), "count": int(counts[i])}
+                for i in np.nonzero(counts)[0]}
@@ -0,0 +1,122 @@
+"""Streaming export of ledgers to CSV, JSON Lines and a compact columnar format.
+
+Transactions are pulled from the ledger one at a time (the columnar writer
+buffers at most one row group), so memory use stays constant regardless of
+ledger size.
+
+Columnar file layout (``.bbcol``)::
+
+    b"BBCOL1\\n"
+    repeated row groups:
+        uint32 row count (little endian)
+        per column, in COLUMNS order: uint32 byte length + zlib(JSON array)
+    uint32 0  (end marker)
+
+Low-cardinality columns (type, category, payment method, date) compress
+very well because each column's values are stored contiguously.
+
+CSV amounts are written in rupees ("12.50") for spreadsheets; JSON Lines and
+columnar exports keep the stored integer paise (1250).
+"""
+import os
+import csv
+import json
+import zlib
+import struct
+
+from bytebank.money import format_amount
+
+COLUMNS = ("id", "type", "amount", "description", "category", "date", "payment_method", "notes")
+COLUMNAR_MAGIC = b"BBCOL1\n"
+ROW_GROUP_SIZE = 10000
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".bbcol": "columnar"}
+
+
+def write_csv(transactions, f):
+    writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for t in transactions:
+        writer.writerow(dict(t, amount=format_amount(t["amount"])))
+        count += 1
+    return count
+
+
+def write_jsonl(transactions, f):
+    count = 0
+    for t in transactions:
+        f.write(json.dumps({c: t.get(c) for c in COLUMNS}, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def _write_row_group(f, rows):
+    f.write(struct.pack("<I", len(rows)))
+    for column in COLUMNS:
+        block = zlib.compress(json.dumps([row.get(column) for row in rows], ensure_ascii=False).encode("utf-8"))
+        f.write(struct.pack("<I", len(block)))
+        f.write(block)
+
+
+def write_columnar(transactions, f, row_group_size=ROW_GROUP_SIZE):
+    f.write(COLUMNAR_MAGIC)
+    count = 0
+    rows = []
+    for t in transactions:
+        rows.append(t)
+        if len(rows) >= row_group_size:
+            _write_row_group(f, rows)
+            count += len(rows)
+            rows = []
+    if rows:
+        _write_row_group(f, rows)
+        count += len(rows)
+    f.write(struct.pack("<I", 0))
+    return count
+
+
+def read_columnar(path):
+    """Yield transactions from a columnar export, one row group in memory at a time."""
+    with open(path, "rb") as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"Not a ByteBank columnar file: {path}")
+        while True:
+            (n_rows,) = struct.unpack("<I", f.read(4))
+            if not n_rows:
+                return
+            columns = []
+            for _ in COLUMNS:
+                (length,) = struct.unpack("<I", f.read(4))
+                columns.append(json.loads(zlib.decompress(f.read(length))))
+            for values in zip(*columns):
+                yield dict(zip(COLUMNS, values))
+
+
+def export_ledger(ledger, path, fmt=None, **filters):
+    """Stream the ledger's matching transactions to `path`; return the number written.
+
+    `fmt` is "csv", "jsonl" or "columnar" (guessed from the extension by
+    default). `filters` are passed to Ledger.iter_transactions, e.g.
+    start_date, end_date and category.
+    """
+    fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower(), "csv")
+    transactions = ledger.iter_transactions(**filters)
+    if fmt not in ("csv", "jsonl", "columnar"):
+        raise ValueError(f"Unsupported export format: {fmt}")
+    tmp_path = f"{path}.tmp"
+    try:
+        if fmt == "csv":
+            with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+                count = write_csv(transactions, f)
+        elif fmt == "jsonl":
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                count = write_jsonl(transactions, f)
+        else:
+            with open(tmp_path, "wb") as f:
+                count = write_columnar(transactions, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
@@ -0,0 +1,255 @@
+"""Streaming import of bank statements (CSV, OFX and QIF) into a ledger.
+
+Rows are parsed one at a time, validated with the same rules as manual
+entry and committed in batches, so each batch costs one storage write and
+memory use does not grow with the size of the statement.
+"""
+import os
+import re
+import csv
+import time
+import uuid
+import datetime
+from decimal import Decimal, InvalidOperation
+
+from bytebank.validation import ValidationError, build_transaction
+
+BATCH_SIZE = 1000
+MAX_REPORTED_REJECTS = 1000
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y", "%d-%m-%y", "%d.%m.%Y",
+                "%d-%b-%Y", "%d %b %Y", "%d-%b-%y", "%Y%m%d", "%m/%d/%Y")
+DEFAULT_CATEGORY = "Other"
+DEFAULT_PAYMENT_METHOD = "Bank Transfer"
+# Namespace for the ids of imported rows: uuid5(IMPORT_NAMESPACE, "<format>:<line>:<row content>").
+IMPORT_NAMESPACE = uuid.UUID("5f2d9c1e-7a43-5e08-b6d4-2c9e81a07f53")
+ID_FIELDS = ("type", "amount", "description", "category", "date", "payment_method", "notes")
+
+# Header spellings seen in common bank exports, mapped onto the ledger schema.
+# `debit`/`credit` are split-amount columns that also determine the type.
+COLUMN_ALIASES = {
+    "date": ("date", "transaction date", "txn date", "value date", "posting date", "posted date"),
+    "description": ("description", "narration", "details", "particulars", "payee", "name"),
+    "amount": ("amount", "transaction amount", "amt"),
+    "debit": ("debit", "withdrawal", "withdrawal amt", "withdrawal amount", "debit amount", "dr"),
+    "credit": ("credit", "deposit", "deposit amt", "deposit amount", "credit amount", "cr"),
+    "type": ("type", "transaction type", "dr/cr", "cr/dr"),
+    "category": ("category",),
+    "payment_method": ("payment_method", "payment method", "mode"),
+    "notes": ("notes", "memo", "remarks", "reference", "ref no", "chq/ref number"),
+}
+
+_TYPE_WORDS = {"expense": "Expense", "debit": "Expense", "dr": "Expense", "d": "Expense",
+               "income": "Income", "credit": "Income", "cr": "Income", "c": "Income"}
+_OFX_TAG_RE = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+
+class ImportReport:
+    """Counts, rejected rows and throughput of one import run."""
+    def __init__(self, path):
+        self.path = path
+        self.imported = 0
+        self.duplicates = 0
+        self.rejected_count = 0
+        self.rejected = []
+        self.batches = 0
+        self.elapsed = 0.0
+
+    def reject(self, line, reason):
+        self.rejected_count += 1
+        if len(self.rejected) < MAX_REPORTED_REJECTS:
+            self.rejected.append((line, reason))
+
+    @property
+    def rows_per_second(self):
+        return self.imported / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        text = (f"Imported {self.imported} rows in {self.elapsed:.2f}s "
+                f"({self.rows_per_second:.0f} rows/s, {self.batches} batches); "
+                f"rejected {self.rejected_count}")
+        if self.duplicates:
+            text += f", skipped {self.duplicates} already imported"
+        return text + "."
+
+
+def parse_date(value, formats=DATE_FORMATS):
+    """Normalise a bank date string to YYYY-MM-DD."""
+    value = value.strip().replace("'", "/")
+    for fmt in formats:
+        try:
+            return datetime.datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    raise ValidationError(f"Unrecognised date: {value!r}")
+
+
+def parse_amount(value):
+    """Parse a bank amount such as '₹1,234.50', '-20' or '(20.00)' into a Decimal."""
+    text = re.sub(r"[^\d.\-()]", "", str(value))
+    negative = text.startswith("-") or (text.startswith("(") and text.endswith(")"))
+    text = text.strip("-()")
+    if not text:
+        return None
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        raise ValidationError(f"Invalid amount: {value!r}")
+    return -amount if negative else amount
+
+
+def resolve_columns(header, column_map=None):
+    """Map schema fields onto CSV header names; explicit `column_map` entries win."""
+    normalised = {h.strip().lower(): h for h in header if h}
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalised:
+                columns[field] = normalised[alias]
+                break
+    columns.update(column_map or {})
+    return columns
+
+
+def _build(fields, default_category, default_payment_method, date_formats):
+    """Turn raw statement fields into a validated transaction record."""
+    amount = parse_amount(fields.get("amount") or "")
+    transaction_type = _TYPE_WORDS.get((fields.get("type") or "").strip().lower())
+    if amount is None:
+        debit = parse_amount(fields.get("debit") or "")
+        credit = parse_amount(fields.get("credit") or "")
+        if debit:
+            amount, transaction_type = abs(debit), "Expense"
+        elif credit:
+            amount, transaction_type = abs(credit), "Income"
+        else:
+            raise ValidationError("Please enter a valid amount (> 0).")
+    if transaction_type is None:
+        transaction_type = "Expense" if amount < 0 else "Income"
+    if not fields.get("date"):
+        raise ValidationError("Date is required.")
+    return build_transaction(
+        transaction_type, str(abs(amount)), fields.get("description") or "",
+        fields.get("category") or default_category, parse_date(fields["date"], date_formats),
+        fields.get("payment_method") or default_payment_method, fields.get("notes") or "",
+        transaction_id=fields.get("id"))
+
+
+def row_id(fmt, line, transaction):
+    """Return the id of an imported row: the same line of the same statement always gets the same id.
+
+    Two identical rows of one statement are on different lines, so both are kept.
+    """
+    content = "\x1f".join(str(transaction[field]) for field in ID_FIELDS)
+    return str(uuid.uuid5(IMPORT_NAMESPACE, f"{fmt}:{line}:{content}"))
+
+
+def iter_csv(path, column_map=None):
+    """Yield (line number, raw fields) for each CSV row."""
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        columns = resolve_columns(reader.fieldnames or [], column_map)
+        for row in reader:
+            yield reader.line_num, {field: row.get(header) for field, header in columns.items()}
+
+
+def iter_ofx(path):
+    """Yield (transaction number, raw fields) for each <STMTTRN> block of an OFX file."""
+    buffer = ""
+    number = 0
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            buffer += line
+            while "</STMTTRN>" in buffer.upper():
+                end = buffer.upper().index("</STMTTRN>")
+                block, buffer = buffer[:end], buffer[end + len("</STMTTRN>"):]
+                number += 1
+                tags = {k.upper(): v.strip() for k, v in _OFX_TAG_RE.findall(block)}
+                name, memo = tags.get("NAME", ""), tags.get("MEMO", "")
+                yield number, {
+                    "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"ofx:{tags['FITID']}")) if tags.get("FITID") else None,
+                    "date": tags.get("DTPOSTED", "")[:8],
+                    "amount": tags.get("TRNAMT", ""),
+                    "description": name or memo,
+                    "notes": memo if name else "",
+                }
+            if "<STMTTRN>" not in buffer.upper():
+                buffer = buffer[-len("<STMTTRN>"):]
+
+
+def iter_qif(path):
+    """Yield (line number, raw fields) for each record of a QIF file."""
+    fields = {}
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            if not line or line.startswith("!"):
+                continue
+            code, value = line[0], line[1:].strip()
+            if code == "^":
+                if fields:
+                    yield line_no, fields
+                fields = {}
+            elif code == "D":
+                fields["date"] = value
+            elif code in "TU":
+                fields["amount"] = value
+            elif code == "P":
+                fields["description"] = value
+            elif code == "M":
+                fields["notes"] = value
+            elif code == "L":
+                fields["category"] = value
+        if fields:
+            yield line_no, fields
+
+
+PARSERS = {".csv": "csv", ".ofx": "ofx", ".qfx": "ofx", ".qif": "qif"}
+
+
+def import_statement(ledger, path, fmt=None, column_map=None, batch_size=BATCH_SIZE,
+                     default_category=DEFAULT_CATEGORY, default_payment_method=DEFAULT_PAYMENT_METHOD,
+                     date_formats=DATE_FORMATS):
+    """Stream a statement file into `ledger` and return an ImportReport.
+
+    `fmt` is "csv", "ofx" or "qif" (guessed from the extension by default).
+    `column_map` maps schema fields to CSV headers when auto-detection fails.
+    Rows get deterministic ids (the OFX FITID, or `row_id`), so importing the
+    same statement again skips every row it already added.
+    """
+    fmt = fmt or PARSERS.get(os.path.splitext(path)[1].lower())
+    if fmt == "csv":
+        rows = iter_csv(path, column_map)
+    elif fmt == "ofx":
+        rows = iter_ofx(path)
+    elif fmt == "qif":
+        rows = iter_qif(path)
+    else:
+        raise ValueError(f"Unsupported statement format: {path}")
+
+    report = ImportReport(path)
+    started = time.perf_counter()
+    batch, batch_ids = [], set()
+    for line, fields in rows:
+        try:
+            transaction = _build(fields, default_category, default_payment_method, date_formats)
+        except (ValidationError, ValueError) as e:
+            report.reject(line, str(e))
+            continue
+        if not fields.get("id"):
+            transaction["id"] = row_id(fmt, line, transaction)
+        if transaction["id"] in batch_ids or ledger.find(transaction["id"]) is not None:
+            report.duplicates += 1
+            continue
+        batch.append(transaction)
+        batch_ids.add(transaction["id"])
+        if len(batch) >= batch_size:
+            ledger.add_many(batch)
+            report.imported += len(batch)
+            report.batches += 1
+            batch, batch_ids = [], set()
+    if batch:
+        ledger.add_many(batch)
+        report.imported += len(batch)
+        report.batches += 1
+    report.elapsed = time.perf_counter() - started
+    return report
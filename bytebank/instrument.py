@@ -0,0 +1,283 @@
+"""Timing spans, sampled profiling and a rotating metrics log.
+
+Spans wrap every Operations call, ledger load and write, background job and
+dashboard refresh. Each finished span is written as one JSON line to
+`metrics.log` in the data root (``BYTEBANK_METRICS_LOG`` to move it),
+rotated at 1 MB with three old files kept::
+
+    {"ts": "2025-06-15T10:04:11.532", "span": "ledger.write", "ms": 9.61, "thread": "bytebank-io-alice",
+     "parent": "operations.add_transaction", "rows": 10001, "bytes": 2315776}
+
+The code inside a span adds fields such as `rows` and `bytes` (the size of
+the ledger's files). The log is off unless ``BYTEBANK_METRICS=1``; spans
+then cost two clock reads, and the logging module is not even imported.
+``python -m bytebank metrics`` summarizes the log.
+Several processes may append to one log; a rotation by one of them can
+leave another writing to the rotated file until it restarts.
+
+Profiling is off unless ``BYTEBANK_PROFILE`` is ``cprofile`` or
+``tracemalloc`` (or the dashboard's Profiling menu picks one). Then one in
+every ``BYTEBANK_PROFILE_SAMPLE`` (default 10) outermost spans is profiled:
+cProfile stats are dumped to `profiles/` in the data root, at most
+PROFILE_KEEP files, and the path is logged with the span; tracemalloc adds
+the span's peak allocation and its top allocating lines. Profiled spans
+are logged even with the log otherwise off. Only one span is profiled at
+a time, and profiles of spans too fast to be logged are dropped.
+"""
+import os
+import json
+import time
+import datetime
+import functools
+import threading
+
+from bytebank.storage.base import data_path
+
+METRICS_ENABLED = os.environ.get("BYTEBANK_METRICS", "0") != "0"
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+PROFILE_MODES = ("cprofile", "tracemalloc")
+PROFILE_KEEP = 50
+# A periodic UI refresh slower than one frame at 60 Hz shows as a stutter.
+FRAME_MS = 16
+
+_local = threading.local()
+_logger = None
+_log_failed = False
+_log_lock = threading.Lock()
+_profile_lock = threading.Lock()
+_profile_mode = None
+_profile_sample = 10
+_profile_counter = 0
+
+
+def metrics_log_path():
+    return os.environ.get("BYTEBANK_METRICS_LOG") or data_path("metrics.log")
+
+
+def profile_dir():
+    return data_path("profiles")
+
+
+def _get_logger():
+    """Return the metrics logger, opening the log file on first use; None if it cannot be opened."""
+    global _logger, _log_failed
+    with _log_lock:
+        if _logger is None and not _log_failed:
+            import logging
+            import logging.handlers
+            try:
+                handler = logging.handlers.RotatingFileHandler(metrics_log_path(), maxBytes=LOG_MAX_BYTES,
+                                                               backupCount=LOG_BACKUPS, encoding="utf-8")
+            except OSError as e:
+                print(f"Warning: metrics log disabled: {str(e)}")
+                _log_failed = True
+                return None
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _logger = logging.getLogger("bytebank.metrics")
+            _logger.setLevel(logging.INFO)
+            _logger.propagate = False
+            _logger.addHandler(handler)
+        return _logger
+
+
+def set_profile_mode(mode, sample=None):
+    """Profile one in `sample` outermost spans with `mode` ("cprofile" or "tracemalloc"); None turns it off."""
+    global _profile_mode, _profile_sample
+    if mode is not None and mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode}")
+    _profile_mode = mode
+    if sample is not None:
+        _profile_sample = max(1, int(sample))
+
+
+def profile_mode():
+    return _profile_mode
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def file_size(paths):
+    """Return the total size in bytes of the files in `paths` that exist."""
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+class _Profile:
+    """One sampled profile of a span, in the current profile mode."""
+    def __init__(self, mode):
+        self.mode = mode
+        if mode == "cprofile":
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            import tracemalloc
+            self.tracemalloc = tracemalloc
+            tracemalloc.start()
+
+    def stop(self):
+        if self.mode == "cprofile":
+            self.profiler.disable()
+        else:
+            self.peak = self.tracemalloc.get_traced_memory()[1]
+            self.snapshot = self.tracemalloc.take_snapshot()
+            self.tracemalloc.stop()
+
+    def fields(self, name):
+        """Save or summarize the profile; return the fields to log with its span."""
+        if self.mode == "tracemalloc":
+            top = self.snapshot.statistics("lineno")[:3]
+            return {"alloc_peak": self.peak,
+                    "alloc_top": [f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} {stat.size}"
+                                  for stat in top]}
+        directory = profile_dir()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{datetime.datetime.now():%Y%m%d-%H%M%S-%f}-{name}.prof")
+        self.profiler.dump_stats(path)
+        profiles = sorted(entry for entry in os.listdir(directory) if entry.endswith(".prof"))
+        for old in profiles[:-PROFILE_KEEP]:
+            os.remove(os.path.join(directory, old))
+        return {"profile": path}
+
+
+def _start_profile():
+    """Return a _Profile if this outermost span is sampled and no other span is being profiled."""
+    global _profile_counter
+    mode = _profile_mode
+    if mode is None:
+        return None
+    _profile_counter += 1
+    if _profile_counter % _profile_sample or not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        return _Profile(mode)
+    except Exception as e:
+        _profile_lock.release()
+        print(f"Warning: could not start {mode} profile: {str(e)}")
+        return None
+
+
+class Span:
+    """A timed section of code; fields set on it are logged with its duration.
+
+    Spans nest per thread: each records the name of the span it ran in.
+    Spans shorter than `min_ms` are not logged.
+    """
+    def __init__(self, name, min_ms=0, **fields):
+        self.name = name
+        self.min_ms = min_ms
+        self.fields = fields
+        self.parent = None
+        self.profile = None
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1].name if stack else None
+        if not stack:
+            self.profile = _start_profile()
+        stack.append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ms = (time.perf_counter() - self.started) * 1000
+        _stack().pop()
+        if exc_type is not None:
+            self.fields["error"] = exc_type.__name__
+        profiled = self.profile is not None
+        if profiled:
+            try:
+                self.profile.stop()
+                if ms >= self.min_ms:
+                    self.fields.update(self.profile.fields(self.name))
+            except Exception as e:
+                print(f"Warning: profile of {self.name} not saved: {str(e)}")
+            finally:
+                _profile_lock.release()
+        if ms >= self.min_ms and (METRICS_ENABLED or profiled):
+            self._log(ms)
+        return False
+
+    def _log(self, ms):
+        logger = _get_logger()
+        if logger is None:
+            return
+        record = {"ts": datetime.datetime.now().isoformat(timespec="milliseconds"), "span": self.name,
+                  "ms": round(ms, 3), "thread": threading.current_thread().name, "parent": self.parent}
+        record.update(self.fields)
+        try:
+            logger.info(json.dumps(record, default=str))
+        except Exception as e:
+            print(f"Warning: metrics not logged: {str(e)}")
+
+
+def span(name, min_ms=0, **fields):
+    """Return a Span context manager: ``with span("ledger.write") as s: ...; s.set(rows=n)``."""
+    return Span(name, min_ms, **fields)
+
+
+def traced(name, **result_fields):
+    """Decorator running a function in a span.
+
+    `result_fields` map field names to functions of the return value, e.g.
+    ``@traced("operations.view_transactions", rows=len)``.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with Span(name) as s:
+                result = fn(*args, **kwargs)
+                s.set(**{field: compute(result) for field, compute in result_fields.items()})
+                return result
+        return wrapper
+    return decorate
+
+
+def read_metrics(path=None):
+    """Yield the span records from the metrics log and its rotated files, oldest first."""
+    path = path or metrics_log_path()
+    for suffix in [f".{n}" for n in range(LOG_BACKUPS, 0, -1)] + [""]:
+        try:
+            with open(path + suffix, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            continue
+
+
+def summarize(records):
+    """Return {span: {"count", "p50_ms", "p95_ms", "max_ms", "errors"}} for span records."""
+    durations, errors = {}, {}
+    for record in records:
+        durations.setdefault(record["span"], []).append(record["ms"])
+        errors[record["span"]] = errors.get(record["span"], 0) + ("error" in record)
+    summary = {}
+    for name, values in durations.items():
+        values.sort()
+        summary[name] = {"count": len(values), "p50_ms": values[len(values) // 2],
+                         "p95_ms": values[min(len(values) - 1, int(0.95 * len(values)))],
+                         "max_ms": values[-1], "errors": errors[name]}
+    return summary
+
+
+try:
+    set_profile_mode(os.environ.get("BYTEBANK_PROFILE") or None, os.environ.get("BYTEBANK_PROFILE_SAMPLE"))
+except ValueError as e:
+    print(f"Warning: profiling disabled: {str(e)}")
@@ -0,0 +1,435 @@
+"""Per-user ledger facade with running totals and change notifications."""
+import os
+import calendar
+import datetime
+import threading
+
+from bytebank.budgets import Budgets
+from bytebank.instrument import file_size, span
+from bytebank.rollups import RollupStore
+from bytebank.search import SearchIndex
+from bytebank.storage import StaleLedgerError, budgets_path, open_backend, rollup_path, search_index_path
+
+WRITE_RETRIES = 5
+
+
+class Ledger:
+    """Keep a user's running totals in memory on top of a storage backend.
+
+    Mutations update the totals incrementally and are written through to the
+    backend. The backend is only re-read when its signature (version counter,
+    file stats or, in SQLite, the user's change counter) shows that another
+    process has changed it. Each mutation holds the backend's write lock from
+    that check until the rollups are saved, so concurrent processes never lose
+    updates.
+
+    The persistent search index, once created, is updated in the same way,
+    one SQLite transaction per write.
+
+    Budgets are checked against the rollups' per-month category totals as
+    each mutation commits; alerts collect in `alerts` until `take_alerts()`.
+    """
+    def __init__(self, username, backend=None):
+        self.username = username
+        self.backend = open_backend(username, backend)
+        self.totals = {"Income": 0, "Expense": 0}
+        self.row_count = 0
+        self.rollups = RollupStore(rollup_path(username))
+        self.budgets = Budgets(budgets_path(username))
+        self.alerts = []
+        self._spent_before = {}
+        self._signature = None
+        self._listeners = []
+        self._index = None
+        self._index_changes = None
+        if os.path.exists(search_index_path(username)):
+            self._index = SearchIndex(search_index_path(username))
+        self._columns = None
+        self.budgets.load()
+        self.reload()
+
+    def reload(self):
+        """Re-read the ledger from its backend and recompute the running totals."""
+        with span("ledger.reload") as s, self.backend.locked():
+            self._columns = None
+            self.backend.reload()
+            self.totals = self.backend.totals()
+            self.row_count = self.backend.count()
+            self._signature = self.backend.signature()
+            if not self.rollups.load() or not self.rollups.matches(self.totals, self.row_count):
+                self.rebuild_rollups()
+            s.set(rows=self.row_count, bytes=file_size(self.backend.files()))
+
+    def rebuild_rollups(self):
+        """Recompute the rollup cache from the raw transactions."""
+        with span("rollups.rebuild", rows=self.row_count):
+            self.rollups.rebuild(self.backend.iter_transactions())
+
+    def refresh(self):
+        """Reload the ledger if it was changed by another process. Return True if it was.
+
+        Listeners are also notified when only the budgets file changed.
+        """
+        if self.backend.signature() == self._signature:
+            if self.budgets.load():
+                self._notify()
+            return False
+        self.budgets.load()
+        self.reload()
+        self._notify()
+        return True
+
+    def budgets_changed(self):
+        """Tell listeners the budget limits were edited (see bytebank.budgets)."""
+        self._notify()
+
+    @property
+    def transactions(self):
+        return self.backend.all()
+
+    def _apply(self, transaction, sign):
+        """Add (sign=1) or remove (sign=-1) a transaction from the running totals and row count."""
+        if transaction.get("type") in self.totals:
+            self.totals[transaction["type"]] += sign * transaction["amount"]
+        self.row_count += sign
+        if transaction.get("type") == "Expense":
+            month_category = (transaction["date"][:7], transaction["category"])
+            self._spent_before.setdefault(month_category, self.rollups.spent(*month_category))
+        self.rollups.apply(transaction, sign)
+        if self._index_changes is not None:
+            self._index_changes.append((transaction, sign))
+
+    def _committed(self):
+        """Record a mutation that has been written to the backend."""
+        self._columns = None
+        self._signature = self.backend.signature()
+        self.rollups.save()
+        if self._index_changes is not None:
+            try:
+                self._index.apply(self._index_changes, self.totals, self.row_count)
+            except Exception as e:
+                # The index missed this write; make sure the next search rebuilds it.
+                print(f"Warning: search index not updated: {str(e)}")
+                self._invalidate_search_index()
+        self._index_changes = None
+        self.alerts.extend(self.budgets.check(self._spent_before, self.rollups))
+        self._spent_before = {}
+        self._notify()
+
+    def _begin_index_write(self):
+        """Mark the search index pending and return a list for this write's changes, or None.
+
+        Only an index that matched the ledger before this write can be updated
+        incrementally. The mark stays if the write fails or the process dies
+        before the index is updated, and the next check rebuilds the index.
+        """
+        if self._index is None or not self._index.matches(self.totals, self.row_count):
+            return None
+        try:
+            self._index.mark_pending()
+        except Exception as e:
+            print(f"Warning: search index not updated: {str(e)}")
+            self._invalidate_search_index()
+            return None
+        return []
+
+    def _end_index_write(self):
+        """Clear the pending mark after a write that stored nothing."""
+        if self._index_changes is not None:
+            try:
+                self._index.clear_pending()
+            except Exception as e:
+                print(f"Warning: search index left pending: {str(e)}")
+        self._index_changes = None
+
+    def _invalidate_search_index(self):
+        """Make the search index fail its next check; delete it if even that cannot be written."""
+        try:
+            self._index.invalidate()
+            return
+        except Exception as e:
+            print(f"Warning: removing search index: {str(e)}")
+        index, self._index = self._index, None
+        try:
+            index.close()
+        except Exception:
+            pass
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(index.path + suffix)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error removing {index.path + suffix}: {str(e)}")
+
+    def _write(self, mutate):
+        """Run `mutate()` under the backend's write lock on an up-to-date copy of the ledger.
+
+        `mutate` returns False if it changed nothing. A StaleLedgerError from the
+        backend means another writer got in first; the ledger is reloaded and
+        the mutation retried.
+        """
+        with span("ledger.write") as s:
+            for attempt in range(WRITE_RETRIES):
+                with self.backend.locked():
+                    self._spent_before = {}
+                    if attempt:
+                        self.reload()
+                        self._notify()
+                    else:
+                        self.refresh()
+                    self._index_changes = self._begin_index_write()
+                    try:
+                        result = mutate()
+                    except StaleLedgerError:
+                        self._end_index_write()
+                        continue
+                    if result is not False:
+                        self._committed()
+                        s.set(rows=self.row_count, bytes=file_size(self.backend.files()))
+                    else:
+                        self._end_index_write()
+                    s.set(attempts=attempt + 1)
+                    return result
+            raise StaleLedgerError(f"Gave up writing {self.username}'s ledger after {WRITE_RETRIES} attempts")
+
+    def summary(self):
+        """Return total income, expense, savings and balance, in paise, from the running totals."""
+        total_income = self.totals["Income"]
+        total_expense = self.totals["Expense"]
+        total_savings = total_income - total_expense
+        return {
+            "total_income": total_income,
+            "total_expense": total_expense,
+            "total_savings": total_savings,
+            "current_balance": total_savings
+        }
+
+    def period_summary(self, start_month=None, end_month=None, category=None, payment_method=None):
+        """Return summary() figures for a span of months (YYYY-MM, inclusive) from the rollups."""
+        by_type = self.rollups.summary(start_month, end_month, category, payment_method)["by_type"]
+        total_savings = by_type["Income"] - by_type["Expense"]
+        return {
+            "total_income": by_type["Income"],
+            "total_expense": by_type["Expense"],
+            "total_savings": total_savings,
+            "current_balance": total_savings
+        }
+
+    def breakdown(self, start_month=None, end_month=None, category=None, payment_method=None):
+        """Return [month, category, type, payment_method, total, count] rollup rows."""
+        return self.rollups.breakdown(start_month, end_month, category, payment_method)
+
+    def filtered_totals(self, start_date=None, end_date=None, category=None, transaction_type=None,
+                        payment_method=None):
+        """Return {"Income": paise, "Expense": paise, "count": n} for the transactions query() would match.
+
+        Whole months come from the rollups. Only the days of a partial first or
+        last month are read, through the backend's own date filter, so the cost
+        does not grow with the ledger.
+        """
+        totals = {"Income": 0, "Expense": 0, "count": 0}
+        filters = {"category": category, "transaction_type": transaction_type, "payment_method": payment_method}
+
+        def add_rows(first, last):
+            for t in self.backend.iter_transactions(start_date=first, end_date=last, **filters):
+                totals[t["type"]] += t["amount"]
+                totals["count"] += 1
+
+        with span("ledger.filtered_totals"):
+            first, last = start_date, end_date
+            if first and not first.endswith("-01"):
+                head_end = _month_end(first)
+                if last and last <= head_end:
+                    add_rows(first, last)
+                    return totals
+                add_rows(first, head_end)
+                first = _next_day(head_end)
+            if last and last != _month_end(last):
+                tail_start = last[:8] + "01"
+                add_rows(max(tail_start, first) if first else tail_start, last)
+                last = _previous_day(tail_start)
+            if first is None or last is None or first <= last:
+                summary = self.rollups.summary(first and first[:7], last and last[:7], category, payment_method,
+                                               transaction_type)
+                totals["Income"] += summary["by_type"]["Income"]
+                totals["Expense"] += summary["by_type"]["Expense"]
+                totals["count"] += summary["count"]
+        return totals
+
+    def group_totals(self, field, **filters):
+        """Return {value: {"Income": paise, "Expense": paise, "count": n}} per `field` value.
+
+        `field` is "type", "category", "payment_method" or "month"; `filters`
+        are query()'s, with day-precision dates the monthly rollups cannot
+        answer. Runs on the column snapshot when NumPy is installed, otherwise
+        sums the matching transactions one by one.
+        """
+        from bytebank import columnar
+        if field not in columnar.GROUP_FIELDS:
+            raise ValueError(f"Cannot group by {field}")
+        with span("ledger.group_totals", field=field):
+            if columnar.np is not None:
+                return self.columns().group_by(field, **filters)
+            groups = {}
+            for t in self.backend.iter_transactions(**filters):
+                group = groups.setdefault(t["date"][:7] if field == "month" else t[field],
+                                          {"Income": 0, "Expense": 0, "count": 0})
+                group[t["type"]] += t["amount"]
+                group["count"] += 1
+            return groups
+
+    def budget_status(self, month=None):
+        """Return spending against each budget for a month (default: the current one)."""
+        return self.budgets.status(self.rollups, month)
+
+    def take_alerts(self):
+        """Return and clear the budget alerts raised since the last call."""
+        alerts, self.alerts = self.alerts, []
+        return alerts
+
+    def find(self, transaction_id):
+        """Return the transaction with the given id, or None."""
+        return self.backend.get(transaction_id)
+
+    def query(self, **filters):
+        """Return a page of transactions; see StorageBackend.query for the filters."""
+        return self.backend.query(**filters)
+
+    def count(self, **filters):
+        """Return how many transactions match the filters."""
+        return self.backend.count(**filters)
+
+    def iter_transactions(self, **filters):
+        """Stream matching transactions in insertion order."""
+        return self.backend.iter_transactions(**filters)
+
+    def search(self, text, offset=0, limit=20):
+        """Return transactions whose description, notes or category match `text`, newest first.
+
+        See bytebank.search for the query syntax. The index is built on first
+        use, or when it no longer matches the ledger, and maintained on every
+        mutation afterwards.
+        """
+        with self.backend.locked():
+            self.refresh()
+            if self._index is None:
+                self._index = SearchIndex(search_index_path(self.username))
+            if not self._index.matches(self.totals, self.row_count):
+                self.rebuild_search_index()
+        with span("ledger.search") as s:
+            ids = self._index.search(text, offset, limit)
+            results = [t for t in map(self.backend.get, ids) if t is not None]
+            s.set(results=len(results))
+        return results
+
+    def rebuild_search_index(self):
+        """Re-index every transaction from the backend, streaming them."""
+        with span("search.rebuild", rows=self.row_count), self.backend.locked():
+            if self._index is None:
+                self._index = SearchIndex(search_index_path(self.username))
+            self._index.rebuild(self.backend.iter_transactions(), self.totals, self.row_count)
+
+    def columns(self):
+        """Return a NumPy column snapshot (bytebank.columnar.ColumnarLedger) for vectorized reports.
+
+        Needs NumPy. The snapshot is rebuilt after the next change to the ledger.
+        """
+        if self._columns is None:
+            from bytebank.columnar import ColumnarLedger
+            self._columns = ColumnarLedger.from_backend(self.backend)
+        return self._columns
+
+    def add(self, transaction):
+        """Add a transaction and persist it."""
+        self.add_many([transaction])
+
+    def add_many(self, transactions):
+        """Add a batch of transactions with one storage write and one change notification."""
+        if not transactions:
+            return
+
+        def mutate():
+            self.backend.add_many(transactions)
+            for transaction in transactions:
+                self._apply(transaction, 1)
+
+        self._write(mutate)
+
+    def update(self, transaction_id, fields):
+        """Update a transaction. Return False if the id is unknown."""
+        def mutate():
+            transaction = self.backend.get(transaction_id)
+            if transaction is None:
+                return False
+            old = dict(transaction)
+            if not self.backend.update(transaction_id, fields):
+                return False
+            self._apply(old, -1)
+            self._apply({**old, **fields}, 1)
+            return True
+
+        return self._write(mutate)
+
+    def delete(self, transaction_id):
+        """Remove a transaction. Return False if the id is unknown."""
+        def mutate():
+            transaction = self.backend.get(transaction_id)
+            if transaction is None:
+                return False
+            old = dict(transaction)
+            if not self.backend.delete(transaction_id):
+                return False
+            self._apply(old, -1)
+            return True
+
+        return self._write(mutate)
+
+    def compact(self):
+        """Fold any journal entries into a fresh snapshot."""
+        with self.backend.locked():
+            self.refresh()
+            self.backend.compact()
+            self._signature = self.backend.signature()
+
+    def subscribe(self, callback):
+        """Call `callback(ledger)` whenever the ledger changes."""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self):
+        for callback in list(self._listeners):
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"Error in ledger listener: {str(e)}")
+
+
+def _month_end(date):
+    """Return the last day of a YYYY-MM-DD date's month, as YYYY-MM-DD."""
+    day = datetime.date.fromisoformat(date)
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1]).isoformat()
+
+
+def _next_day(date):
+    return (datetime.date.fromisoformat(date) + datetime.timedelta(days=1)).isoformat()
+
+
+def _previous_day(date):
+    return (datetime.date.fromisoformat(date) - datetime.timedelta(days=1)).isoformat()
+
+
+_ledgers = {}
+_ledgers_lock = threading.Lock()
+
+
+def get_ledger(username):
+    """Return the shared Ledger for a user, loading it on first use."""
+    with _ledgers_lock:
+        ledger = _ledgers.get(username)
+        if ledger is None:
+            ledger = _ledgers[username] = Ledger(username)
+        return ledger
@@ -0,0 +1,92 @@
+"""Exact money handling: amounts are stored as integer paise.
+
+Text from users, statements and legacy files is parsed with Decimal, so no
+value ever passes through binary floating point on its way in, and totals
+are plain integer sums. Rupee strings are produced only for display and
+for human-facing exports.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+PAISE_PER_RUPEE = 100
+PAISE = Decimal("0.01")
+
+
+class AmountError(ValueError):
+    """Raised when a value cannot be represented as a whole number of paise."""
+
+
+def to_paise(value):
+    """Convert rupees (str, int or Decimal) to integer paise, rejecting fractions of a paisa."""
+    try:
+        rupees = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise AmountError(f"Invalid amount: {value!r}")
+    if not rupees.is_finite():
+        raise AmountError(f"Invalid amount: {value!r}")
+    try:
+        exact = rupees == rupees.quantize(PAISE)
+    except InvalidOperation:
+        raise AmountError(f"Amount {value!r} is too large")
+    if not exact:
+        raise AmountError(f"Amount {value!r} has more than 2 decimal places")
+    return int(rupees * PAISE_PER_RUPEE)
+
+
+def to_rupees(paise):
+    """Return an amount in paise as an exact Decimal number of rupees (e.g. Decimal('12.50'))."""
+    return Decimal(paise).scaleb(-2)
+
+
+def format_amount(paise):
+    """Format paise as a plain rupee string with two decimals, e.g. 1250 -> '12.50'."""
+    return str(to_rupees(paise))
+
+
+def legacy_to_paise(value):
+    """Convert a float rupee amount from an old ledger file to paise.
+
+    Returns (paise, exact). The float is read through its shortest repr, so
+    values written as e.g. 12.5 or 0.1 convert exactly; anything with more
+    than two decimals is rounded half-up and reported as inexact.
+    """
+    rupees = Decimal(repr(float(value)))
+    rounded = rupees.quantize(PAISE, rounding=ROUND_HALF_UP)
+    return int(rounded * PAISE_PER_RUPEE), rounded == rupees
+
+
+def check_amounts(transactions):
+    """Return [(id, original value, paise)] for float amounts that are not a whole number of paise."""
+    inexact = []
+    for t in transactions:
+        if t is None or not isinstance(t.get("amount"), float):
+            continue
+        paise, exact = legacy_to_paise(t["amount"])
+        if not exact:
+            inexact.append((t["id"], t["amount"], paise))
+    return inexact
+
+
+def migrate_amounts(transactions):
+    """Convert float `amount` values to paise in place.
+
+    Integer amounts are already paise and are left alone. Returns
+    (converted count, [(id, original value, paise)] for inexact values).
+    """
+    converted = 0
+    inexact = []
+    for t in transactions:
+        if t is None or not isinstance(t.get("amount"), float):
+            continue
+        original = t["amount"]
+        t["amount"], exact = legacy_to_paise(original)
+        converted += 1
+        if not exact:
+            inexact.append((t["id"], original, t["amount"]))
+    return converted, inexact
+
+
+def report_inexact(source, inexact):
+    """Print one warning line per amount that had to be rounded during migration."""
+    for transaction_id, original, paise in inexact:
+        print(f"Warning: {source}: amount {original!r} of transaction {transaction_id} "
+              f"is not a whole number of paise; stored as {format_amount(paise)}")
@@ -0,0 +1,101 @@
+"""Transaction operations on plain values, shared by the UI and the CLI."""
+import datetime
+
+from bytebank import recurring
+from bytebank.instrument import traced
+from bytebank.ledger import get_ledger
+from bytebank.money import format_amount
+from bytebank.validation import build_transaction, transaction_fields
+
+
+class TransactionNotFound(LookupError):
+    """Raised when no transaction has the requested id."""
+    def __init__(self, transaction_id):
+        super().__init__("Transaction not found.")
+        self.transaction_id = transaction_id
+
+
+class Operations:
+    """Add, update, delete and view transactions.
+
+    Every method takes plain values and raises ValidationError for bad input
+    and TransactionNotFound for unknown ids; callers decide how to report them.
+    Each call is timed as an "operations.<method>" span (see bytebank.instrument).
+    """
+    @staticmethod
+    @traced("operations.add_transaction")
+    def add_transaction(username, transaction_type, amount, description, category, date=None,
+                        payment_method=None, notes=""):
+        """Validate and add a new transaction; return the stored record."""
+        transaction = build_transaction(
+            transaction_type, amount, description, category,
+            date or datetime.datetime.now().strftime("%Y-%m-%d"), payment_method, notes)
+        get_ledger(username).add(transaction)
+        return transaction
+
+    @staticmethod
+    @traced("operations.update_transaction")
+    def update_transaction(username, transaction_id, transaction_type=None, amount=None, description=None,
+                           category=None, date=None, payment_method=None, notes=None):
+        """Update a transaction; fields passed as None keep their current value."""
+        ledger = get_ledger(username)
+        ledger.refresh()
+        current = ledger.find(transaction_id)
+        if current is None:
+            raise TransactionNotFound(transaction_id)
+        values = {"type": transaction_type, "amount": amount, "description": description,
+                  "category": category, "date": date, "payment_method": payment_method, "notes": notes}
+        merged = {k: current[k] if v is None else v for k, v in values.items()}
+        if amount is None:
+            merged["amount"] = format_amount(current["amount"])
+        fields = transaction_fields(merged["type"], merged["amount"], merged["description"], merged["category"],
+                                    merged["date"], merged["payment_method"], merged["notes"])
+        if not ledger.update(transaction_id, fields):
+            raise TransactionNotFound(transaction_id)
+        return {"id": transaction_id, **fields}
+
+    @staticmethod
+    @traced("operations.add_recurring")
+    def add_recurring(username, transaction_type, amount, description, category, start=None,
+                      payment_method=None, notes="", frequency="monthly"):
+        """Validate and store a recurring rule starting on `start` (default: today); return the rule.
+
+        Occurrences up to today, including the first one, are added straight away.
+        """
+        rule = recurring.make_rule(transaction_type, amount, description, category, payment_method, notes,
+                                   frequency, start=start or None)
+        return recurring.add_rule(username, rule)
+
+    @staticmethod
+    @traced("operations.delete_transaction")
+    def delete_transaction(username, transaction_id):
+        """Delete a transaction by id."""
+        if not get_ledger(username).delete(transaction_id):
+            raise TransactionNotFound(transaction_id)
+
+    @staticmethod
+    @traced("operations.view_transactions", rows=len)
+    def view_transactions(username, **filters):
+        """Return a user's transactions, optionally filtered (see StorageBackend.query)."""
+        ledger = get_ledger(username)
+        ledger.refresh()
+        return ledger.query(**filters) if filters else ledger.transactions
+
+    @staticmethod
+    @traced("operations.get_report", groups=len)
+    def get_report(username, group_by="category", **filters):
+        """Return {value: {"Income", "Expense", "count"}} totals (in paise) per `group_by` value.
+
+        `filters` are those of view_transactions(); see Ledger.group_totals.
+        """
+        ledger = get_ledger(username)
+        ledger.refresh()
+        return ledger.group_totals(group_by, **filters)
+
+    @staticmethod
+    @traced("operations.get_summary")
+    def get_summary(username):
+        """Return total income, expense, savings and balance (in paise) from the in-memory totals."""
+        ledger = get_ledger(username)
+        ledger.refresh()
+        return ledger.summary()
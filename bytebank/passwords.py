@@ -0,0 +1,77 @@
+"""Salted password hashing with hashlib's scrypt (or PBKDF2 where scrypt is missing).
+
+Hashes are self-describing strings, so the cost can be raised later and
+old hashes still verify:
+
+    scrypt$<n>$<r>$<p>$<salt>$<hash>
+    pbkdf2_sha256$<iterations>$<salt>$<hash>
+
+with salt and hash in base64. Legacy plaintext passwords are kept as
+``plain$<password>`` until their owner next logs in.
+"""
+import os
+import hmac
+import base64
+import hashlib
+
+# Cost parameters; raise them as hardware gets faster (existing hashes upgrade on login).
+SCRYPT_N = int(os.environ.get("BYTEBANK_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = int(os.environ.get("BYTEBANK_PBKDF2_ITERATIONS", "600000"))
+SALT_BYTES = 16
+HASH_BYTES = 32
+PLAIN_PREFIX = "plain$"
+
+DEFAULT_SCHEME = "scrypt" if hasattr(hashlib, "scrypt") else "pbkdf2_sha256"
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _scrypt(password, salt, n, r, p):
+    # maxmem must cover 128 * n * r bytes plus some slack, or OpenSSL refuses.
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r, dklen=HASH_BYTES)
+
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations, dklen=HASH_BYTES)
+
+
+def hash_password(password, scheme=DEFAULT_SCHEME):
+    """Return a new salted hash string for `password`."""
+    salt = os.urandom(SALT_BYTES)
+    if scheme == "scrypt":
+        digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+    if scheme == "pbkdf2_sha256":
+        digest = _pbkdf2(password, salt, PBKDF2_ITERATIONS)
+        return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64(salt)}${_b64(digest)}"
+    raise ValueError(f"Unknown password scheme: {scheme}")
+
+
+def verify_password(password, stored):
+    """Return True if `password` matches the `stored` hash string; comparison is constant-time."""
+    if stored.startswith(PLAIN_PREFIX):
+        return hmac.compare_digest(password.encode("utf-8"), stored[len(PLAIN_PREFIX):].encode("utf-8"))
+    parts = stored.split("$")
+    if parts[0] == "scrypt" and len(parts) == 6:
+        n, r, p = (int(value) for value in parts[1:4])
+        salt, expected = base64.b64decode(parts[4]), base64.b64decode(parts[5])
+        return hmac.compare_digest(_scrypt(password, salt, n, r, p), expected)
+    if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+        salt, expected = base64.b64decode(parts[2]), base64.b64decode(parts[3])
+        return hmac.compare_digest(_pbkdf2(password, salt, int(parts[1])), expected)
+    raise ValueError("Unrecognised password hash")
+
+
+def needs_rehash(stored, scheme=DEFAULT_SCHEME):
+    """Return True if `stored` is plaintext or uses another scheme or cost than the current settings."""
+    parts = stored.split("$")
+    if parts[0] != scheme:
+        return True
+    if scheme == "scrypt":
+        return [int(value) for value in parts[1:4]] != [SCRYPT_N, SCRYPT_R, SCRYPT_P]
+    return int(parts[1]) != PBKDF2_ITERATIONS
@@ -0,0 +1,281 @@
+"""Recurring transaction rules and the scheduler that materializes them.
+
+A rule holds validated transaction fields plus a schedule, starting on
+`start` (and optionally ending on `end`):
+
+* ``daily`` / ``weekly`` / ``monthly`` / ``yearly`` with an `interval`
+  (every 2 weeks, every 3 months ...). Weekly rules repeat on the start
+  date's weekday; monthly and yearly ones on its day of the month, moved to
+  the last day in shorter months.
+* ``cron`` with a ``"<day of month> <month> <day of week>"`` expression,
+  e.g. ``"1 * *"`` (the 1st of every month) or ``"* * 1-5"`` (weekdays).
+  Fields take ``*``, numbers, ranges, lists and ``/step``; days of the week
+  run 0-6 from Sunday. As in cron, a rule restricting both the day of the
+  month and the day of the week matches days that satisfy either.
+
+Occurrence dates are computed arithmetically (whole months or steps of
+days at a time), so catching up years of missed occurrences is one pass
+over the occurrences themselves, never a loop over every calendar day.
+
+Each occurrence's id is a uuid5 of the rule id and date, and every rule
+remembers the last date it was materialized up to. Running the scheduler
+twice, from two processes at once, or after a crash between the ledger
+write and the rules write never adds an occurrence twice.
+"""
+import os
+import json
+import uuid
+import calendar
+import datetime
+
+from bytebank.ledger import get_ledger
+from bytebank.storage.base import recurring_path, write_json_atomic
+from bytebank.validation import ValidationError, transaction_fields
+
+FREQUENCIES = ("daily", "weekly", "monthly", "yearly", "cron")
+RULES_VERSION = 1
+# Namespace for occurrence ids: uuid5(OCCURRENCE_NAMESPACE, "<rule id>:<date>").
+OCCURRENCE_NAMESPACE = uuid.UUID("0c4b7a5e-3f0e-5b7d-9a51-6d1c2e8f4b30")
+
+
+def _parse_cron_field(text, low, high):
+    """Return the set of values a cron field allows, or None for `*`."""
+    if text == "*":
+        return None
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+        if part == "*":
+            first, last = low, high
+        elif "-" in part:
+            first, last = (int(value) for value in part.split("-", 1))
+        else:
+            first = int(part)
+            last = high if step != 1 else first
+        if not low <= first <= last <= high or step < 1:
+            raise ValueError
+        values.update(range(first, last + 1, step))
+    return values
+
+
+def parse_cron(expression):
+    """Parse "<day of month> <month> <day of week>" into (days, months, weekdays) sets (None = any)."""
+    try:
+        day_text, month_text, weekday_text = expression.split()
+        days = _parse_cron_field(day_text, 1, 31)
+        months = _parse_cron_field(month_text, 1, 12)
+        weekdays = _parse_cron_field(weekday_text, 0, 7)
+    except ValueError:
+        raise ValidationError(f"Invalid schedule {expression!r}: expected '<day> <month> <weekday>'")
+    if weekdays is not None:
+        weekdays = {value % 7 for value in weekdays}
+    return days, months, weekdays
+
+
+def _parse_date(value, name):
+    try:
+        return datetime.date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"{name} must be YYYY-MM-DD.")
+
+
+def _every_days(start, step, first, last):
+    """Dates start + k*step (k >= 0) within [first, last]."""
+    first = max(first, start)
+    if first > last:
+        return []
+    offset = -(-(first - start).days // step)
+    day = start + datetime.timedelta(days=offset * step)
+    return [day + datetime.timedelta(days=k * step) for k in range((last - day).days // step + 1)] \
+        if day <= last else []
+
+
+def _every_months(start, step, first, last):
+    """The start date's day of the month every `step` months, within [first, last]."""
+    dates = []
+    first = max(first, start)
+    k = max(0, ((first.year - start.year) * 12 + first.month - start.month) // step)
+    while True:
+        months = start.month - 1 + k * step
+        year, month = start.year + months // 12, months % 12 + 1
+        if year > last.year:
+            break
+        day = datetime.date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+        if day > last:
+            break
+        if day >= first:
+            dates.append(day)
+        k += 1
+    return dates
+
+
+def _cron_dates(expression, first, last):
+    """Dates matching a cron expression within [first, last], one month at a time."""
+    days, months, weekdays = parse_cron(expression)
+    dates = []
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        if months is None or month in months:
+            first_weekday, length = calendar.monthrange(year, month)
+            matching = set()
+            if days is None and weekdays is None:
+                matching.update(range(1, length + 1))
+            if days is not None:
+                matching.update(day for day in days if day <= length)
+            if weekdays is not None:
+                for weekday in weekdays:
+                    # Cron counts Sunday as 0; calendar counts Monday as 0.
+                    first_match = 1 + ((weekday - 1) % 7 - first_weekday) % 7
+                    matching.update(range(first_match, length + 1, 7))
+            dates.extend(day for day in (datetime.date(year, month, d) for d in sorted(matching))
+                         if first <= day <= last)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return dates
+
+
+def occurrences(rule, first, last):
+    """Return the rule's occurrence dates within [first, last], in order."""
+    start = datetime.date.fromisoformat(rule["start"])
+    if rule.get("end"):
+        last = min(last, datetime.date.fromisoformat(rule["end"]))
+    first = max(first, start)
+    if first > last:
+        return []
+    frequency, interval = rule["frequency"], rule.get("interval", 1)
+    if frequency == "daily":
+        return _every_days(start, interval, first, last)
+    if frequency == "weekly":
+        return _every_days(start, 7 * interval, first, last)
+    if frequency == "monthly":
+        return _every_months(start, interval, first, last)
+    if frequency == "yearly":
+        return _every_months(start, 12 * interval, first, last)
+    return _cron_dates(rule["cron"], first, last)
+
+
+def occurrence_id(rule, date):
+    return str(uuid.uuid5(OCCURRENCE_NAMESPACE, f"{rule['id']}:{date.isoformat()}"))
+
+
+def make_rule(transaction_type, amount, description, category, payment_method, notes="", frequency="monthly",
+              interval=1, cron=None, start=None, end=None):
+    """Validate raw values and return a new rule dict."""
+    if frequency not in FREQUENCIES:
+        raise ValidationError(f"Frequency must be one of: {', '.join(FREQUENCIES)}.")
+    start = start or datetime.date.today().isoformat()
+    fields = transaction_fields(transaction_type, amount, description, category, start, payment_method, notes)
+    del fields["date"]
+    _parse_date(start, "Start date")
+    if end:
+        if _parse_date(end, "End date") < _parse_date(start, "Start date"):
+            raise ValidationError("End date is before the start date.")
+    rule = {"id": str(uuid.uuid4()), "fields": fields, "frequency": frequency, "start": start, "end": end or None,
+            "done_through": None}
+    if frequency == "cron":
+        parse_cron(cron or "")
+        rule["cron"] = cron
+    else:
+        try:
+            interval = int(interval)
+        except (TypeError, ValueError):
+            interval = 0
+        if interval < 1:
+            raise ValidationError("Interval must be a whole number of at least 1.")
+        rule["interval"] = interval
+    return rule
+
+
+class RecurringRules:
+    """A user's recurring rules, kept in `recurring.json` in their directory."""
+    def __init__(self, path):
+        self.path = path
+        self.rules = []
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                self.rules = json.load(f)["rules"]
+        else:
+            self.rules = []
+        return self.rules
+
+    def save(self):
+        write_json_atomic(self.path, {"version": RULES_VERSION, "rules": self.rules})
+
+    def get(self, rule_id):
+        return next((rule for rule in self.rules if rule["id"] == rule_id), None)
+
+
+def due_transactions(rule, today):
+    """Return the records for the rule's occurrences after `done_through`, up to `today`."""
+    first = datetime.date.min
+    if rule.get("done_through"):
+        first = datetime.date.fromisoformat(rule["done_through"]) + datetime.timedelta(days=1)
+    return [dict(rule["fields"], id=occurrence_id(rule, day), date=day.isoformat())
+            for day in occurrences(rule, first, today)]
+
+
+def materialize(ledger, today=None):
+    """Add every due occurrence of every rule to `ledger` in one batched write; return the new records.
+
+    Runs under the ledger's write lock, re-reading the rules and the ledger
+    first, so concurrent schedulers cannot add the same occurrence twice.
+    """
+    today = today or datetime.date.today()
+    store = RecurringRules(recurring_path(ledger.username))
+    with ledger.backend.locked():
+        if not store.load():
+            return []
+        ledger.refresh()
+        batch = []
+        seen = set()
+        for rule in store.rules:
+            for record in due_transactions(rule, today):
+                # Skip occurrences written by a run whose rules save did not complete.
+                if record["id"] not in seen and ledger.find(record["id"]) is None:
+                    seen.add(record["id"])
+                    batch.append(record)
+            rule["done_through"] = today.isoformat()
+        ledger.add_many(batch)
+        store.save()
+    return batch
+
+
+def _edit_rules(username, edit):
+    """Apply `edit(store)` to a user's rules under their ledger lock and save them."""
+    ledger = get_ledger(username)
+    store = RecurringRules(recurring_path(username))
+    with ledger.backend.locked():
+        store.load()
+        result = edit(store)
+        store.save()
+    return result
+
+
+def add_rule(username, rule):
+    """Store a new rule for `username` and materialize any occurrences already due; return the rule."""
+    _edit_rules(username, lambda store: store.rules.append(rule))
+    materialize(get_ledger(username))
+    return rule
+
+
+def remove_rule(username, rule_id):
+    """Delete a rule (transactions it already created are kept). Return False if the id is unknown."""
+    def edit(store):
+        rule = store.get(rule_id)
+        if rule is not None:
+            store.rules.remove(rule)
+        return rule is not None
+    return _edit_rules(username, edit)
+
+
+def list_rules(username):
+    return RecurringRules(recurring_path(username)).load()
+
+
+def materialize_due(username, today=None):
+    """Materialize every due occurrence for `username`; return the new records."""
+    return materialize(get_ledger(username), today)
@@ -0,0 +1,116 @@
+"""Precomputed month x category x type x payment-method totals for a ledger.
+
+The rollup cells are updated incrementally on every mutation and persisted
+as a small JSON file next to the ledger, so any period summary or breakdown
+is answered without scanning raw transactions.
+"""
+import os
+import json
+
+from bytebank.storage.base import write_json_atomic
+
+# Bumped when the meaning of the cells changes; older files are rebuilt.
+# 2: totals are integer paise (were float rupees).
+ROLLUP_VERSION = 2
+
+
+def rollup_key(transaction):
+    return (transaction["date"][:7], transaction["category"], transaction["type"],
+            transaction["payment_method"])
+
+
+class RollupStore:
+    """Totals and counts keyed by (year-month, category, type, payment_method).
+
+    `expense` additionally keeps the Expense total per (year-month, category),
+    the figure budgets are checked against.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.cells = {}
+        self.expense = {}
+
+    def load(self):
+        """Read the persisted cells. Return False if the file is missing or unreadable."""
+        self.cells = {}
+        self.expense = {}
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if data.get("version") != ROLLUP_VERSION:
+                return False
+            for month, category, transaction_type, payment_method, total, count in data["cells"]:
+                self.cells[(month, category, transaction_type, payment_method)] = [total, count]
+                if transaction_type == "Expense":
+                    self.expense[(month, category)] = self.expense.get((month, category), 0) + total
+        except (ValueError, KeyError, TypeError):
+            self.cells = {}
+            self.expense = {}
+            return False
+        return True
+
+    def save(self):
+        write_json_atomic(self.path, {"version": ROLLUP_VERSION,
+                                      "cells": [list(key) + value for key, value in sorted(self.cells.items())]},
+                          indent=None)
+
+    def rebuild(self, transactions):
+        """Recompute every cell from a stream of transactions and persist the result."""
+        self.cells = {}
+        self.expense = {}
+        for t in transactions:
+            self.apply(t, 1)
+        self.save()
+
+    def apply(self, transaction, sign):
+        """Add (sign=1) or remove (sign=-1) a transaction from its cell."""
+        key = rollup_key(transaction)
+        cell = self.cells.setdefault(key, [0, 0])
+        cell[0] += sign * transaction["amount"]
+        cell[1] += sign
+        if cell[1] <= 0:
+            del self.cells[key]
+        if transaction["type"] == "Expense":
+            month_category = key[:2]
+            spent = self.expense.get(month_category, 0) + sign * transaction["amount"]
+            if spent:
+                self.expense[month_category] = spent
+            else:
+                self.expense.pop(month_category, None)
+
+    def spent(self, month, category):
+        """Return the Expense total for one category in one month (YYYY-MM)."""
+        return self.expense.get((month, category), 0)
+
+    def matches(self, totals, count):
+        """Return True if the cells agree with the ledger's per-type totals and row count."""
+        summary = self.summary()
+        return (summary["count"] == count
+                and all(summary["by_type"].get(k, 0) == v for k, v in totals.items()))
+
+    def _cells(self, start_month=None, end_month=None, category=None, payment_method=None, transaction_type=None):
+        for key, (total, count) in self.cells.items():
+            month, cell_category, cell_type, cell_payment = key
+            if ((start_month is None or month >= start_month)
+                    and (end_month is None or month <= end_month)
+                    and (category is None or cell_category == category)
+                    and (payment_method is None or cell_payment == payment_method)
+                    and (transaction_type is None or cell_type == transaction_type)):
+                yield key, total, count
+
+    def summary(self, start_month=None, end_month=None, category=None, payment_method=None, transaction_type=None):
+        """Return per-type totals and the row count for a span of months (YYYY-MM, inclusive)."""
+        by_type = {"Income": 0, "Expense": 0}
+        count = 0
+        for (_, _, cell_type, _), total, cell_count in self._cells(start_month, end_month, category,
+                                                                   payment_method, transaction_type):
+            by_type[cell_type] = by_type.get(cell_type, 0) + total
+            count += cell_count
+        return {"by_type": by_type, "count": count}
+
+    def breakdown(self, start_month=None, end_month=None, category=None, payment_method=None):
+        """Return [month, category, type, payment_method, total, count] rows, sorted by key."""
+        return sorted(list(key) + [total, count] for key, total, count in
+                      self._cells(start_month, end_month, category, payment_method))
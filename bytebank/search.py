@@ -0,0 +1,241 @@
+"""Persistent full-text index for transaction search.
+
+The index is a small SQLite database (`search.db`) in the user's directory:
+
+* ``docs`` has one row per transaction with its id, date, amount and the
+  space-separated word tokens of its description, notes and category,
+  indexed by date and by amount.
+* ``postings`` maps each token to the docs containing it, clustered by
+  token so every token starting with a prefix is one range scan.
+* ``meta`` holds the row count and per-type totals the index was built
+  from; the ledger checks them against its own totals before each write and
+  rebuilds an index that has fallen out of step. A ``pending`` row is set
+  before each ledger write and cleared in the transaction that indexes it,
+  so an index that missed a write (even one that left the totals alone) is
+  rebuilt too.
+
+Every query term must match the start of some word (so "bir par" finds
+"Birthday Party"). Terms like ``>500``, ``<=1200.50`` or ``100..250``
+restrict the amount, in rupees. Matches come newest first.
+
+A query is driven either from the postings of its rarest term, when that
+term matches few transactions, or by walking the date index newest first
+and stopping at the first `limit` matches, when every term is common. Both
+read only the rows they need, so a query over a million transactions
+takes milliseconds and never loads the ledger.
+"""
+import re
+import sqlite3
+
+from bytebank.money import AmountError, to_paise
+from bytebank.storage.locking import LOCK_TIMEOUT
+
+SEARCH_FIELDS = ("description", "notes", "category")
+# PRAGMA user_version of the current layout; older index files are rebuilt.
+SEARCH_VERSION = 1
+# A term matching fewer postings than this drives the query from its postings.
+DRIVER_LIMIT = 20000
+REBUILD_BATCH = 10000
+
+_TOKEN_RE = re.compile(r"\w+")
+_RANGE_RE = re.compile(r"^(\d+(?:\.\d+)?)?\.\.(\d+(?:\.\d+)?)?$")
+_BOUND_RE = re.compile(r"^(<=|>=|<|>|=)(\d+(?:\.\d+)?)$")
+
+SCHEMA = """
+CREATE TABLE docs (
+    doc INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    date TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    tokens TEXT NOT NULL
+);
+CREATE TABLE postings (
+    token TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    PRIMARY KEY (token, doc)
+) WITHOUT ROWID;
+CREATE TABLE meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+INDEXES = """
+CREATE INDEX idx_docs_date ON docs (date);
+CREATE INDEX idx_docs_amount ON docs (amount);
+"""
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def transaction_tokens(transaction):
+    """Return the distinct tokens of a transaction's searchable fields, in first-seen order."""
+    tokens = []
+    for field in SEARCH_FIELDS:
+        tokens.extend(tokenize(transaction.get(field, "")))
+    return list(dict.fromkeys(tokens))
+
+
+def parse_query(text):
+    """Split search text into (word terms, minimum paise, maximum paise); bounds are None if absent."""
+    terms, low, high = [], None, None
+    for part in str(text).split():
+        try:
+            match = _RANGE_RE.match(part)
+            if match and (match.group(1) or match.group(2)):
+                if match.group(1):
+                    low = to_paise(match.group(1))
+                if match.group(2):
+                    high = to_paise(match.group(2))
+                continue
+            match = _BOUND_RE.match(part)
+            if match:
+                operator, amount = match.group(1), to_paise(match.group(2))
+                if operator in (">", ">=", "="):
+                    low = amount + (operator == ">")
+                if operator in ("<", "<=", "="):
+                    high = amount - (operator == "<")
+                continue
+        except AmountError:
+            pass
+        terms.extend(tokenize(part))
+    return list(dict.fromkeys(terms)), low, high
+
+
+def _prefix_bounds(term):
+    """Return (low, high) such that low <= token < high for exactly the tokens starting with `term`."""
+    return term, term[:-1] + chr(ord(term[-1]) + 1)
+
+
+class SearchIndex:
+    """A user's persistent inverted index over description, notes and category."""
+    def __init__(self, path):
+        self.path = path
+        # Opened on one thread and used from the UI's I/O worker; access is serialized by the ledger.
+        self.conn = sqlite3.connect(path, timeout=LOCK_TIMEOUT, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SEARCH_VERSION:
+            self._create()
+
+    def close(self):
+        self.conn.close()
+
+    def _create(self, indexes=True):
+        self.conn.executescript("DROP TABLE IF EXISTS docs; DROP TABLE IF EXISTS postings; "
+                                "DROP TABLE IF EXISTS meta;" + SCHEMA + (INDEXES if indexes else "") +
+                                f"PRAGMA user_version = {SEARCH_VERSION};")
+
+    def _meta(self):
+        return dict(self.conn.execute("SELECT key, value FROM meta"))
+
+    def matches(self, totals, count):
+        """Return True if the index was built from a ledger with these per-type totals and row count.
+
+        An index marked pending by a write it never received does not match.
+        """
+        meta = self._meta()
+        return bool(meta) and not meta.get("pending") and meta.get("count") == count and \
+            all(meta.get(transaction_type, 0) == total for transaction_type, total in totals.items())
+
+    def mark_pending(self):
+        """Record that a ledger write is about to happen; apply() clears the mark."""
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('pending', 1)")
+
+    def clear_pending(self):
+        """Drop the mark of a ledger write that changed nothing."""
+        with self.conn:
+            self.conn.execute("DELETE FROM meta WHERE key = 'pending'")
+
+    def invalidate(self):
+        """Forget the recorded totals, so the next check rebuilds the index."""
+        with self.conn:
+            self.conn.execute("DELETE FROM meta")
+
+    def _insert(self, transactions):
+        for t in transactions:
+            tokens = transaction_tokens(t)
+            doc = self.conn.execute("INSERT INTO docs (id, date, amount, type, tokens) VALUES (?, ?, ?, ?, ?)",
+                                    (t["id"], t["date"], t["amount"], t["type"], " ".join(tokens))).lastrowid
+            self.conn.executemany("INSERT INTO postings (token, doc) VALUES (?, ?)",
+                                  ((token, doc) for token in tokens))
+
+    def _delete(self, transaction_id):
+        row = self.conn.execute("SELECT doc, tokens FROM docs WHERE id = ?", (transaction_id,)).fetchone()
+        if row is None:
+            return
+        doc, tokens = row
+        self.conn.executemany("DELETE FROM postings WHERE token = ? AND doc = ?",
+                              ((token, doc) for token in tokens.split()))
+        self.conn.execute("DELETE FROM docs WHERE doc = ?", (doc,))
+
+    def apply(self, changes, totals, count):
+        """Apply [(transaction, sign)] from one ledger write in one transaction and record the new totals."""
+        with self.conn:
+            for transaction, sign in changes:
+                if sign < 0:
+                    self._delete(transaction["id"])
+                else:
+                    self._insert([transaction])
+            self._set_meta(totals, count)
+            self.conn.execute("DELETE FROM meta WHERE key = 'pending'")
+
+    def _set_meta(self, totals, count):
+        self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                              [("count", count)] + list(totals.items()))
+
+    def rebuild(self, transactions, totals, count):
+        """Re-index a stream of transactions from scratch.
+
+        Rows are loaded before the secondary indexes are created, which is
+        several times faster than maintaining them row by row. The totals are
+        recorded last, so an interrupted rebuild is simply redone.
+        """
+        self._create(indexes=False)
+        with self.conn:
+            batch = []
+            for t in transactions:
+                batch.append(t)
+                if len(batch) >= REBUILD_BATCH:
+                    self._insert(batch)
+                    batch = []
+            self._insert(batch)
+        self.conn.executescript(INDEXES)
+        with self.conn:
+            self._set_meta(totals, count)
+
+    def _estimate(self, term):
+        """Return how many postings start with `term`, counting no further than DRIVER_LIMIT."""
+        return self.conn.execute("SELECT COUNT(*) FROM (SELECT 1 FROM postings WHERE token >= ? AND token < ? "
+                                 "LIMIT ?)", _prefix_bounds(term) + (DRIVER_LIMIT,)).fetchone()[0]
+
+    def search(self, text, offset=0, limit=20):
+        """Return up to `limit` ids matching `text`, newest first, skipping `offset`."""
+        terms, low, high = parse_query(text)
+        if not terms and low is None and high is None:
+            return []
+        where, params = [], []
+        if low is not None:
+            where.append("d.amount >= ?")
+            params.append(low)
+        if high is not None:
+            where.append("d.amount <= ?")
+            params.append(high)
+        source = "docs d"
+        if terms:
+            driver = min(terms, key=self._estimate)
+            if self._estimate(driver) < DRIVER_LIMIT:
+                source = "(SELECT DISTINCT doc FROM postings WHERE token >= ? AND token < ?) p " \
+                         "JOIN docs d ON d.doc = p.doc"
+                params[:0] = _prefix_bounds(driver)
+                terms = [term for term in terms if term != driver]
+            for term in terms:
+                # The tokens column is space-separated, so " term" finds words starting with it.
+                where.append("instr(' ' || d.tokens, ?) > 0")
+                params.append(" " + term)
+        sql = f"SELECT d.id FROM {source}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY d.date DESC, d.doc DESC LIMIT ? OFFSET ?"
+        return [row[0] for row in self.conn.execute(sql, params + [limit, offset])]
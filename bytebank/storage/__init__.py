@@ -0,0 +1,64 @@
+"""Pluggable persistence for per-user ledgers.
+
+Available backends (selected with the ``BYTEBANK_STORAGE`` environment
+variable):
+
+* ``json``    -- the whole ledger is a JSON array rewritten on every mutation
+  (default; fine for small ledgers).
+* ``journal`` -- the JSON array is kept as a snapshot and each mutation is
+  appended as one line to a write-ahead journal next to it.
+* ``sqlite``  -- all users share one SQLite database in WAL mode, indexed by
+  id, (user, date) and (user, category).
+* ``binary``  -- fixed-width binary records with dictionary-encoded fields
+  and a string heap, read through mmap (see bytebank.storage.binary).
+* ``partitioned`` -- one JSON file per month (or year) and a manifest of
+  per-period totals; old periods are read only when a query needs them
+  (see bytebank.storage.partitioned).
+
+The file backends serialize writers across processes with an advisory lock
+on ``transactions.lock`` in the user's directory, which also holds a
+version counter used to detect writes from a stale in-memory copy. See
+bytebank.storage.base for the directory layout.
+"""
+import os
+
+from bytebank.storage.base import (StaleLedgerError, StorageBackend, budgets_path, data_path, ledger_path,
+                                   recurring_path, rollup_path, search_index_path, user_dir, write_json_atomic)
+from bytebank.storage.files import MemoryBackend, JsonBackend, JournalBackend
+from bytebank.storage.layout import prepare_user
+
+STORAGE_BACKEND = os.environ.get("BYTEBANK_STORAGE", "json")
+
+
+def _sqlite_backend(username):
+    # Imported on demand so JSON-only runs (and the CLI) skip loading sqlite3.
+    from bytebank.storage.sqlite import SQLiteBackend
+    return SQLiteBackend(username)
+
+
+def _binary_backend(username):
+    from bytebank.storage.binary import BinaryBackend
+    return BinaryBackend(username)
+
+
+def _partitioned_backend(username):
+    from bytebank.storage.partitioned import PartitionedBackend
+    return PartitionedBackend(username)
+
+
+BACKENDS = {
+    "json": JsonBackend,
+    "journal": JournalBackend,
+    "sqlite": _sqlite_backend,
+    "binary": _binary_backend,
+    "partitioned": _partitioned_backend,
+}
+
+
+def open_backend(username, name=None):
+    """Return a storage backend for `username` (default: the configured one)."""
+    name = name or STORAGE_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {name}")
+    prepare_user(username)
+    return BACKENDS[name](username)
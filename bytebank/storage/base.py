@@ -0,0 +1,183 @@
+"""Storage backend interface and shared file helpers.
+
+Every path the app writes is built here. Per-user files live in a sharded
+directory under the data root (``BYTEBANK_DATA_ROOT``, default: the
+current directory)::
+
+    <root>/users/<h[0:2]>/<h[2:4]>/<h>/manifest.json
+                                        transactions.json, .journal, .lock, ...
+                                        rollups.json, search.db, recurring.json,
+                                        budgets.json
+
+where ``h`` is the SHA-256 hex digest of the username. Hashing keeps every
+directory small however many users there are, and no username can name a
+path outside its own directory.
+"""
+import os
+import json
+import hashlib
+import contextlib
+import tempfile
+
+DATA_ROOT = os.environ.get("BYTEBANK_DATA_ROOT", ".")
+USERS_DIR = "users"
+MANIFEST_NAME = "manifest.json"
+LAYOUT_VERSION = 1
+
+SORT_COLUMNS = ("date", "type", "amount", "description", "category", "payment_method")
+
+
+class StaleLedgerError(RuntimeError):
+    """Raised when a write is attempted on a copy of the ledger that another process has changed."""
+
+
+def data_path(name, root=None):
+    """Return the path of a shared file (e.g. users.db) in the data root."""
+    return os.path.join(root or DATA_ROOT, name)
+
+
+def user_dir(username, root=None):
+    """Return the sharded directory holding a user's files."""
+    digest = hashlib.sha256(username.encode("utf-8")).hexdigest()
+    return os.path.join(root or DATA_ROOT, USERS_DIR, digest[:2], digest[2:4], digest)
+
+
+def manifest_path(username, root=None):
+    """Return the path of the manifest naming the owner of a user directory."""
+    return os.path.join(user_dir(username, root), MANIFEST_NAME)
+
+
+def ledger_path(username, root=None):
+    """Return the path of a user's transactions file."""
+    return os.path.join(user_dir(username, root), "transactions.json")
+
+
+def rollup_path(username, root=None):
+    """Return the path of a user's rollup cache."""
+    return os.path.join(user_dir(username, root), "rollups.json")
+
+
+def search_index_path(username, root=None):
+    """Return the path of a user's full-text search index."""
+    return os.path.join(user_dir(username, root), "search.db")
+
+
+def recurring_path(username, root=None):
+    """Return the path of a user's recurring transaction rules."""
+    return os.path.join(user_dir(username, root), "recurring.json")
+
+
+def budgets_path(username, root=None):
+    """Return the path of a user's budget limits."""
+    return os.path.join(user_dir(username, root), "budgets.json")
+
+
+def stat_signature(path):
+    """Return a cheap fingerprint (inode, size, mtime) of a file, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def write_json_atomic(path, data, indent=4):
+    """Write JSON to a temp file and atomically move it over `path`.
+
+    The temp file name is unique per call, so concurrent writers never
+    clobber each other's half-written file; the last `os.replace` wins.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                                    prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class StorageBackend:
+    """Interface implemented by every ledger storage engine.
+
+    Records are plain dicts with the keys `id`, `type`, `amount`,
+    `description`, `category`, `date`, `payment_method` and `notes`;
+    `amount` is an int in paise.
+    """
+    def __init__(self, username):
+        self.username = username
+
+    def signature(self):
+        """Return a value that changes whenever another process modifies the ledger."""
+        raise NotImplementedError
+
+    def files(self):
+        """Return the paths of the files holding this ledger (used to report its size on disk)."""
+        return []
+
+    def locked(self):
+        """Return a context manager that excludes other writers of this ledger.
+
+        The default is a no-op, for backends with no per-ledger files to guard.
+        """
+        return contextlib.nullcontext()
+
+    def reload(self):
+        """Drop any cached state and re-read the ledger."""
+        raise NotImplementedError
+
+    def all(self):
+        """Return all transactions in insertion order."""
+        raise NotImplementedError
+
+    def get(self, transaction_id):
+        """Return the transaction with the given id, or None."""
+        raise NotImplementedError
+
+    def query(self, start_date=None, end_date=None, category=None, transaction_type=None,
+              payment_method=None, order_by=None, descending=False, offset=0, limit=None):
+        """Return one page of transactions matching the filters.
+
+        Dates are inclusive. Results are in insertion order unless `order_by`
+        names one of SORT_COLUMNS.
+        """
+        raise NotImplementedError
+
+    def count(self, start_date=None, end_date=None, category=None, transaction_type=None,
+              payment_method=None):
+        """Return how many transactions match the filters."""
+        raise NotImplementedError
+
+    def iter_transactions(self, start_date=None, end_date=None, category=None, transaction_type=None,
+                          payment_method=None):
+        """Yield matching transactions in insertion order without materialising the full result."""
+        raise NotImplementedError
+
+    def totals(self):
+        """Return a {type: total amount in paise} dict."""
+        raise NotImplementedError
+
+    def add(self, record):
+        raise NotImplementedError
+
+    def add_many(self, records):
+        """Add a batch of records with a single storage write."""
+        raise NotImplementedError
+
+    def update(self, transaction_id, fields):
+        """Update a transaction. Return False if the id is unknown."""
+        raise NotImplementedError
+
+    def delete(self, transaction_id):
+        """Delete a transaction. Return False if the id is unknown."""
+        raise NotImplementedError
+
+    def compact(self):
+        """Reclaim space / fold pending log entries, where applicable."""
+
+    def close(self):
+        """Release any open handles."""
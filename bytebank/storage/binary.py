@@ -0,0 +1,422 @@
+"""Compact binary ledger: fixed-width records read through mmap.
+
+``transactions.bbl`` in the user's directory holds a 16-byte header (magic,
+record size, heap generation) followed by one 64-byte RECORD per transaction
+in insertion order:
+
+* the id as 16 raw UUID bytes,
+* a flags byte (deleted records are flagged, not removed, until compaction),
+* `type`, `category` and `payment_method` as small integer codes, looked up
+  in ``transactions.bbd`` (a JSON list of values per field),
+* the date as a proleptic Gregorian ordinal and the amount in paise,
+* (offset, length) references into the UTF-8 string heap
+  ``transactions.<generation>.bbs`` for description and notes.
+
+Totals, counts and filters unpack only the numeric columns of each record,
+straight from the mapped file, and never build a dict or decode a string;
+full records are materialised only for rows that are returned.
+"""
+import datetime
+import json
+import mmap
+import os
+import struct
+import uuid
+
+from bytebank.storage.base import (SORT_COLUMNS, StaleLedgerError, StorageBackend, ledger_path, stat_signature,
+                                   write_json_atomic)
+from bytebank.storage.locking import VersionedLock
+
+MAGIC = b"BBLEDG1\n"
+HEADER = struct.Struct("<8sII")
+RECORD = struct.Struct("<16sBBHHiqQIQI6x")
+# Same width as RECORD, but skipping the id and heap references, so a scan
+# allocates one small tuple of ints per row and nothing else.
+SCAN = struct.Struct("<16xBBHHiq30x")
+ID_SCAN = struct.Struct("<16sB47x")
+DELETED = 1
+CODED_FIELDS = ("type", "category", "payment_method")
+CODE_LIMITS = {"type": 0xFF, "category": 0xFFFF, "payment_method": 0xFFFF}
+
+
+def _ordinal(date):
+    try:
+        return datetime.date.fromisoformat(date).toordinal()
+    except (TypeError, ValueError):
+        raise ValueError(f"Binary ledgers need YYYY-MM-DD dates, got {date!r}")
+
+
+def _map(path):
+    """Map a whole file read-only; empty files map to b"" (mmap rejects zero length)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _unmap(mapped):
+    if isinstance(mapped, mmap.mmap):
+        try:
+            mapped.close()
+        except BufferError:
+            # A paused scan still holds a view of it; it is closed when collected.
+            pass
+
+
+class BinaryBackend(StorageBackend):
+    """Store a ledger as fixed-width binary records plus a string heap.
+
+    Adds append to both files, updates rewrite the record in place (new
+    strings go to the end of the heap) and deletes set a flag. `compact()`
+    rewrites both files without deleted records or orphaned strings; it runs
+    automatically once half the records are deleted. Locking and stale-write
+    detection work as for the JSON backends. An existing JSON ledger (and its
+    journal) is converted the first time the binary ledger is opened.
+    """
+    def __init__(self, username):
+        super().__init__(username)
+        self.base = os.path.splitext(ledger_path(username))[0]
+        self.path = f"{self.base}.bbl"
+        self.codes_path = f"{self.base}.bbd"
+        self.lock = VersionedLock(f"{self.base}.lock")
+        self.loaded_version = 0
+        self.version = 0
+        self.generation = 0
+        self.codes = {field: [] for field in CODED_FIELDS}
+        self._code_index = {field: {} for field in CODED_FIELDS}
+        self._codes_dirty = False
+        self._records = b""
+        self._heap = b""
+        self.record_count = 0
+        self._positions = None
+        self._query_cache = None
+
+    def _heap_path(self, generation):
+        return f"{self.base}.{generation}.bbs"
+
+    def signature(self):
+        return (self.lock.version(), stat_signature(self.path), stat_signature(self._heap_path(self.generation)))
+
+    def files(self):
+        return [self.path, self.codes_path, self._heap_path(self.generation)]
+
+    def locked(self):
+        return self.lock
+
+    def reload(self):
+        with self.lock:
+            self.loaded_version = self.lock.version()
+            if not os.path.exists(self.path):
+                self._migrate_json()
+            self._open()
+
+    def _migrate_json(self):
+        """Create the binary ledger from `transactions.json` and its journal, if any."""
+        from bytebank.storage.files import JournalBackend
+        legacy = JournalBackend(self.username)
+        # Load without taking the lock again: we already hold it on another handle.
+        legacy._load()
+        self._rewrite(legacy.live())
+
+    def _open(self):
+        """(Re)load the code tables and map both files."""
+        codes = {field: [] for field in CODED_FIELDS}
+        if os.path.exists(self.codes_path):
+            with open(self.codes_path, "r") as f:
+                codes.update(json.load(f))
+        self.codes = codes
+        self._code_index = {field: {value: i for i, value in enumerate(values)} for field, values in codes.items()}
+        self._codes_dirty = False
+        self._map_files()
+        self._positions = None
+        self.version += 1
+        self._query_cache = None
+
+    def _map_files(self):
+        with open(self.path, "rb+") as f:
+            magic, record_size, generation = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or record_size != RECORD.size:
+                raise ValueError(f"{self.path} is not a ByteBank binary ledger")
+            size = os.fstat(f.fileno()).st_size
+            torn = (size - HEADER.size) % RECORD.size
+            if torn:
+                # A record cut short by a crash during append; drop it.
+                f.truncate(size - torn)
+        _unmap(self._records)
+        _unmap(self._heap)
+        self.generation = generation
+        self._records = _map(self.path)
+        self._heap = _map(self._heap_path(generation))
+        self.record_count = (len(self._records) - HEADER.size) // RECORD.size
+
+    def _code(self, field, value):
+        index = self._code_index[field]
+        code = index.get(value)
+        if code is None:
+            code = len(self.codes[field])
+            if code > CODE_LIMITS[field]:
+                raise ValueError(f"Too many distinct {field} values for a binary ledger")
+            index[value] = code
+            self.codes[field].append(value)
+            self._codes_dirty = True
+        return code
+
+    def _save_codes(self):
+        if self._codes_dirty:
+            write_json_atomic(self.codes_path, self.codes, indent=None)
+            self._codes_dirty = False
+
+    def _pack(self, transaction, heap_offset):
+        """Return (record bytes, heap bytes) for a transaction whose strings start at `heap_offset`."""
+        description = transaction["description"].encode("utf-8")
+        notes = (transaction.get("notes") or "").encode("utf-8")
+        record = RECORD.pack(uuid.UUID(transaction["id"]).bytes, 0,
+                             self._code("type", transaction["type"]),
+                             self._code("category", transaction["category"]),
+                             self._code("payment_method", transaction["payment_method"]),
+                             _ordinal(transaction["date"]), transaction["amount"],
+                             heap_offset, len(description), heap_offset + len(description), len(notes))
+        return record, description + notes
+
+    def _unpack(self, position):
+        (id_bytes, _, type_code, category, payment_method, ordinal, paise,
+         description_offset, description_length, notes_offset, notes_length) = RECORD.unpack_from(
+            self._records, HEADER.size + position * RECORD.size)
+        heap = self._heap
+        return {
+            "id": str(uuid.UUID(bytes=id_bytes)),
+            "type": self.codes["type"][type_code],
+            "amount": paise,
+            "description": heap[description_offset:description_offset + description_length].decode("utf-8"),
+            "category": self.codes["category"][category],
+            "date": datetime.date.fromordinal(ordinal).isoformat(),
+            "payment_method": self.codes["payment_method"][payment_method],
+            "notes": heap[notes_offset:notes_offset + notes_length].decode("utf-8")
+        }
+
+    def _body(self):
+        return memoryview(self._records)[HEADER.size:HEADER.size + self.record_count * RECORD.size]
+
+    def _scan(self):
+        """Yield (position, type, category, payment_method, date ordinal, paise) for live records."""
+        for position, (flags, *columns) in enumerate(SCAN.iter_unpack(self._body())):
+            if not flags & DELETED:
+                yield (position, *columns)
+
+    def _filtered(self, start_date=None, end_date=None, category=None, transaction_type=None,
+                  payment_method=None):
+        """Like _scan, restricted to rows matching the filters (compared as codes and ordinals)."""
+        codes = []
+        for field, value in (("type", transaction_type), ("category", category),
+                             ("payment_method", payment_method)):
+            if value is not None and value not in self._code_index[field]:
+                return
+            codes.append(None if value is None else self._code_index[field][value])
+        type_code, category_code, payment_code = codes
+        start = _ordinal(start_date) if start_date is not None else 0
+        end = _ordinal(end_date) if end_date is not None else 0x7FFFFFFF
+        for position, (flags, kind, category, payment, ordinal, paise) in enumerate(SCAN.iter_unpack(self._body())):
+            if (flags & DELETED or not start <= ordinal <= end
+                    or (type_code is not None and kind != type_code)
+                    or (category_code is not None and category != category_code)
+                    or (payment_code is not None and payment != payment_code)):
+                continue
+            yield position, kind, category, payment, ordinal, paise
+
+    def _position_index(self):
+        """Return {id bytes: position} for live records, built on first use."""
+        if self._positions is None:
+            self._positions = {id_bytes: position for position, (id_bytes, flags)
+                               in enumerate(ID_SCAN.iter_unpack(self._body())) if not flags & DELETED}
+        return self._positions
+
+    def _position(self, transaction_id):
+        try:
+            key = uuid.UUID(transaction_id).bytes
+        except (TypeError, ValueError):
+            return None
+        return self._position_index().get(key)
+
+    def all(self):
+        return [self._unpack(row[0]) for row in self._scan()]
+
+    def get(self, transaction_id):
+        position = self._position(transaction_id)
+        return None if position is None else self._unpack(position)
+
+    def iter_transactions(self, start_date=None, end_date=None, category=None, transaction_type=None,
+                          payment_method=None):
+        for row in self._filtered(start_date, end_date, category, transaction_type, payment_method):
+            yield self._unpack(row[0])
+
+    def _sort_key(self, order_by):
+        if order_by == "date":
+            return lambda row: row[4]
+        if order_by == "amount":
+            return lambda row: row[5]
+        if order_by == "description":
+            return lambda row: self._unpack(row[0])["description"]
+        column = {"type": 1, "category": 2, "payment_method": 3}[order_by]
+        values = self.codes[order_by]
+        return lambda row: values[row[column]]
+
+    def _matching(self, start_date, end_date, category, transaction_type, payment_method,
+                  order_by=None, descending=False):
+        """Return the positions of the filtered (and sorted) rows, cached while the ledger is unchanged."""
+        key = (self.version, start_date, end_date, category, transaction_type, payment_method,
+               order_by, descending)
+        if self._query_cache is not None and self._query_cache[0] == key:
+            return self._query_cache[1]
+        rows = list(self._filtered(start_date, end_date, category, transaction_type, payment_method))
+        if order_by in SORT_COLUMNS:
+            rows.sort(key=self._sort_key(order_by), reverse=descending)
+        positions = [row[0] for row in rows]
+        self._query_cache = (key, positions)
+        return positions
+
+    def query(self, start_date=None, end_date=None, category=None, transaction_type=None,
+              payment_method=None, order_by=None, descending=False, offset=0, limit=None):
+        positions = self._matching(start_date, end_date, category, transaction_type, payment_method,
+                                   order_by, descending)
+        return [self._unpack(p) for p in positions[offset:None if limit is None else offset + limit]]
+
+    def count(self, start_date=None, end_date=None, category=None, transaction_type=None,
+              payment_method=None):
+        return len(self._matching(start_date, end_date, category, transaction_type, payment_method))
+
+    def totals(self):
+        paise = [0] * len(self.codes["type"])
+        for row in self._scan():
+            paise[row[1]] += row[5]
+        totals = {"Income": 0, "Expense": 0}
+        for code, total in enumerate(paise):
+            if self.codes["type"][code] in totals:
+                totals[self.codes["type"][code]] = total
+        return totals
+
+    def _check_fresh(self):
+        """Raise StaleLedgerError if another process has written since this copy was loaded."""
+        if self.lock.version() != self.loaded_version:
+            raise StaleLedgerError(f"Ledger for {self.username} was changed by another process")
+
+    def _append_heap(self, data):
+        """Append strings to the heap and return the offset they start at."""
+        heap_path = self._heap_path(self.generation)
+        with open(heap_path, "ab") as f:
+            offset = f.tell()
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return offset
+
+    def _persisted(self):
+        self._map_files()
+        self.version += 1
+        self._query_cache = None
+        self.loaded_version = self.lock.bump()
+
+    def add(self, record):
+        self.add_many([record])
+
+    def add_many(self, records):
+        with self.lock:
+            self._check_fresh()
+            positions = self._position_index()
+            keys = [uuid.UUID(record["id"]).bytes for record in records]
+            if len(set(keys)) != len(keys) or any(key in positions for key in keys):
+                raise ValueError("Duplicate transaction id in batch")
+            offset = os.path.getsize(self._heap_path(self.generation))
+            packed, strings = [], []
+            for record in records:
+                data, text = self._pack(record, offset)
+                packed.append(data)
+                strings.append(text)
+                offset += len(text)
+            self._save_codes()
+            # Strings first: a crash between the two writes leaves unused heap
+            # bytes, never a record pointing past the end of the heap.
+            self._append_heap(b"".join(strings))
+            with open(self.path, "ab") as f:
+                f.write(b"".join(packed))
+                f.flush()
+                os.fsync(f.fileno())
+            for i, key in enumerate(keys):
+                positions[key] = self.record_count + i
+            self._persisted()
+
+    def _write_record(self, position, data, offset=0):
+        with open(self.path, "r+b") as f:
+            f.seek(HEADER.size + position * RECORD.size + offset)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def update(self, transaction_id, fields):
+        with self.lock:
+            self._check_fresh()
+            position = self._position(transaction_id)
+            if position is None:
+                return False
+            transaction = self._unpack(position)
+            transaction.update(fields)
+            heap_offset = os.path.getsize(self._heap_path(self.generation))
+            data, text = self._pack(transaction, heap_offset)
+            self._save_codes()
+            self._append_heap(text)
+            self._write_record(position, data)
+            self._persisted()
+            return True
+
+    def delete(self, transaction_id):
+        with self.lock:
+            self._check_fresh()
+            position = self._position(transaction_id)
+            if position is None:
+                return False
+            self._write_record(position, bytes([DELETED]), offset=16)
+            del self._positions[uuid.UUID(transaction_id).bytes]
+            self._persisted()
+            if len(self._positions) * 2 <= self.record_count:
+                self.compact()
+            return True
+
+    def _rewrite(self, transactions):
+        """Write `transactions` as a fresh records file and a new-generation heap, then switch to them."""
+        generation = self.generation + 1
+        heap_path = self._heap_path(generation)
+        tmp_path = f"{self.path}.tmp"
+        offset = 0
+        with open(heap_path, "wb") as heap, open(tmp_path, "wb") as records:
+            records.write(HEADER.pack(MAGIC, RECORD.size, generation))
+            for transaction in transactions:
+                data, text = self._pack(transaction, offset)
+                records.write(data)
+                heap.write(text)
+                offset += len(text)
+            for f in (heap, records):
+                f.flush()
+                os.fsync(f.fileno())
+        self._save_codes()
+        old_heap = self._heap_path(self.generation)
+        _unmap(self._records)
+        _unmap(self._heap)
+        self._records = self._heap = b""
+        # The header names the heap generation, so until this replace lands
+        # the old records file keeps pointing at the old, intact heap.
+        os.replace(tmp_path, self.path)
+        if old_heap != heap_path and os.path.exists(old_heap):
+            os.remove(old_heap)
+        self.generation = generation
+
+    def compact(self):
+        """Rewrite the ledger without deleted records or orphaned heap strings."""
+        with self.lock:
+            self._check_fresh()
+            self._rewrite(self._unpack(row[0]) for row in self._scan())
+            self._open()
+            self.loaded_version = self.lock.bump()
+
+    def close(self):
+        _unmap(self._records)
+        _unmap(self._heap)
+        self._records = self._heap = b""
@@ -0,0 +1,288 @@
+"""JSON-file backed storage: full-rewrite and append-only journal modes.
+
+Both modes read the journal if one exists, so a ledger can be switched
+between them (and an existing ``transactions.json`` is picked up as the
+initial snapshot) without any conversion step.
+"""
+import os
+import json
+
+from bytebank.storage.base import (SORT_COLUMNS, StaleLedgerError, StorageBackend, ledger_path, stat_signature,
+                                   write_json_atomic)
+from bytebank.money import migrate_amounts, report_inexact
+from bytebank.storage.locking import VersionedLock
+
+COMPACT_EVERY = 1000
+
+
+def apply_entry(transactions, positions, entry):
+    """Apply one journal entry to a list of transactions.
+
+    Replay is idempotent: re-adding a known id overwrites it, and updates or
+    deletes of unknown ids are ignored, so replaying a journal over a snapshot
+    that already contains some of its entries is safe.
+    """
+    op = entry["op"]
+    if op == "add":
+        record = entry["record"]
+        if record["id"] in positions:
+            transactions[positions[record["id"]]] = record
+        else:
+            positions[record["id"]] = len(transactions)
+            transactions.append(record)
+    elif op == "update":
+        if entry["id"] in positions:
+            transactions[positions[entry["id"]]].update(entry["fields"])
+    elif op == "delete":
+        if entry["id"] in positions:
+            transactions[positions.pop(entry["id"])] = None
+
+
+class MemoryBackend(StorageBackend):
+    """Backend that keeps the whole ledger in memory and persists via `_write`.
+
+    `positions` maps each id to its slot in `transactions`, so lookups, updates
+    and deletes are O(1). Deleted slots are left as None tombstones and swept
+    once they make up half of the list.
+
+    Reads and writes hold `lock`, an advisory lock shared with other
+    processes. Every write bumps the lock file's version counter; a write
+    from a copy loaded at an older version raises StaleLedgerError instead of
+    overwriting the newer data.
+    """
+    def __init__(self, username):
+        super().__init__(username)
+        self.path = ledger_path(username)
+        base = os.path.splitext(self.path)[0]
+        self.journal_path = f"{base}.journal"
+        self.lock = VersionedLock(f"{base}.lock")
+        self.loaded_version = 0
+        self.transactions = []
+        self.positions = {}
+        self.tombstones = 0
+        self.version = 0
+        self.migrated = 0
+        self._query_cache = None
+
+    def signature(self):
+        return (self.lock.version(), stat_signature(self.path), stat_signature(self.journal_path))
+
+    def files(self):
+        return [self.path, self.journal_path]
+
+    def locked(self):
+        return self.lock
+
+    def reload(self):
+        """Load the snapshot and replay any pending journal entries."""
+        with self.lock:
+            self.loaded_version = self.lock.version()
+            self._load()
+            if self.migrated:
+                # Persist the float -> paise conversion once, as a fresh snapshot.
+                self.compact()
+
+    def _load(self):
+        transactions = []
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                transactions = json.load(f)
+        positions = {t["id"]: i for i, t in enumerate(transactions)}
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb+") as f:
+                good_offset = 0
+                for line in iter(f.readline, b""):
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn final line from an interrupted append; cut it off
+                        # so the next append starts on a clean line.
+                        f.truncate(good_offset)
+                        break
+                    apply_entry(transactions, positions, entry)
+                    good_offset = f.tell()
+        # Ledgers written before amounts were stored as paise hold float rupees.
+        self.migrated, inexact = migrate_amounts(transactions)
+        report_inexact(self.path, inexact)
+        self.transactions = transactions
+        self.positions = positions
+        self.tombstones = len(transactions) - len(positions)
+        self.version += 1
+        self._sweep()
+
+    def _sweep(self):
+        """Drop tombstones once they make up half of the list, re-indexing the survivors."""
+        if not self.tombstones or self.tombstones * 2 < len(self.transactions):
+            return
+        self.transactions = [t for t in self.transactions if t is not None]
+        self.positions = {t["id"]: i for i, t in enumerate(self.transactions)}
+        self.tombstones = 0
+
+    def live(self):
+        """Iterate over the transactions that have not been deleted."""
+        return (t for t in self.transactions if t is not None)
+
+    def all(self):
+        return list(self.live())
+
+    def get(self, transaction_id):
+        position = self.positions.get(transaction_id)
+        return None if position is None else self.transactions[position]
+
+    def iter_transactions(self, start_date=None, end_date=None, category=None, transaction_type=None,
+                          payment_method=None):
+        for t in self.live():
+            if ((start_date is None or t["date"] >= start_date)
+                    and (end_date is None or t["date"] <= end_date)
+                    and (category is None or t["category"] == category)
+                    and (transaction_type is None or t["type"] == transaction_type)
+                    and (payment_method is None or t["payment_method"] == payment_method)):
+                yield t
+
+    def _matching(self, start_date, end_date, category, transaction_type, payment_method,
+                  order_by=None, descending=False):
+        """Return the filtered (and sorted) rows, reusing the last result while the ledger is unchanged."""
+        key = (self.version, start_date, end_date, category, transaction_type, payment_method,
+               order_by, descending)
+        if self._query_cache is not None and self._query_cache[0] == key:
+            return self._query_cache[1]
+        rows = list(self.iter_transactions(start_date, end_date, category, transaction_type, payment_method))
+        if order_by in SORT_COLUMNS:
+            rows.sort(key=lambda t: t[order_by], reverse=descending)
+        self._query_cache = (key, rows)
+        return rows
+
+    def query(self, start_date=None, end_date=None, category=None, transaction_type=None,
+              payment_method=None, order_by=None, descending=False, offset=0, limit=None):
+        rows = self._matching(start_date, end_date, category, transaction_type, payment_method,
+                              order_by, descending)
+        return rows[offset:None if limit is None else offset + limit]
+
+    def count(self, start_date=None, end_date=None, category=None, transaction_type=None,
+              payment_method=None):
+        return len(self._matching(start_date, end_date, category, transaction_type, payment_method))
+
+    def totals(self):
+        totals = {"Income": 0, "Expense": 0}
+        for t in self.live():
+            if t.get("type") in totals:
+                totals[t["type"]] += t["amount"]
+        return totals
+
+    def add(self, record):
+        self.add_many([record])
+
+    def add_many(self, records):
+        with self.lock:
+            self._check_fresh()
+            ids = [record["id"] for record in records]
+            if len(set(ids)) != len(ids) or any(i in self.positions for i in ids):
+                raise ValueError("Duplicate transaction id in batch")
+            start = len(self.transactions)
+            for record in records:
+                self.positions[record["id"]] = len(self.transactions)
+                self.transactions.append(record)
+            try:
+                self._persist([{"op": "add", "record": record} for record in records])
+            except BaseException:
+                del self.transactions[start:]
+                for record in records:
+                    del self.positions[record["id"]]
+                raise
+
+    def update(self, transaction_id, fields):
+        with self.lock:
+            self._check_fresh()
+            position = self.positions.get(transaction_id)
+            if position is None:
+                return False
+            # The cached record is replaced by an updated copy, never edited, so
+            # callers holding it and a failed write both see it unchanged.
+            original = self.transactions[position]
+            self.transactions[position] = {**original, **fields}
+            try:
+                self._persist([{"op": "update", "id": transaction_id, "fields": fields}])
+            except BaseException:
+                self.transactions[position] = original
+                raise
+            return True
+
+    def delete(self, transaction_id):
+        with self.lock:
+            self._check_fresh()
+            position = self.positions.pop(transaction_id, None)
+            if position is None:
+                return False
+            original = self.transactions[position]
+            self.transactions[position] = None
+            self.tombstones += 1
+            try:
+                self._persist([{"op": "delete", "id": transaction_id}])
+            except BaseException:
+                self.transactions[position] = original
+                self.positions[transaction_id] = position
+                self.tombstones -= 1
+                raise
+            self._sweep()
+            return True
+
+    def _check_fresh(self):
+        """Raise StaleLedgerError if another process has written since this copy was loaded."""
+        if self.lock.version() != self.loaded_version:
+            raise StaleLedgerError(f"Ledger for {self.username} was changed by another process")
+
+    def _persist(self, entries):
+        self.version += 1
+        self._write(entries)
+        self.loaded_version = self.lock.bump()
+
+    def _write(self, entries):
+        """Persist a batch of mutations in one write; `self.transactions` already reflects them.
+
+        If this raises, the caller puts `self.transactions` back as it was.
+        """
+        raise NotImplementedError
+
+    def compact(self):
+        """Write the ledger as the new snapshot and drop the journal."""
+        with self.lock:
+            self._check_fresh()
+            write_json_atomic(self.path, self.all())
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self.loaded_version = self.lock.bump()
+
+
+class JsonBackend(MemoryBackend):
+    """Store a ledger as one JSON array, rewritten on every mutation."""
+    def _write(self, entries):
+        self.compact()
+
+
+class JournalBackend(MemoryBackend):
+    """Append each mutation to a journal; compact into the snapshot periodically."""
+    def __init__(self, username, compact_every=COMPACT_EVERY):
+        super().__init__(username)
+        self.compact_every = compact_every
+        self.pending = 0
+
+    def _load(self):
+        super()._load()
+        self.pending = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as f:
+                self.pending = sum(1 for _ in f)
+
+    def _write(self, entries):
+        with open(self.journal_path, "a") as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending += len(entries)
+        if self.pending >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        with self.lock:
+            super().compact()
+            self.pending = 0
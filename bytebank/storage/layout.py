@@ -0,0 +1,86 @@
+"""Create user directories and move ledgers out of the old flat layout.
+
+Before sharding, a user's files sat directly in the data root as
+``<username>_transactions.json`` (plus ``.journal``, ``.lock``, ``.bbl`` ...)
+and ``<username>_rollups.json``. `prepare_user` moves those into the user's
+directory the first time the user is opened; `migrate_all` (``python -m
+bytebank migrate-layout``) does the same for every user at once.
+"""
+import os
+import re
+import glob
+import datetime
+
+from bytebank.storage.base import DATA_ROOT, LAYOUT_VERSION, manifest_path, user_dir, write_json_atomic
+
+# <username>_transactions.<ext> and <username>_rollups.json; group 2 is the file's name in the new layout.
+LEGACY_FILE = re.compile(r"^(.+)_(transactions\..+|rollups\.json)$")
+
+
+def legacy_files(username, root=None):
+    """Return [(old path, new name)] for a user's files still in the flat layout."""
+    root = root or DATA_ROOT
+    prefix = glob.escape(f"{username}_")
+    found = []
+    for pattern in ("transactions.*", "rollups.json"):
+        for path in glob.glob(os.path.join(root, prefix + pattern)):
+            # Skip temp files left behind by an interrupted atomic write.
+            if not path.endswith(".tmp"):
+                found.append((path, os.path.basename(path)[len(username) + 1:]))
+    return sorted(found)
+
+
+def move_legacy_files(username, root=None):
+    """Move a user's flat-layout files into their directory; return the number moved."""
+    directory = user_dir(username, root)
+    moved = 0
+    for path, name in legacy_files(username, root):
+        target = os.path.join(directory, name)
+        if os.path.exists(target):
+            print(f"Warning: not moving {path}: {target} already exists")
+            continue
+        try:
+            os.replace(path, target)
+        except FileNotFoundError:
+            continue  # another process moved it first
+        moved += 1
+    return moved
+
+
+def prepare_user(username, root=None):
+    """Make sure a user's directory and manifest exist, moving flat-layout files in on first use."""
+    path = manifest_path(username, root)
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    moved = move_legacy_files(username, root)
+    if moved:
+        print(f"Moved {moved} files for {username} into {os.path.dirname(path)}")
+    write_json_atomic(path, {"username": username, "layout": LAYOUT_VERSION,
+                             "created": datetime.datetime.now().isoformat(timespec="seconds")})
+
+
+def find_legacy_users(root=None):
+    """Return the usernames that still have files in the flat layout under `root`."""
+    usernames = set()
+    for name in os.listdir(root or DATA_ROOT):
+        match = LEGACY_FILE.match(name)
+        if match and not name.endswith(".tmp") and os.path.isfile(os.path.join(root or DATA_ROOT, name)):
+            usernames.add(match.group(1))
+    return sorted(usernames)
+
+
+def migrate_all(root=None, dry_run=False):
+    """Move every flat-layout ledger under `root` into the sharded layout; return the users handled."""
+    usernames = find_legacy_users(root)
+    for username in usernames:
+        if dry_run:
+            for path, name in legacy_files(username, root):
+                print(f"{path} -> {os.path.join(user_dir(username, root), name)}")
+        else:
+            prepare_user(username, root)
+            # prepare_user does nothing if the manifest already exists, so catch stragglers too.
+            moved = move_legacy_files(username, root)
+            if moved:
+                print(f"Moved {moved} files for {username} into {user_dir(username, root)}")
+    return usernames
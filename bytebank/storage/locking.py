@@ -0,0 +1,116 @@
+"""Advisory inter-process file locks for ledgers and the user directory."""
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_TIMEOUT = float(os.environ.get("BYTEBANK_LOCK_TIMEOUT", "10"))
+VERSION_WIDTH = 20
+# Windows byte-range locks are mandatory, so lock a byte past the version
+# counter to keep it readable by processes that don't hold the lock.
+LOCK_OFFSET = 64
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a file lock could not be acquired within the timeout."""
+
+
+class FileLock:
+    """Exclusive advisory lock on `path`, usable as a context manager.
+
+    The lock is re-entrant within a process (nested `with` blocks on the same
+    FileLock only take the OS lock once) and is shared safely between threads.
+    """
+    def __init__(self, path, timeout=None):
+        self.path = path
+        self.timeout = LOCK_TIMEOUT if timeout is None else timeout
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._lock_file()
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            self._unlock_file()
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def _lock_file(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+        delay = 0.001
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    os.lseek(fd, LOCK_OFFSET, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeout(f"Timed out waiting for lock on {self.path}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+        self._fd = fd
+
+    def _unlock_file(self):
+        fd, self._fd = self._fd, None
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, LOCK_OFFSET, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+
+class VersionedLock(FileLock):
+    """A FileLock whose file also holds a write counter for the data it guards.
+
+    Writers bump the counter while holding the lock; readers can compare it
+    with the version they loaded to tell whether their copy is stale. The
+    counter is a fixed-width number rewritten in place, so an unlocked read
+    sees either the old or the new value.
+    """
+    def version(self):
+        """Return the current counter (0 if the file does not exist yet)."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read(VERSION_WIDTH)
+        except FileNotFoundError:
+            return 0
+        try:
+            return int(data)
+        except ValueError:
+            return 0
+
+    def bump(self):
+        """Increment the counter and return the new value. The lock must be held."""
+        version = self.version() + 1
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, str(version).zfill(VERSION_WIDTH).encode())
+        return version
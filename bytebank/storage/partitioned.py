@@ -0,0 +1,376 @@
+"""Time-partitioned ledger: one JSON file per month (or year) plus a manifest.
+
+Files, in ``partitions/`` in the user's directory:
+
+* ``<key>.json`` -- the transactions dated in one period, where the key is
+  ``YYYY-MM`` (or ``YYYY`` with ``BYTEBANK_PARTITION=year``);
+* ``manifest.json`` -- per-partition income/expense totals and row counts,
+  plus each partition file's stat signature;
+* ``ids.log`` -- an append-only ``<id>\\t<key>`` index, so a transaction can
+  be found by id without opening every partition.
+
+Only the current period is loaded when the ledger is opened. All-time
+totals and counts come from the manifest; other partitions are read the
+first time a query needs them (date-filtered queries only open the
+periods they cover, and newest-first pages stop once they have enough
+rows). A write rewrites only the partitions it touches.
+
+Partition files are written before the manifest. On load, any partition
+whose stat no longer matches the manifest (a crash between the two
+writes) is re-read and its totals and ids repaired.
+"""
+import os
+import re
+import json
+import datetime
+
+from bytebank.storage.base import (SORT_COLUMNS, StaleLedgerError, StorageBackend, ledger_path, stat_signature,
+                                   user_dir, write_json_atomic)
+from bytebank.storage.locking import VersionedLock
+
+PARTITION_BY = os.environ.get("BYTEBANK_PARTITION", "month")
+KEY_LENGTHS = {"month": 7, "year": 4}
+KEY_PATTERNS = {"month": re.compile(r"\d{4}-\d{2}"), "year": re.compile(r"\d{4}")}
+MANIFEST_VERSION = 1
+REMOVED = "-"
+
+
+def _matches(t, start_date, end_date, category, transaction_type, payment_method):
+    return ((start_date is None or t["date"] >= start_date)
+            and (end_date is None or t["date"] <= end_date)
+            and (category is None or t["category"] == category)
+            and (transaction_type is None or t["type"] == transaction_type)
+            and (payment_method is None or t["payment_method"] == payment_method))
+
+
+class Partition:
+    """The transactions of one period, in insertion order."""
+    def __init__(self, key, transactions):
+        self.key = key
+        self.transactions = transactions
+        self.positions = {t["id"]: i for i, t in enumerate(transactions)}
+
+    def add(self, record):
+        self.positions[record["id"]] = len(self.transactions)
+        self.transactions.append(record)
+
+    def remove(self, transaction_id):
+        del self.transactions[self.positions[transaction_id]]
+        self.positions = {t["id"]: i for i, t in enumerate(self.transactions)}
+
+    def meta(self):
+        """Return the manifest entry for this partition (without the file stat)."""
+        meta = {"Income": 0, "Expense": 0, "count": len(self.transactions)}
+        for t in self.transactions:
+            if t.get("type") in ("Income", "Expense"):
+                meta[t["type"]] += t["amount"]
+        return meta
+
+
+class PartitionedBackend(StorageBackend):
+    """Store a ledger as per-period JSON partitions, loading old periods only on demand.
+
+    Locking and stale-write detection work as for the JSON backends, on the
+    same ``transactions.lock``. An existing JSON ledger (and its journal) is
+    split into partitions the first time the ledger is opened.
+    """
+    def __init__(self, username, partition_by=None):
+        super().__init__(username)
+        self.directory = os.path.join(user_dir(username), "partitions")
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+        self.ids_path = os.path.join(self.directory, "ids.log")
+        self.lock = VersionedLock(f"{os.path.splitext(ledger_path(username))[0]}.lock")
+        self.partition_by = partition_by or PARTITION_BY
+        if self.partition_by not in KEY_LENGTHS:
+            raise ValueError(f"Unknown partition period: {self.partition_by}")
+        self.loaded_version = 0
+        self.version = 0
+        self.manifest = {}
+        self.partitions = {}
+        self._ids = None
+        self._query_cache = None
+
+    def _key(self, date):
+        """Return the partition key of a YYYY-MM-DD date; raise ValueError for anything else.
+
+        The key names a file, so a malformed date must never reach a path.
+        """
+        key = str(date)[:KEY_LENGTHS[self.partition_by]]
+        if not KEY_PATTERNS[self.partition_by].fullmatch(key):
+            raise ValueError(f"Invalid transaction date: {date!r}")
+        return key
+
+    def _partition_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def signature(self):
+        return (self.lock.version(), stat_signature(self.manifest_path))
+
+    def files(self):
+        try:
+            return [os.path.join(self.directory, name) for name in os.listdir(self.directory)]
+        except FileNotFoundError:
+            return []
+
+    def locked(self):
+        return self.lock
+
+    def reload(self):
+        """Read the manifest and the current period's partition."""
+        with self.lock:
+            self.loaded_version = self.lock.version()
+            self.partitions = {}
+            self._ids = None
+            self.version += 1
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, "r") as f:
+                    data = json.load(f)
+                self.partition_by = data["partition_by"]
+                self.manifest = data["partitions"]
+                self._repair()
+            else:
+                self.manifest = {}
+                os.makedirs(self.directory, exist_ok=True)
+                self._migrate_json()
+            self._partition(self._key(datetime.date.today().isoformat()))
+
+    def _repair(self):
+        """Re-read partitions written after the manifest was last saved (e.g. by a crashed writer)."""
+        keys = set(self.manifest)
+        keys.update(name[:-len(".json")] for name in os.listdir(self.directory)
+                    if name.endswith(".json") and name != "manifest.json")
+        stale = [key for key in sorted(keys)
+                 if list(stat_signature(self._partition_path(key)) or []) != self.manifest.get(key, {}).get("stat")]
+        if not stale:
+            return
+        for key in stale:
+            print(f"Warning: {self._partition_path(key)} does not match the manifest; re-reading it")
+            self.manifest.pop(key, None)
+            if os.path.exists(self._partition_path(key)):
+                self._commit([self._partition(key)], save=False)
+        self._save_manifest()
+
+    def _migrate_json(self):
+        """Split `transactions.json` and its journal, if any, into partitions."""
+        from bytebank.storage.files import JournalBackend
+        legacy = JournalBackend(self.username)
+        # Load without taking the lock again: we already hold it on another handle.
+        legacy._load()
+        partitions = {}
+        for t in legacy.live():
+            key = self._key(t["date"])
+            if key not in partitions:
+                partitions[key] = self.partitions[key] = Partition(key, [])
+            partitions[key].add(t)
+        if partitions:
+            self._commit(partitions.values(), save=False)
+            print(f"Split {legacy.path} into {len(partitions)} partitions")
+        self._save_manifest()
+
+    def _partition(self, key):
+        """Return the partition for `key`, reading it from disk on first use."""
+        partition = self.partitions.get(key)
+        if partition is None:
+            transactions = []
+            path = self._partition_path(key)
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    transactions = json.load(f)
+            partition = self.partitions[key] = Partition(key, transactions)
+        return partition
+
+    def _keys(self, start_date=None, end_date=None, descending=False):
+        """Return the partition keys overlapping a date range, oldest first (or newest first)."""
+        length = KEY_LENGTHS[self.partition_by]
+        return sorted((key for key in self.manifest
+                       if (start_date is None or key >= start_date[:length])
+                       and (end_date is None or key <= end_date[:length])), reverse=descending)
+
+    def _id_index(self):
+        """Return the {id: partition key} index, reading ids.log on first use."""
+        if self._ids is None:
+            ids = {}
+            if os.path.exists(self.ids_path):
+                with open(self.ids_path, "r") as f:
+                    for line in f:
+                        transaction_id, _, key = line.rstrip("\n").partition("\t")
+                        if key == REMOVED:
+                            ids.pop(transaction_id, None)
+                        elif key:
+                            ids[transaction_id] = key
+            self._ids = ids
+        return self._ids
+
+    def all(self):
+        return list(self.iter_transactions())
+
+    def get(self, transaction_id):
+        for partition in self.partitions.values():
+            if transaction_id in partition.positions:
+                return partition.transactions[partition.positions[transaction_id]]
+        key = self._id_index().get(transaction_id)
+        if key is None or key in self.partitions:
+            return None
+        partition = self._partition(key)
+        position = partition.positions.get(transaction_id)
+        return None if position is None else partition.transactions[position]
+
+    def iter_transactions(self, start_date=None, end_date=None, category=None, transaction_type=None,
+                          payment_method=None):
+        """Yield matching transactions, period by period (insertion order within a period)."""
+        for key in self._keys(start_date, end_date):
+            for t in self._partition(key).transactions:
+                if _matches(t, start_date, end_date, category, transaction_type, payment_method):
+                    yield t
+
+    def _matching(self, start_date, end_date, category, transaction_type, payment_method,
+                  order_by=None, descending=False, needed=None):
+        """Return the filtered (and sorted) rows, reusing the last result while the ledger is unchanged.
+
+        When sorting by date, partitions are visited in date order and the
+        walk stops once `needed` rows are collected, leaving older (or newer)
+        periods unread.
+        """
+        key = (self.version, start_date, end_date, category, transaction_type, payment_method,
+               order_by, descending)
+        if self._query_cache is not None and self._query_cache[0] == key:
+            cached, complete = self._query_cache[1]
+            if complete or (needed is not None and len(cached) >= needed):
+                return cached
+        rows = []
+        complete = True
+        for partition_key in self._keys(start_date, end_date, descending and order_by == "date"):
+            if order_by == "date" and needed is not None and len(rows) >= needed:
+                complete = False
+                break
+            period = [t for t in self._partition(partition_key).transactions
+                      if _matches(t, start_date, end_date, category, transaction_type, payment_method)]
+            if order_by == "date":
+                period.sort(key=lambda t: t["date"], reverse=descending)
+            rows.extend(period)
+        if order_by in SORT_COLUMNS and order_by != "date":
+            rows.sort(key=lambda t: t[order_by], reverse=descending)
+        self._query_cache = (key, (rows, complete))
+        return rows
+
+    def query(self, start_date=None, end_date=None, category=None, transaction_type=None,
+              payment_method=None, order_by=None, descending=False, offset=0, limit=None):
+        rows = self._matching(start_date, end_date, category, transaction_type, payment_method,
+                              order_by, descending, None if limit is None else offset + limit)
+        return rows[offset:None if limit is None else offset + limit]
+
+    def count(self, start_date=None, end_date=None, category=None, transaction_type=None,
+              payment_method=None):
+        if start_date is end_date is category is transaction_type is payment_method is None:
+            return sum(meta["count"] for meta in self.manifest.values())
+        return len(self._matching(start_date, end_date, category, transaction_type, payment_method))
+
+    def totals(self):
+        totals = {"Income": 0, "Expense": 0}
+        for meta in self.manifest.values():
+            totals["Income"] += meta["Income"]
+            totals["Expense"] += meta["Expense"]
+        return totals
+
+    def add(self, record):
+        self.add_many([record])
+
+    def add_many(self, records):
+        with self.lock:
+            self._check_fresh()
+            ids = self._id_index()
+            batch_ids = [record["id"] for record in records]
+            if len(set(batch_ids)) != len(batch_ids) or any(i in ids for i in batch_ids):
+                raise ValueError("Duplicate transaction id in batch")
+            # Every key is checked before any partition is changed.
+            keys = [self._key(record["date"]) for record in records]
+            touched = {}
+            for record, key in zip(records, keys):
+                partition = self._partition(key)
+                partition.add(record)
+                touched[key] = partition
+            self._persist(touched.values(), list(zip(batch_ids, keys)))
+
+    def update(self, transaction_id, fields):
+        with self.lock:
+            self._check_fresh()
+            transaction = self.get(transaction_id)
+            if transaction is None:
+                return False
+            old = self._partition(self._key(transaction["date"]))
+            new = self._partition(self._key(fields.get("date", transaction["date"])))
+            transaction.update(fields)
+            if new is old:
+                self._persist([old], [])
+            else:
+                # The new date falls in another period: move the record.
+                old.remove(transaction_id)
+                new.add(transaction)
+                self._persist([old, new], [(transaction_id, new.key)])
+            return True
+
+    def delete(self, transaction_id):
+        with self.lock:
+            self._check_fresh()
+            transaction = self.get(transaction_id)
+            if transaction is None:
+                return False
+            partition = self._partition(self._key(transaction["date"]))
+            partition.remove(transaction_id)
+            self._persist([partition], [(transaction_id, REMOVED)])
+            return True
+
+    def _check_fresh(self):
+        """Raise StaleLedgerError if another process has written since this copy was loaded."""
+        if self.lock.version() != self.loaded_version:
+            raise StaleLedgerError(f"Ledger for {self.username} was changed by another process")
+
+    def _persist(self, partitions, id_changes):
+        self.version += 1
+        self._commit(partitions, id_changes)
+        self.loaded_version = self.lock.bump()
+
+    def _commit(self, partitions, id_changes=None, save=True):
+        """Write partitions, then the id index, then (if `save`) the manifest."""
+        partitions = list(partitions)
+        for partition in partitions:
+            path = self._partition_path(partition.key)
+            if partition.transactions:
+                write_json_atomic(path, partition.transactions, indent=None)
+                self.manifest[partition.key] = dict(partition.meta(), stat=list(stat_signature(path)))
+            else:
+                if os.path.exists(path):
+                    os.remove(path)
+                self.manifest.pop(partition.key, None)
+        if id_changes is None:
+            id_changes = [(t["id"], partition.key) for partition in partitions for t in partition.transactions]
+        if id_changes:
+            with open(self.ids_path, "a") as f:
+                f.write("".join(f"{transaction_id}\t{key}\n" for transaction_id, key in id_changes))
+                f.flush()
+                os.fsync(f.fileno())
+            if self._ids is not None:
+                for transaction_id, key in id_changes:
+                    if key == REMOVED:
+                        self._ids.pop(transaction_id, None)
+                    else:
+                        self._ids[transaction_id] = key
+        if save:
+            self._save_manifest()
+
+    def _save_manifest(self):
+        write_json_atomic(self.manifest_path, {"version": MANIFEST_VERSION, "partition_by": self.partition_by,
+                                               "partitions": self.manifest}, indent=None)
+
+    def compact(self):
+        """Rewrite ids.log without removed or superseded entries."""
+        with self.lock:
+            self._check_fresh()
+            lines = "".join(f"{transaction_id}\t{key}\n" for transaction_id, key in self._id_index().items())
+            tmp_path = f"{self.ids_path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.ids_path)
+            self.loaded_version = self.lock.bump()
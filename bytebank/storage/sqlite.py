@@ -0,0 +1,266 @@
+"""SQLite storage backend: one shared WAL-mode database, indexed per user."""
+import os
+import sqlite3
+
+from bytebank.money import legacy_to_paise, report_inexact
+from bytebank.storage.base import SORT_COLUMNS, StorageBackend, data_path, ledger_path
+from bytebank.storage.locking import FileLock
+
+SQLITE_PATH = os.environ.get("BYTEBANK_SQLITE_PATH") or data_path("bytebank.db")
+
+COLUMNS = ("id", "type", "amount", "description", "category", "date", "payment_method", "notes")
+# PRAGMA user_version of a fully migrated database. 1: amounts are INTEGER paise (were REAL rupees).
+# 2: the primary key is (user, id) (was id alone, shared by every user).
+SCHEMA_VERSION = 2
+
+TABLE = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT NOT NULL,
+    user TEXT NOT NULL,
+    type TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    category TEXT NOT NULL,
+    date TEXT NOT NULL,
+    payment_method TEXT NOT NULL,
+    notes TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (user, id)
+)
+"""
+INDEXES = {
+    "idx_transactions_user_date": "transactions (user, date)",
+    "idx_transactions_user_category": "transactions (user, category)",
+}
+CREATE_INDEXES = [f"CREATE INDEX IF NOT EXISTS {name} ON {columns}" for name, columns in INDEXES.items()]
+SCHEMA = ";\n".join([TABLE] + CREATE_INDEXES + [
+    "CREATE TABLE IF NOT EXISTS migrated_users (user TEXT PRIMARY KEY)",
+    # One change counter per user, bumped in the same transaction as each write to their rows.
+    "CREATE TABLE IF NOT EXISTS ledger_versions (user TEXT PRIMARY KEY, version INTEGER NOT NULL)",
+]) + ";"
+
+
+class SQLiteBackend(StorageBackend):
+    """Store every user's transactions in one indexed SQLite database.
+
+    A user's legacy JSON ledger is imported the first time the backend is
+    opened for them. SQLite serializes the row writes itself; `lock` only
+    keeps the ledger's rollup file in step with them across processes.
+    """
+    def __init__(self, username, path=None):
+        super().__init__(username)
+        self.path = path or SQLITE_PATH
+        self.lock = FileLock(f"{os.path.splitext(ledger_path(username))[0]}.lock")
+        # The ledger may be opened on one thread and used from another (the UI's
+        # I/O worker); access is serialized by the caller, never concurrent.
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate_schema()
+        self._migrate_json()
+
+    def _migrate_schema(self):
+        """Upgrade a database created by an older version to SCHEMA_VERSION."""
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        # IMMEDIATE takes the write lock up front, so two processes opening an
+        # old database at once cannot both migrate it.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                self._migrate_paise()
+            if version < 2:
+                self._migrate_primary_key()
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+    def _migrate_paise(self):
+        """Rebuild a table of REAL rupee amounts with INTEGER paise, reporting values that had to be rounded."""
+        types = {row[1]: row[2] for row in self.conn.execute("PRAGMA table_info(transactions)")}
+        if types.get("amount", "").upper() != "REAL":
+            return
+        for name in INDEXES:
+            self.conn.execute(f"DROP INDEX IF EXISTS {name}")
+        self.conn.execute("ALTER TABLE transactions RENAME TO transactions_rupees")
+        self.conn.execute(TABLE)
+        inexact = []
+        rows = self.conn.execute(f"SELECT rowid, user, {', '.join(COLUMNS)} FROM transactions_rupees ORDER BY rowid")
+        for row in rows.fetchall():
+            paise, exact = legacy_to_paise(row["amount"])
+            if not exact:
+                inexact.append((row["id"], row["amount"], paise))
+            self.conn.execute(
+                f"INSERT INTO transactions (rowid, user, {', '.join(COLUMNS)}) "
+                f"VALUES (?, ?, {', '.join('?' * len(COLUMNS))})",
+                [row["rowid"], row["user"]] + [paise if c == "amount" else row[c] for c in COLUMNS])
+        self.conn.execute("DROP TABLE transactions_rupees")
+        for statement in CREATE_INDEXES:
+            self.conn.execute(statement)
+        report_inexact(self.path, inexact)
+
+    def _migrate_primary_key(self):
+        """Rebuild a table keyed by id alone with the (user, id) key, keeping rowids and so the row order."""
+        key = [row[1] for row in sorted(self.conn.execute("PRAGMA table_info(transactions)"), key=lambda r: r[5])
+               if row[5]]
+        if key == ["user", "id"]:
+            return
+        for name in INDEXES:
+            self.conn.execute(f"DROP INDEX IF EXISTS {name}")
+        self.conn.execute("ALTER TABLE transactions RENAME TO transactions_by_id")
+        self.conn.execute(TABLE)
+        self.conn.execute(f"INSERT INTO transactions (rowid, user, {', '.join(COLUMNS)}) "
+                          f"SELECT rowid, user, {', '.join(COLUMNS)} FROM transactions_by_id ORDER BY rowid")
+        self.conn.execute("DROP TABLE transactions_by_id")
+        for statement in CREATE_INDEXES:
+            self.conn.execute(statement)
+
+    def _migrate_json(self):
+        """Import the user's JSON ledger (transactions.json) once."""
+        if self.conn.execute("SELECT 1 FROM migrated_users WHERE user = ?", (self.username,)).fetchone():
+            return
+        # As in _migrate_schema: re-check under the write lock, so two processes
+        # opening the ledger at once cannot both import it.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not self.conn.execute("SELECT 1 FROM migrated_users WHERE user = ?",
+                                     (self.username,)).fetchone():
+                if os.path.exists(ledger_path(self.username)):
+                    from bytebank.storage.files import JsonBackend
+                    legacy = JsonBackend(self.username)
+                    legacy.reload()
+                    self._insert(legacy.transactions)
+                    self._bump()
+                self.conn.execute("INSERT INTO migrated_users (user) VALUES (?)", (self.username,))
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+    def signature(self):
+        # Only this user's writes move the counter; other users' commits to the shared database don't.
+        row = self.conn.execute("SELECT version FROM ledger_versions WHERE user = ?", (self.username,)).fetchone()
+        return row[0] if row else 0
+
+    def _bump(self):
+        """Advance this user's change counter; call inside the write's transaction."""
+        self.conn.execute("INSERT OR IGNORE INTO ledger_versions (user, version) VALUES (?, 0)", (self.username,))
+        self.conn.execute("UPDATE ledger_versions SET version = version + 1 WHERE user = ?", (self.username,))
+
+    def files(self):
+        # The database is shared by all users, so this is the size of every ledger in it.
+        return [self.path, f"{self.path}-wal"]
+
+    def locked(self):
+        return self.lock
+
+    def reload(self):
+        pass
+
+    def _rows(self, sql, params):
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def all(self):
+        return self._rows(f"SELECT {', '.join(COLUMNS)} FROM transactions WHERE user = ? ORDER BY rowid",
+                          (self.username,))
+
+    def get(self, transaction_id):
+        rows = self._rows(f"SELECT {', '.join(COLUMNS)} FROM transactions WHERE id = ? AND user = ?",
+                          (transaction_id, self.username))
+        return rows[0] if rows else None
+
+    def _where(self, start_date, end_date, category, transaction_type, payment_method):
+        clauses, params = ["user = ?"], [self.username]
+        for clause, value in (("date >= ?", start_date), ("date <= ?", end_date),
+                              ("category = ?", category), ("type = ?", transaction_type),
+                              ("payment_method = ?", payment_method)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return " AND ".join(clauses), params
+
+    def query(self, start_date=None, end_date=None, category=None, transaction_type=None,
+              payment_method=None, order_by=None, descending=False, offset=0, limit=None):
+        where, params = self._where(start_date, end_date, category, transaction_type, payment_method)
+        order = "rowid"
+        if order_by in SORT_COLUMNS:
+            order = f"{order_by} {'DESC' if descending else 'ASC'}, rowid"
+        return self._rows(f"SELECT {', '.join(COLUMNS)} FROM transactions WHERE {where} "
+                          f"ORDER BY {order} LIMIT ? OFFSET ?",
+                          params + [-1 if limit is None else limit, offset])
+
+    def count(self, start_date=None, end_date=None, category=None, transaction_type=None,
+              payment_method=None):
+        where, params = self._where(start_date, end_date, category, transaction_type, payment_method)
+        return self.conn.execute(f"SELECT COUNT(*) FROM transactions WHERE {where}", params).fetchone()[0]
+
+    def iter_transactions(self, start_date=None, end_date=None, category=None, transaction_type=None,
+                          payment_method=None):
+        where, params = self._where(start_date, end_date, category, transaction_type, payment_method)
+        cursor = self.conn.execute(f"SELECT {', '.join(COLUMNS)} FROM transactions WHERE {where} ORDER BY rowid",
+                                   params)
+        try:
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        finally:
+            cursor.close()
+
+    def totals(self):
+        totals = {"Income": 0, "Expense": 0}
+        for row in self.conn.execute("SELECT type, SUM(amount) FROM transactions WHERE user = ? GROUP BY type",
+                                     (self.username,)):
+            totals[row[0]] = row[1]
+        return totals
+
+    def add(self, record):
+        self.add_many([record])
+
+    def add_many(self, records):
+        with self.conn:
+            self._insert(records)
+            self._bump()
+
+    def _insert(self, records):
+        """Insert rows for this user; an id the user already has raises ValueError and nothing is replaced."""
+        try:
+            self.conn.executemany(
+                f"INSERT INTO transactions (user, {', '.join(COLUMNS)}) VALUES (?, {', '.join('?' * len(COLUMNS))})",
+                ([self.username] + [record.get(c, "") for c in COLUMNS] for record in records))
+        except sqlite3.IntegrityError as e:
+            if "UNIQUE" not in str(e):
+                raise
+            raise ValueError("Duplicate transaction id in batch")
+
+    def update(self, transaction_id, fields):
+        fields = {k: v for k, v in fields.items() if k in COLUMNS and k != "id"}
+        if not fields:
+            return self.get(transaction_id) is not None
+        with self.conn:
+            cursor = self.conn.execute(
+                f"UPDATE transactions SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ? AND user = ?",
+                list(fields.values()) + [transaction_id, self.username])
+            if cursor.rowcount:
+                self._bump()
+        return cursor.rowcount > 0
+
+    def delete(self, transaction_id):
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM transactions WHERE id = ? AND user = ?",
+                                       (transaction_id, self.username))
+            if cursor.rowcount:
+                self._bump()
+        return cursor.rowcount > 0
+
+    def compact(self):
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,169 @@
+"""User accounts: an indexed SQLite directory of salted password hashes.
+
+Lookups go through the primary key and a sign-up inserts one row, so the
+cost of either does not grow with the number of accounts. SQLite
+serializes concurrent sign-ups from several processes.
+
+Accounts from the old plaintext `users.json` are imported on first use,
+with each password hashed as it is imported, so `users.db` never holds a
+plaintext password. `users.json` itself is renamed to `users.json.bak`
+once the import commits; it still holds the plaintext passwords, so delete
+it after checking that the accounts log in.
+"""
+import os
+import json
+import sqlite3
+
+from bytebank.passwords import PLAIN_PREFIX, hash_password, needs_rehash, verify_password
+from bytebank.storage.base import data_path
+from bytebank.storage.locking import LOCK_TIMEOUT
+
+USERS_DB_PATH = os.environ.get("BYTEBANK_USERS_DB") or data_path("users.db")
+LEGACY_USERS_PATH = data_path("users.json")
+LEGACY_BACKUP_SUFFIX = ".bak"
+# PRAGMA user_version once the table exists and users.json has been imported.
+# 2: no plaintext passwords left (version 1 imported them as plain$<password>).
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password_hash TEXT NOT NULL
+)
+"""
+
+_dummy_hash = None
+
+
+class UserExistsError(ValueError):
+    """Raised when creating an account whose username is already taken."""
+    def __init__(self):
+        super().__init__("Username already exists!")
+
+
+class UserDirectory:
+    """The accounts table of one users database."""
+    def __init__(self, path=None, legacy_path=LEGACY_USERS_PATH):
+        self.path = path or USERS_DB_PATH
+        self.conn = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._migrate(legacy_path)
+
+    def _migrate(self, legacy_path):
+        """Create the table, import users.json and hash plaintext passwords, once, even with several processes.
+
+        Hashing is slow, so it happens before the write lock is taken; rows
+        that changed meanwhile are hashed under the lock.
+        """
+        legacy = None
+        if legacy_path and self.conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            try:
+                with open(legacy_path, "r") as f:
+                    legacy = {name: hash_password(record["password"]) for name, record in json.load(f).items()}
+            except FileNotFoundError:
+                # None, or another process has just imported it and renamed it away.
+                pass
+        plain = {}
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'users'").fetchone():
+            plain = {row: hash_password(row[1][len(PLAIN_PREFIX):]) for row in self.conn.execute(
+                "SELECT username, password_hash FROM users WHERE password_hash LIKE ?", (PLAIN_PREFIX + "%",))}
+        backup = None
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                self.conn.execute(SCHEMA)
+                if legacy is not None:
+                    self.conn.executemany("INSERT OR IGNORE INTO users (username, password_hash) VALUES (?, ?)",
+                                          legacy.items())
+            if version < 2:
+                rows = self.conn.execute("SELECT username, password_hash FROM users WHERE password_hash LIKE ?",
+                                         (PLAIN_PREFIX + "%",)).fetchall()
+                self.conn.executemany("UPDATE users SET password_hash = ? WHERE username = ?",
+                                      ((plain.get(row) or hash_password(row[1][len(PLAIN_PREFIX):]), row[0])
+                                       for row in rows))
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            if version < 1 and legacy is not None:
+                # Keep the old file, under a name nothing imports again.
+                backup = legacy_path + LEGACY_BACKUP_SUFFIX
+                os.replace(legacy_path, backup)
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            if backup:
+                os.replace(backup, legacy_path)
+            raise
+        if backup:
+            print(f"Imported {len(legacy)} accounts from {legacy_path}; the original is kept as {backup}")
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def __contains__(self, username):
+        return self._stored_hash(username) is not None
+
+    def _stored_hash(self, username):
+        row = self.conn.execute("SELECT password_hash FROM users WHERE username = ?", (username,)).fetchone()
+        return row[0] if row else None
+
+    def check_password(self, username, password):
+        """Return True if `username` exists and `password` matches, upgrading plaintext or outdated hashes."""
+        stored = self._stored_hash(username)
+        if stored is None:
+            # Spend the same time as a real check, so response times do not reveal which usernames exist.
+            verify_password(password, _get_dummy_hash())
+            return False
+        if not verify_password(password, stored):
+            return False
+        if needs_rehash(stored):
+            with self.conn:
+                # Only replace the hash we verified, never a password changed meanwhile.
+                self.conn.execute("UPDATE users SET password_hash = ? WHERE username = ? AND password_hash = ?",
+                                  (hash_password(password), username, stored))
+        return True
+
+    def create_user(self, username, password):
+        """Add an account; raises UserExistsError if the username is taken."""
+        if username in self:
+            raise UserExistsError()
+        password_hash = hash_password(password)
+        try:
+            with self.conn:
+                self.conn.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)",
+                                  (username, password_hash))
+        except sqlite3.IntegrityError:
+            raise UserExistsError()
+
+
+def _get_dummy_hash():
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password("")
+    return _dummy_hash
+
+
+def _with_directory(path, action):
+    directory = UserDirectory(path)
+    try:
+        return action(directory)
+    finally:
+        directory.close()
+
+
+def check_password(username, password, path=None):
+    """Return True if `username` exists and `password` matches."""
+    return _with_directory(path, lambda users: users.check_password(username, password))
+
+
+def create_user(username, password, path=None):
+    """Add an account to the user directory."""
+    _with_directory(path, lambda users: users.create_user(username, password))
+
+
+def count_users(path=None):
+    """Return the number of accounts."""
+    return _with_directory(path, len)
@@ -0,0 +1,67 @@
+"""Validation rules shared by every way of entering transactions."""
+import uuid
+import datetime
+
+from bytebank.money import AmountError, to_paise
+
+TRANSACTION_TYPES = ("Expense", "Income")
+
+
+class ValidationError(ValueError):
+    """Raised when transaction fields are invalid; the message is user-facing."""
+
+
+def check_date(value):
+    """Return a YYYY-MM-DD date string in canonical form (zero-padded); raise ValidationError otherwise."""
+    if not value or not str(value).strip():
+        raise ValidationError("Date is required.")
+    try:
+        return datetime.datetime.strptime(str(value).strip(), "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise ValidationError(f"Date must be YYYY-MM-DD: {value!r}")
+
+
+def transaction_fields(transaction_type, amount, description, category, date, payment_method, notes=""):
+    """Validate raw field values and return them as a transaction field dict.
+
+    `amount` is rupee text (or a number) and is stored as integer paise;
+    `date` must be YYYY-MM-DD (``2025-8-1`` is stored as ``2025-08-01``).
+    """
+    amount_str = str(amount).strip()
+    description = (description or "").strip()
+    notes = (notes or "").strip()
+
+    if not transaction_type or transaction_type not in TRANSACTION_TYPES:
+        raise ValidationError("Please select a valid type.")
+    if not amount_str or not amount_str.replace('.', '', 1).isdigit():
+        raise ValidationError("Please enter a valid amount (> 0).")
+    try:
+        amount_paise = to_paise(amount_str)
+    except AmountError as e:
+        raise ValidationError(str(e))
+    if amount_paise <= 0:
+        raise ValidationError("Please enter a valid amount (> 0).")
+    if not description:
+        raise ValidationError("Description is required.")
+    if not category:
+        raise ValidationError("Please select a category.")
+    if not payment_method:
+        raise ValidationError("Please select a payment method.")
+    date = check_date(date)
+
+    return {
+        "type": transaction_type,
+        "amount": amount_paise,
+        "description": description,
+        "category": category,
+        "date": date,
+        "payment_method": payment_method,
+        "notes": notes
+    }
+
+
+def build_transaction(transaction_type, amount, description, category, date, payment_method, notes="",
+                      transaction_id=None):
+    """Validate raw field values and return a new transaction record."""
+    fields = transaction_fields(transaction_type, amount, description, category, date, payment_method, notes)
+    return {"id": transaction_id or str(uuid.uuid4()), **fields}
@@ -0,0 +1,90 @@
+"""Background I/O worker that keeps slow ledger work off the UI thread."""
+import time
+import queue
+import threading
+
+from bytebank.instrument import FRAME_MS, span
+
+
+class IOWorker:
+    """Run jobs on background threads and hand their results back to the UI thread.
+
+    Jobs submitted under the same key (e.g. a username) run one at a time, in
+    submission order, on that key's own thread, so writes to one ledger are
+    serialized. Callbacks are not run on the worker: they are queued until the
+    UI thread calls `drain()` (e.g. from a Tk `after` loop). Each job runs in
+    an "io.job" span that records how long it waited in the queue; jobs
+    shorter than a frame, like the dashboard's once-a-second change check,
+    are not logged.
+    """
+    def __init__(self):
+        self._queues = {}
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def _queue_for(self, key):
+        with self._lock:
+            jobs = self._queues.get(key)
+            if jobs is None:
+                jobs = self._queues[key] = queue.Queue()
+                thread = threading.Thread(target=self._run, args=(key, jobs), name=f"bytebank-io-{key}",
+                                          daemon=True)
+                thread.start()
+            return jobs
+
+    def _run(self, key, jobs):
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            fn, callback, errback, queued = job
+            try:
+                with span("io.job", FRAME_MS, wait_ms=round((time.perf_counter() - queued) * 1000, 3)):
+                    result = fn()
+            except Exception as e:
+                if errback is not None:
+                    self._results.put((errback, (e,)))
+                else:
+                    print(f"Error in background job: {str(e)}")
+            else:
+                if callback is not None:
+                    self._results.put((callback, (result,)))
+            finally:
+                with self._lock:
+                    self._pending[key] -= 1
+
+    def submit(self, key, fn, callback=None, errback=None):
+        """Queue `fn()` on `key`'s thread; `callback(result)` or `errback(exc)` runs on drain()."""
+        jobs = self._queue_for(key)
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + 1
+        jobs.put((fn, callback, errback, time.perf_counter()))
+
+    def pending(self, key):
+        """Return how many jobs for `key` are queued or running."""
+        with self._lock:
+            return self._pending.get(key, 0)
+
+    def call_soon(self, fn, *args):
+        """Schedule `fn(*args)` to run on the UI thread at the next drain(); safe from any thread."""
+        self._results.put((fn, args))
+
+    def drain(self, limit=100):
+        """Run up to `limit` queued callbacks. Call this from the UI thread only."""
+        for _ in range(limit):
+            try:
+                fn, args = self._results.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Error in UI callback: {str(e)}")
+
+    def shutdown(self):
+        """Stop the worker threads once their queued jobs have finished."""
+        with self._lock:
+            for jobs in self._queues.values():
+                jobs.put(None)
+            self._queues.clear()
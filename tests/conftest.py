@@ -0,0 +1,42 @@
+"""Shared fixtures: every test runs in its own empty data directory.
+
+All of bytebank's paths are relative to the data root, which defaults to
+the working directory, so changing into a fresh temp directory isolates
+each test's users, ledgers and caches.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+for name in ("BYTEBANK_DATA_ROOT", "BYTEBANK_USERS_DB", "BYTEBANK_STORAGE", "BYTEBANK_PROFILE"):
+    os.environ.pop(name, None)
+os.environ["BYTEBANK_METRICS"] = "0"
+# Cheap password hashes: the tests check the scheme, not its cost.
+os.environ["BYTEBANK_SCRYPT_N"] = "1024"
+
+from bytebank import ledger as ledger_module
+from bytebank.validation import build_transaction
+
+BACKENDS = ["json", "journal", "sqlite", "binary", "partitioned"]
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ledger_module._ledgers.clear()
+    yield tmp_path
+    for shared in ledger_module._ledgers.values():
+        shared.backend.close()
+    ledger_module._ledgers.clear()
+
+
+@pytest.fixture
+def make_transaction():
+    """Return a factory for valid transaction records; keyword arguments override the defaults."""
+    def make(amount="10.00", description="Lunch", category="Food", date="2025-06-01", transaction_type="Expense",
+             payment_method="Card", notes=""):
+        return build_transaction(transaction_type, amount, description, category, date, payment_method, notes)
+    return make
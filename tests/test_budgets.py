@@ -0,0 +1,73 @@
+"""Budget alerts fire once per upward threshold crossing."""
+import pytest
+
+from bytebank import budgets
+from bytebank.ledger import get_ledger
+from bytebank.validation import ValidationError
+
+
+@pytest.fixture
+def ledger():
+    shared = get_ledger("u")
+    budgets.set_budget(shared, "Food", "100")
+    return shared
+
+
+def _thresholds(ledger):
+    return [alert["threshold"] for alert in ledger.take_alerts()]
+
+
+def test_alerts_fire_when_spending_crosses_each_threshold(ledger, make_transaction):
+    ledger.add(make_transaction(amount="70"))
+    assert _thresholds(ledger) == []
+    ledger.add(make_transaction(amount="15"))
+    assert _thresholds(ledger) == [80]
+    ledger.add(make_transaction(amount="20"))
+    assert _thresholds(ledger) == [100]
+    ledger.add(make_transaction(amount="1"))
+    assert _thresholds(ledger) == []
+
+
+def test_one_write_past_several_thresholds_reports_the_highest(ledger, make_transaction):
+    ledger.add(make_transaction(amount="150"))
+    alerts = ledger.take_alerts()
+    assert [(alert["threshold"], alert["spent"], alert["limit"]) for alert in alerts] == [(100, 15000, 10000)]
+
+
+def test_only_upward_crossings_alert(ledger, make_transaction):
+    record = make_transaction(amount="90")
+    ledger.add(record)
+    ledger.take_alerts()
+    ledger.delete(record["id"])
+    assert _thresholds(ledger) == []
+    ledger.add(make_transaction(amount="85"))
+    assert _thresholds(ledger) == [80]
+
+
+def test_other_categories_months_and_income_do_not_alert(ledger, make_transaction):
+    ledger.add(make_transaction(amount="500", category="Travel"))
+    ledger.add(make_transaction(amount="500", transaction_type="Income"))
+    ledger.add(make_transaction(amount="70", date="2025-06-01"))
+    ledger.add(make_transaction(amount="70", date="2025-07-01"))
+    assert _thresholds(ledger) == []
+
+
+def test_a_month_specific_limit_overrides_the_default(ledger, make_transaction):
+    budgets.set_budget(ledger, "Food", "1000", month="2025-06")
+    ledger.add(make_transaction(amount="150", date="2025-06-10"))
+    assert _thresholds(ledger) == []
+    ledger.add(make_transaction(amount="150", date="2025-07-10"))
+    assert _thresholds(ledger) == [100]
+
+
+def test_custom_thresholds(ledger, make_transaction):
+    assert budgets.set_thresholds(ledger, [50, 90, 50]) == [50, 90]
+    ledger.add(make_transaction(amount="60"))
+    assert _thresholds(ledger) == [50]
+    with pytest.raises(ValidationError):
+        budgets.set_thresholds(ledger, [0])
+
+
+def test_status_reports_spending_against_limits(ledger, make_transaction):
+    ledger.add(make_transaction(amount="25", date="2025-06-03"))
+    assert ledger.budget_status("2025-06") == [{"category": "Food", "spent": 2500, "limit": 10000, "percent": 25}]
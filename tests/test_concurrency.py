@@ -0,0 +1,54 @@
+"""Several processes writing one ledger and signing up at once lose nothing."""
+import multiprocessing
+import os
+
+import pytest
+
+from conftest import BACKENDS
+from bytebank.ledger import Ledger
+from bytebank.users import count_users, create_user
+from bytebank.validation import build_transaction
+
+PROCESSES = 4
+PER_PROCESS = 25
+
+
+def _worker(directory, backend, worker_id):
+    os.chdir(directory)
+    ledger = Ledger("shared", backend)
+    create_user(f"user-{worker_id}", "secret")
+    for i in range(PER_PROCESS):
+        ledger.add(build_transaction("Expense", "1.00", f"worker {worker_id} row {i}", "Other", "2025-01-01",
+                                     "Cash"))
+    ledger.backend.close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_concurrent_adds_and_signups_are_not_lost(backend, data_dir):
+    context = multiprocessing.get_context("spawn")
+    jobs = [context.Process(target=_worker, args=(str(data_dir), backend, n)) for n in range(PROCESSES)]
+    for job in jobs:
+        job.start()
+    for job in jobs:
+        job.join(timeout=120)
+    assert [job.exitcode for job in jobs] == [0] * PROCESSES
+
+    ledger = Ledger("shared", backend)
+    ids = {t["id"] for t in ledger.backend.all()}
+    assert len(ids) == PROCESSES * PER_PROCESS
+    assert ledger.summary()["total_expense"] == PROCESSES * PER_PROCESS * 100
+    assert count_users() == PROCESSES
+    ledger.backend.close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_stale_copy_is_reloaded_before_writing(backend, make_transaction):
+    first = Ledger("shared", backend)
+    second = Ledger("shared", backend)
+    first.add(make_transaction(amount="5.00"))
+    second.add(make_transaction(amount="7.00"))
+    first.refresh()
+    assert first.count() == second.count() == 2
+    assert first.summary()["total_expense"] == second.summary()["total_expense"] == 1200
+    first.backend.close()
+    second.backend.close()
@@ -0,0 +1,46 @@
+"""A write that fails to reach disk leaves the JSON backends' cached records as they were."""
+import pytest
+
+from bytebank.storage import open_backend
+
+
+@pytest.fixture(params=["json", "journal"])
+def backend(request, make_transaction):
+    backend = open_backend("u", request.param)
+    backend.reload()
+    backend.add(make_transaction(description="Lunch"))
+    return backend
+
+
+def _fail(entries):
+    raise OSError("disk full")
+
+
+def test_failed_update_leaves_the_record_unchanged(backend, monkeypatch):
+    record = backend.all()[0]
+    monkeypatch.setattr(backend, "_write", _fail)
+    with pytest.raises(OSError):
+        backend.update(record["id"], {"description": "Dinner"})
+    assert record["description"] == "Lunch"
+    assert backend.get(record["id"])["description"] == "Lunch"
+
+
+def test_update_does_not_edit_records_already_handed_out(backend):
+    record = backend.all()[0]
+    backend.update(record["id"], {"description": "Dinner"})
+    assert record["description"] == "Lunch"
+    assert backend.get(record["id"])["description"] == "Dinner"
+    backend.reload()
+    assert backend.get(record["id"])["description"] == "Dinner"
+
+
+def test_failed_add_and_delete_leave_the_ledger_unchanged(backend, make_transaction, monkeypatch):
+    before = backend.all()
+    monkeypatch.setattr(backend, "_write", _fail)
+    with pytest.raises(OSError):
+        backend.add_many([make_transaction(), make_transaction()])
+    with pytest.raises(OSError):
+        backend.delete(before[0]["id"])
+    assert backend.all() == before
+    assert backend.count() == 1
+    assert backend.get(before[0]["id"]) == before[0]
@@ -0,0 +1,59 @@
+"""Importing a statement a second time adds nothing."""
+import pytest
+
+from bytebank.importer import import_statement
+from bytebank.ledger import get_ledger
+
+CSV = """Txn Date,Narration,Withdrawal Amt,Deposit Amt
+01/06/2025,Coffee,120.00,
+01/06/2025,Coffee,120.00,
+02/06/2025,Salary,,50000.00
+03/06/2025,Rent,15000.00,
+"""
+QIF = """!Type:Bank
+D06/01/2025
+T-120.00
+PCoffee
+^
+D06/02/2025
+T50000.00
+PSalary
+^
+"""
+OFX = """<OFX><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250601<TRNAMT>-120.00<FITID>A1<NAME>Coffee</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250602<TRNAMT>50000.00<FITID>A2<NAME>Salary</STMTTRN>
+</BANKTRANLIST></OFX>
+"""
+
+
+@pytest.mark.parametrize("name, text, rows", [("statement.csv", CSV, 4), ("statement.qif", QIF, 2),
+                                              ("statement.ofx", OFX, 2)])
+def test_reimport_adds_nothing(data_dir, name, text, rows):
+    path = data_dir / name
+    path.write_text(text)
+    ledger = get_ledger("u")
+    first = import_statement(ledger, str(path))
+    assert (first.imported, first.duplicates) == (rows, 0)
+    second = import_statement(ledger, str(path))
+    assert (second.imported, second.duplicates) == (0, rows)
+    assert ledger.row_count == rows
+
+
+def test_identical_rows_in_one_statement_are_both_kept(data_dir):
+    path = data_dir / "statement.csv"
+    path.write_text(CSV)
+    ledger = get_ledger("u")
+    import_statement(ledger, str(path))
+    assert len(ledger.search("coffee")) == 2
+
+
+def test_interrupted_import_is_completed_by_running_it_again(data_dir):
+    path = data_dir / "statement.csv"
+    path.write_text(CSV)
+    ledger = get_ledger("u")
+    import_statement(ledger, str(path))
+    ledger.delete(ledger.search("rent")[0]["id"])
+    report = import_statement(ledger, str(path))
+    assert (report.imported, report.duplicates) == (1, 3)
+    assert ledger.totals == {"Income": 5000000, "Expense": 1524000}
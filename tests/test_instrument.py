@@ -0,0 +1,30 @@
+"""The metrics log is opt-in and costs nothing to import while it is off."""
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+from bytebank import instrument
+
+
+def _loaded_after_import(metrics):
+    env = dict(os.environ, BYTEBANK_METRICS=metrics) if metrics is not None else \
+        {k: v for k, v in os.environ.items() if k != "BYTEBANK_METRICS"}
+    code = ("import sys, bytebank.cli, bytebank.operations\n"
+            "from bytebank.instrument import span\n"
+            "with span('test'): pass\n"
+            "print(' '.join(m for m in ('logging', 'tracemalloc') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True,
+                            check=True)
+    return result.stdout.split()
+
+
+def test_metrics_are_off_by_default(data_dir):
+    assert _loaded_after_import(None) == []
+    assert not (data_dir / "metrics.log").exists()
+
+
+def test_metrics_log_when_turned_on(data_dir, monkeypatch):
+    monkeypatch.setenv("BYTEBANK_DATA_ROOT", str(data_dir))
+    assert _loaded_after_import("1") == ["logging"]
+    assert [record["span"] for record in instrument.read_metrics(str(data_dir / "metrics.log"))] == ["test"]
@@ -0,0 +1,49 @@
+"""Amounts are exact integer paise from input to totals."""
+import pytest
+
+from conftest import BACKENDS
+from bytebank.ledger import Ledger
+from bytebank.money import AmountError, format_amount, legacy_to_paise, migrate_amounts, to_paise
+
+
+@pytest.mark.parametrize("value, paise", [("12.50", 1250), ("0.1", 10), ("7", 700), (" 3.05 ", 305), (42, 4200),
+                                          ("1000000.99", 100000099)])
+def test_to_paise_is_exact(value, paise):
+    assert to_paise(value) == paise
+
+
+@pytest.mark.parametrize("value", ["1.005", "abc", "", "inf", "NaN", "1e400"])
+def test_to_paise_rejects_values_that_are_not_whole_paise(value):
+    with pytest.raises(AmountError):
+        to_paise(value)
+
+
+def test_format_amount():
+    assert format_amount(1250) == "12.50"
+    assert format_amount(5) == "0.05"
+    assert format_amount(0) == "0.00"
+
+
+def test_legacy_floats_convert_through_their_repr():
+    assert legacy_to_paise(0.1) == (10, True)
+    assert legacy_to_paise(12.5) == (1250, True)
+    assert legacy_to_paise(0.125) == (13, False)
+    assert legacy_to_paise(19.999) == (2000, False)
+
+
+def test_migrate_amounts_converts_floats_and_reports_rounding():
+    transactions = [{"id": "a", "amount": 0.1}, {"id": "b", "amount": 1.234}, {"id": "c", "amount": 500}]
+    converted, inexact = migrate_amounts(transactions)
+    assert converted == 2
+    assert [t["amount"] for t in transactions] == [10, 123, 500]
+    assert inexact == [("b", 1.234, 123)]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_totals_of_many_small_amounts_are_exact(backend, make_transaction):
+    ledger = Ledger("u", backend)
+    ledger.add_many([make_transaction(amount="0.10") for _ in range(1000)])
+    ledger.add(make_transaction(amount="0.30", transaction_type="Income"))
+    assert ledger.summary() == {"total_income": 30, "total_expense": 10000, "total_savings": -9970,
+                                "current_balance": -9970}
+    assert Ledger("u", backend).totals == {"Income": 30, "Expense": 10000}
@@ -0,0 +1,75 @@
+"""Transaction dates are validated before they name a partition file."""
+import datetime
+import os
+
+import pytest
+
+from conftest import BACKENDS
+from bytebank.operations import Operations
+from bytebank.storage.base import user_dir
+from bytebank.storage.partitioned import PartitionedBackend
+from bytebank.validation import ValidationError, transaction_fields
+
+BAD_DATES = ["../../x-01-01", "15/08/2025", "2025-8-", "2025-02-30", "2025-13-01", "20250601", "yesterday"]
+
+
+@pytest.fixture
+def backend():
+    os.makedirs(user_dir("p"), exist_ok=True)
+    store = PartitionedBackend("p")
+    store.reload()
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize("date", BAD_DATES)
+def test_bad_dates_are_rejected_by_validation(date):
+    with pytest.raises(ValidationError):
+        transaction_fields("Expense", "1", "x", "Food", date, "Card")
+
+
+def test_dates_are_stored_zero_padded():
+    assert transaction_fields("Expense", "1", "x", "Food", "2025-8-1", "Card")["date"] == "2025-08-01"
+
+
+@pytest.mark.parametrize("backend_name", BACKENDS)
+@pytest.mark.parametrize("date", BAD_DATES[:3])
+def test_every_backend_rejects_bad_dates_through_operations(backend_name, date, monkeypatch):
+    monkeypatch.setenv("BYTEBANK_STORAGE", backend_name)
+    with pytest.raises(ValidationError):
+        Operations.add_transaction("u", "Expense", "1", "x", "Food", date, "Card")
+
+
+@pytest.mark.parametrize("date", ["../../x-01-01", "15/08/2025", "2025-8-"])
+def test_backend_rejects_a_bad_key_before_touching_partitions(backend, make_transaction, date):
+    good = make_transaction(date="2025-01-01")
+    bad = dict(make_transaction(), date=date)
+    with pytest.raises(ValueError):
+        backend.add_many([good, bad])
+    assert backend.count() == 0
+    assert all(not partition.transactions for partition in backend.partitions.values())
+    assert sorted(os.listdir(backend.directory)) == ["manifest.json"]
+
+
+def test_bad_date_in_update_leaves_the_record_alone(backend, make_transaction):
+    record = make_transaction(date="2025-01-01")
+    backend.add(record)
+    with pytest.raises(ValueError):
+        backend.update(record["id"], {"date": "15/08/2025"})
+    assert backend.get(record["id"])["date"] == "2025-01-01"
+
+
+def test_partitions_are_loaded_on_demand(make_transaction):
+    os.makedirs(user_dir("p"), exist_ok=True)
+    store = PartitionedBackend("p")
+    store.reload()
+    store.add_many([make_transaction(date=f"2024-{month:02d}-10") for month in range(1, 13)])
+    store.close()
+
+    reopened = PartitionedBackend("p")
+    reopened.reload()
+    assert set(reopened.partitions) == {datetime.date.today().strftime("%Y-%m")}
+    assert reopened.count() == 12
+    assert len(reopened.query(start_date="2024-03-01", end_date="2024-04-30")) == 2
+    assert set(reopened.partitions) - {datetime.date.today().strftime("%Y-%m")} == {"2024-03", "2024-04"}
+    reopened.close()
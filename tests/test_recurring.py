@@ -0,0 +1,57 @@
+"""Recurring rules catch up on missed occurrences exactly once."""
+import datetime
+
+from bytebank import recurring
+from bytebank.ledger import get_ledger
+from bytebank.storage.base import recurring_path
+
+
+def _rule(**schedule):
+    return recurring.make_rule("Expense", "100", "Rent", "Bills", "Bank Transfer", **schedule)
+
+
+def _dates(username="u"):
+    return sorted(t["date"] for t in get_ledger(username).transactions)
+
+
+def test_monthly_rule_catches_up_and_clamps_to_month_end():
+    recurring.add_rule("u", _rule(frequency="monthly", start="2023-01-31", end="2023-06-30"))
+    assert _dates() == ["2023-01-31", "2023-02-28", "2023-03-31", "2023-04-30", "2023-05-31", "2023-06-30"]
+
+
+def test_years_of_daily_occurrences_are_added_in_one_pass():
+    rule = _rule(frequency="daily", start="2000-01-01")
+    assert len(recurring.occurrences(rule, datetime.date(2000, 1, 1), datetime.date(2024, 12, 31))) == 9132
+
+
+def test_materializing_again_adds_nothing():
+    recurring.add_rule("u", _rule(frequency="weekly", start="2024-01-01", end="2024-03-31"))
+    assert len(_dates()) == 13
+    assert recurring.materialize_due("u") == []
+    assert len(_dates()) == 13
+
+
+def test_each_run_adds_only_the_newly_due_occurrences():
+    rule = _rule(frequency="monthly", start="2024-01-15")
+    recurring._edit_rules("u", lambda store: store.rules.append(rule))
+    assert len(recurring.materialize_due("u", today=datetime.date(2024, 3, 20))) == 3
+    assert recurring.materialize_due("u", today=datetime.date(2024, 3, 31)) == []
+    added = recurring.materialize_due("u", today=datetime.date(2024, 6, 1))
+    assert [t["date"] for t in added] == ["2024-04-15", "2024-05-15"]
+    assert len(_dates()) == 5
+
+
+def test_crash_before_the_rules_save_does_not_duplicate():
+    recurring.add_rule("u", _rule(frequency="monthly", start="2024-01-01", end="2024-06-30"))
+    store = recurring.RecurringRules(recurring_path("u"))
+    store.load()
+    store.rules[0]["done_through"] = None
+    store.save()
+    assert recurring.materialize_due("u") == []
+    assert len(_dates()) == 6
+
+
+def test_cron_rule():
+    rule = _rule(frequency="cron", cron="1 * *", start="2024-01-01")
+    days = recurring.occurrences(rule, datetime.date(2024, 1, 1), datetime.date(2024, 12, 31))
+    assert [day.isoformat() for day in days] == [f"2024-{month:02d}-01" for month in range(1, 13)]
@@ -0,0 +1,74 @@
+"""Filtered totals and grouped reports agree with a plain scan of the ledger."""
+import random
+import subprocess
+import sys
+
+import pytest
+
+from conftest import BACKENDS, ROOT
+from bytebank import columnar
+from bytebank.ledger import Ledger
+from bytebank.validation import build_transaction
+
+CATEGORIES = ["Food", "Travel", "Bills"]
+RANGES = [(None, None), ("2024-03-01", "2024-05-31"), ("2024-03-10", "2024-03-20"), ("2024-02-15", "2024-06-10"),
+          ("2024-01-31", None), (None, "2024-04-01"), ("2024-02-29", "2024-03-01"), ("2024-07-01", "2024-07-31")]
+
+
+def _scan(ledger, **filters):
+    totals = {"Income": 0, "Expense": 0, "count": 0}
+    for t in ledger.backend.iter_transactions(**filters):
+        totals[t["type"]] += t["amount"]
+        totals["count"] += 1
+    return totals
+
+
+@pytest.fixture(params=BACKENDS)
+def ledger(request):
+    rng = random.Random(7)
+    shared = Ledger("u", request.param)
+    shared.add_many([build_transaction(rng.choice(["Expense", "Income"]), f"{rng.randint(1, 5000)}.{rng.randint(0, 99)}",
+                                       f"row {i}", rng.choice(CATEGORIES), f"2024-{rng.randint(1, 6):02d}-"
+                                       f"{rng.randint(1, 28):02d}", rng.choice(["Card", "Cash"]))
+                     for i in range(400)])
+    yield shared
+    shared.backend.close()
+
+
+@pytest.mark.parametrize("start_date, end_date", RANGES)
+@pytest.mark.parametrize("extra", [{}, {"category": "Food"}, {"transaction_type": "Income"},
+                                   {"payment_method": "Cash", "category": "Bills"}])
+def test_filtered_totals_match_a_scan(ledger, start_date, end_date, extra):
+    filters = dict(extra, start_date=start_date, end_date=end_date)
+    assert ledger.filtered_totals(**filters) == _scan(ledger, **filters)
+
+
+def test_filtered_totals_read_only_partial_months(ledger, monkeypatch):
+    read = []
+    iter_transactions = ledger.backend.iter_transactions
+
+    def record(**filters):
+        read.append((filters["start_date"], filters["end_date"]))
+        return iter_transactions(**filters)
+
+    monkeypatch.setattr(ledger.backend, "iter_transactions", record)
+    ledger.filtered_totals(start_date="2024-02-15", end_date="2024-06-10")
+    assert read == [("2024-02-15", "2024-02-29"), ("2024-06-01", "2024-06-10")]
+    read.clear()
+    ledger.filtered_totals(start_date="2024-02-01", end_date="2024-05-31", category="Food")
+    assert read == []
+
+
+@pytest.mark.parametrize("field", ["category", "type", "payment_method", "month"])
+def test_group_totals_with_and_without_numpy(ledger, field, monkeypatch):
+    filters = {"start_date": "2024-02-10", "end_date": "2024-05-20"}
+    grouped = ledger.group_totals(field, **filters)
+    monkeypatch.setattr(columnar, "np", None)
+    assert ledger.group_totals(field, **filters) == grouped
+    assert sum(group["count"] for group in grouped.values()) == _scan(ledger, **filters)["count"]
+
+
+def test_cli_does_not_import_numpy():
+    code = "import sys, bytebank.cli; print('numpy' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,78 @@
+"""The persistent search index answers queries and notices when it missed a write."""
+import pytest
+
+from bytebank import search
+from bytebank.ledger import Ledger, get_ledger
+from bytebank.operations import Operations
+
+
+def _descriptions(ledger, text):
+    return [t["description"] for t in ledger.search(text)]
+
+
+@pytest.fixture
+def ledger(make_transaction):
+    shared = get_ledger("u")
+    shared.add(make_transaction(description="Lunch at cafe", amount="250", date="2025-06-01"))
+    shared.add(make_transaction(description="Birthday party", amount="1200", date="2025-06-05", category="Other"))
+    shared.search("lunch")
+    return shared
+
+
+def test_prefix_and_amount_queries(ledger):
+    assert _descriptions(ledger, "bir par") == ["Birthday party"]
+    assert _descriptions(ledger, ">500") == ["Birthday party"]
+    assert _descriptions(ledger, "100..300") == ["Lunch at cafe"]
+    assert _descriptions(ledger, "other") == ["Birthday party"]
+    assert _descriptions(ledger, "nothing") == []
+
+
+def test_index_follows_writes(ledger, make_transaction):
+    record = make_transaction(description="Dinner out")
+    ledger.add(record)
+    assert _descriptions(ledger, "dinner") == ["Dinner out"]
+    Operations.update_transaction("u", record["id"], description="Supper out")
+    assert _descriptions(ledger, "dinner") == []
+    ledger.delete(record["id"])
+    assert _descriptions(ledger, "supper") == []
+
+
+def test_failed_index_update_after_a_description_edit_is_rebuilt(ledger, monkeypatch):
+    lunch = ledger.search("lunch")[0]
+
+    def fail(self, changes, totals, count):
+        raise RuntimeError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(search.SearchIndex, "apply", fail)
+        Operations.update_transaction("u", lunch["id"], description="Brunch at cafe")
+    assert not ledger._index.matches(ledger.totals, ledger.row_count)
+    other = Ledger("u")
+    assert _descriptions(other, "brunch") == ["Brunch at cafe"]
+    assert _descriptions(ledger, "lunch") == []
+
+
+def test_index_left_pending_by_a_crash_is_rebuilt(ledger):
+    ledger._index.mark_pending()
+    assert not ledger._index.matches(ledger.totals, ledger.row_count)
+    assert _descriptions(ledger, "lunch") == ["Lunch at cafe"]
+    assert ledger._index.matches(ledger.totals, ledger.row_count)
+
+
+def test_unwritable_index_is_removed_and_rebuilt(ledger, monkeypatch):
+    lunch = ledger.search("lunch")[0]
+
+    def fail(self, *args):
+        raise RuntimeError("read-only")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(search.SearchIndex, "apply", fail)
+        patch.setattr(search.SearchIndex, "invalidate", fail)
+        Operations.update_transaction("u", lunch["id"], description="Brunch at cafe")
+    assert ledger._index is None
+    assert _descriptions(ledger, "brunch") == ["Brunch at cafe"]
+
+
+def test_write_that_changes_nothing_keeps_the_index(ledger):
+    assert ledger.delete("no-such-id") is False
+    assert ledger._index.matches(ledger.totals, ledger.row_count)
@@ -0,0 +1,88 @@
+"""The shared SQLite database keeps each user's rows to themselves."""
+import sqlite3
+
+import pytest
+
+from bytebank.ledger import Ledger
+from bytebank.storage import sqlite as sqlite_storage
+from bytebank.storage.sqlite import SQLiteBackend
+
+
+@pytest.fixture
+def open_backend():
+    opened = []
+
+    def open_for(username):
+        backend = SQLiteBackend(username, "bytebank.db")
+        opened.append(backend)
+        return backend
+    yield open_for
+    for backend in opened:
+        backend.close()
+
+
+def test_users_may_share_an_id(open_backend, make_transaction):
+    alice, bob = open_backend("alice"), open_backend("bob")
+    record = make_transaction(description="Alice's lunch")
+    alice.add(record)
+    bob.add(dict(record, description="Bob's lunch"))
+    assert alice.get(record["id"])["description"] == "Alice's lunch"
+    assert bob.get(record["id"])["description"] == "Bob's lunch"
+    assert bob.delete(record["id"])
+    assert alice.get(record["id"]) is not None
+
+
+def test_duplicate_id_is_an_error(open_backend, make_transaction):
+    alice = open_backend("alice")
+    record = make_transaction(description="First")
+    alice.add(record)
+    with pytest.raises(ValueError):
+        alice.add_many([make_transaction(), dict(record, description="Second")])
+    assert [t["description"] for t in alice.all()] == ["First"]
+
+
+def test_id_keyed_database_is_migrated(open_backend, make_transaction):
+    conn = sqlite3.connect("bytebank.db")
+    conn.execute(sqlite_storage.TABLE.replace("id TEXT NOT NULL", "id TEXT PRIMARY KEY")
+                 .replace(",\n    PRIMARY KEY (user, id)", ""))
+    records = [make_transaction(description=f"row {i}") for i in range(3)]
+    for record in reversed(records):
+        conn.execute(f"INSERT INTO transactions (user, {', '.join(sqlite_storage.COLUMNS)}) "
+                     f"VALUES (?, {', '.join('?' * len(sqlite_storage.COLUMNS))})",
+                     ["alice"] + [record[c] for c in sqlite_storage.COLUMNS])
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+    alice, bob = open_backend("alice"), open_backend("bob")
+    assert [t["description"] for t in alice.all()] == ["row 2", "row 1", "row 0"]
+    bob.add(records[0])
+    assert alice.get(records[0]["id"]) is not None
+
+
+def test_signature_moves_only_with_the_users_own_writes(open_backend, make_transaction):
+    alice, bob = open_backend("alice"), open_backend("bob")
+    other_alice = open_backend("alice")
+    before = alice.signature()
+    bob.add(make_transaction())
+    assert alice.signature() == before
+    record = make_transaction()
+    other_alice.add(record)
+    after_add = alice.signature()
+    assert after_add != before
+    assert not other_alice.delete("no-such-id")
+    assert alice.signature() == after_add
+    other_alice.update(record["id"], {"description": "Dinner"})
+    assert alice.signature() != after_add
+
+
+def test_other_users_writes_do_not_reload_the_ledger(make_transaction):
+    alice, bob, other_alice = (Ledger(username, "sqlite") for username in ("alice", "bob", "alice"))
+    reloads = []
+    alice.reload = lambda: reloads.append(True)
+    bob.add(make_transaction())
+    assert alice.refresh() is False
+    other_alice.add(make_transaction())
+    assert alice.refresh() is True
+    assert reloads == [True]
+    for ledger in (alice, bob, other_alice):
+        ledger.backend.close()
@@ -0,0 +1,133 @@
+"""Account storage and the import of the old plaintext users.json."""
+import json
+import multiprocessing
+import os
+
+import sqlite3
+
+import pytest
+
+from bytebank import users
+from bytebank.passwords import PLAIN_PREFIX, needs_rehash
+from bytebank.users import UserDirectory, UserExistsError, check_password, count_users, create_user
+
+LEGACY = {"alice": {"password": "wonderland"}, "bob": {"password": "builder"}}
+
+
+@pytest.fixture
+def legacy_file(data_dir):
+    path = data_dir / "users.json"
+    path.write_text(json.dumps(LEGACY))
+    return str(path)
+
+
+def _stored(directory, username):
+    return directory.conn.execute("SELECT password_hash FROM users WHERE username = ?", (username,)).fetchone()[0]
+
+
+def test_create_and_check():
+    create_user("carol", "secret")
+    assert check_password("carol", "secret")
+    assert not check_password("carol", "wrong")
+    assert not check_password("nobody", "secret")
+    with pytest.raises(UserExistsError):
+        create_user("carol", "other")
+    assert count_users() == 1
+
+
+def test_passwords_are_stored_hashed():
+    create_user("carol", "secret")
+    directory = UserDirectory()
+    stored = _stored(directory, "carol")
+    directory.close()
+    assert "secret" not in stored
+    assert not needs_rehash(stored)
+
+
+def test_legacy_accounts_are_imported(legacy_file):
+    directory = UserDirectory("users.db", legacy_file)
+    assert len(directory) == 2
+    assert directory.check_password("alice", "wonderland")
+    assert not directory.check_password("bob", "wrong")
+    directory.close()
+
+
+def test_legacy_passwords_are_hashed_on_import(legacy_file):
+    directory = UserDirectory("users.db", legacy_file)
+    for name, record in LEGACY.items():
+        stored = _stored(directory, name)
+        assert record["password"] not in stored
+        assert not needs_rehash(stored)
+    directory.close()
+
+
+def test_legacy_file_is_kept_as_a_backup(legacy_file):
+    UserDirectory("users.db", legacy_file).close()
+    assert not os.path.exists(legacy_file)
+    with open(legacy_file + ".bak") as f:
+        assert json.load(f) == LEGACY
+
+
+class _FailingCommit:
+    """A connection whose commit fails, as on a full disk."""
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+    def commit(self):
+        raise sqlite3.OperationalError("disk I/O error")
+
+
+def test_failed_import_leaves_the_legacy_file_in_place(legacy_file, monkeypatch):
+    connect = sqlite3.connect
+    with monkeypatch.context() as patch:
+        patch.setattr(users.sqlite3, "connect", lambda *args, **kwargs: _FailingCommit(connect(*args, **kwargs)))
+        with pytest.raises(sqlite3.OperationalError):
+            UserDirectory("users.db", legacy_file)
+    assert os.path.exists(legacy_file)
+    assert not os.path.exists(legacy_file + ".bak")
+    directory = UserDirectory("users.db", legacy_file)
+    assert directory.check_password("alice", "wonderland")
+    directory.close()
+
+
+def test_plaintext_left_by_the_first_schema_is_hashed(data_dir):
+    conn = sqlite3.connect("users.db")
+    conn.execute(users.SCHEMA)
+    conn.executemany("INSERT INTO users VALUES (?, ?)", [("alice", PLAIN_PREFIX + "wonderland"),
+                                                         ("bob", PLAIN_PREFIX + "wonderland")])
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+    directory = UserDirectory("users.db", None)
+    assert _stored(directory, "alice") != _stored(directory, "bob")
+    assert not any(needs_rehash(_stored(directory, name)) for name in ("alice", "bob"))
+    assert directory.check_password("bob", "wonderland")
+    directory.close()
+
+
+def test_legacy_import_runs_once(legacy_file):
+    UserDirectory("users.db", legacy_file).close()
+    with open(legacy_file, "w") as f:
+        json.dump({"mallory": {"password": "late"}}, f)
+    directory = UserDirectory("users.db", legacy_file)
+    assert "mallory" not in directory
+    directory.close()
+
+
+def _open_directory(directory, legacy_path):
+    os.chdir(directory)
+    UserDirectory("users.db", legacy_path).close()
+
+
+def test_concurrent_first_opens_import_once(legacy_file, data_dir):
+    context = multiprocessing.get_context("spawn")
+    jobs = [context.Process(target=_open_directory, args=(str(data_dir), legacy_file)) for _ in range(4)]
+    for job in jobs:
+        job.start()
+    for job in jobs:
+        job.join(timeout=60)
+    assert [job.exitcode for job in jobs] == [0] * 4
+    assert count_users() == 2